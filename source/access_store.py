@@ -0,0 +1,161 @@
+#!/usr/bin/python3
+# store of precomputed accessibilities, eg. of a whole transcriptome.
+# create a store from lunp files (the file name is the transcript id):
+#   python3 access_store.py path/to/store transcript1.lunp transcript2.lunp.gz ...
+# and use it with:
+#   rna_to_img.py --accessibilityStore=path/to/store --accessibility1=store:transcript1 ...
+import argparse
+import logging
+import mmap
+import sys
+from array import array
+from pathlib import Path
+
+from utils import parseLunpFile
+
+# value of --accessibility1/2 selecting a transcript of the store
+STORE_PREFIX = "store:"
+# transcript id, offset and length of every transcript, one per line
+STORE_INDEX = "index.tsv"
+# probabilities of all transcripts, little endian doubles one after another
+STORE_DATA = "probabilities.f64"
+
+# AccessStore of every directory used by this process
+open_stores = {}
+
+
+class AccessStore:
+    """Unpaired probabilities of many transcripts, read from a memory map.
+
+    The probabilities of all transcripts are stored in one file of
+    doubles, the index maps a transcript id to the offset and length
+    of its probabilities in that file. Reading a part of a transcript
+    only touches the pages of that part, the file is never parsed.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        # {transcript id: (offset, length)}
+        self.index = {}
+        with open(self.directory / STORE_INDEX) as f:
+            for line in f:
+                if line.startswith("#") or not line.strip():
+                    continue
+                transcript, offset, length = line.rstrip("\n").split("\t")
+                self.index[transcript] = (int(offset), int(length))
+        # memory map of the data file, opened by the first lookup
+        self.data = None
+
+    def view(self) -> memoryview:
+        """The data file as doubles."""
+        if self.data is None:
+            with open(self.directory / STORE_DATA, "rb") as f:
+                if f.seek(0, 2) == 0:
+                    # an empty file can not be mapped
+                    self.data = memoryview(array("d"))
+                else:
+                    self.data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)).cast("d")
+        return self.data
+
+    def probabilities(self, transcript: str, first: int, last: int) -> array:
+        """Probabilities of the positions first to last (based 1) of a transcript.
+
+        Positions outside of the transcript are left out.
+
+        Raises:
+            ValueError: If the transcript is not in the store.
+        """
+        if transcript not in self.index:
+            raise ValueError(f"The transcript {transcript} is not in the accessibility store {self.directory}")
+        offset, length = self.index[transcript]
+        first, last = max(first, 1), min(last, length)
+        values = array("d", self.view()[offset + first - 1:offset + last])
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def molecule(self, transcript: str, start_index: int, length: int, shift: int) -> dict:
+        """Probabilities of a molecule that is a part of a transcript.
+
+        The molecule starts at position `start_index` of the transcript
+        (see --startIndex1/2), there is no position 0. Nucleotides outside
+        of the transcript or without a probability get none.
+
+        Args:
+            transcript (str): Id of the transcript in the store.
+            start_index (int): Position of the first nucleotide.
+            length (int): Number of nucleotides of the molecule.
+            shift (int): Offset added to every node index.
+
+        Returns:
+            dict: Node index to probability, like `parseLunpFile`.
+        """
+        def position(nucleotide):
+            index = start_index + nucleotide - 1
+            # skip position 0
+            return index + 1 if start_index < 0 and index >= 0 else index
+
+        first = max(position(1), 1)
+        probabilities = self.probabilities(transcript, first, position(length))
+        access_data = {}
+        for index, prb in enumerate(probabilities, first):
+            nucleotide = index - start_index + (0 if start_index < 0 else 1)
+            # nan: no probability in the store
+            if prb == prb:
+                access_data[nucleotide + shift] = prb
+        return access_data
+
+
+def openStore(directory) -> AccessStore:
+    """The AccessStore of a directory, opened once per process."""
+    directory = str(directory)
+    if directory not in open_stores:
+        open_stores[directory] = AccessStore(directory)
+    return open_stores[directory]
+
+
+def writeStore(directory, transcripts) -> None:
+    """Create a store from (transcript id, array of probabilities) pairs.
+
+    The transcripts are written one after another, only one of them
+    is kept in memory.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    offset = 0
+    with open(directory / STORE_DATA, "wb") as data, open(directory / STORE_INDEX, "w") as index:
+        index.write("# transcript\toffset\tlength\n")
+        for transcript, probabilities in transcripts:
+            values = array("d", probabilities)
+            if sys.byteorder == "big":
+                values.byteswap()
+            values.tofile(data)
+            index.write(f"{transcript}\t{offset}\t{len(values)}\n")
+            offset += len(values)
+
+
+def transcriptId(path: Path) -> str:
+    """Transcript id of a lunp file, its name without .lunp and .gz."""
+    name = path.name
+    for suffix in (".gz", ".lunp", "_lunp"):
+        name = name.removesuffix(suffix)
+    return name
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+            description='create a store of precomputed accessibilities from lunp files. \n' \
+            'the name of a file without .lunp/.gz is the id of its transcript')
+    parser.add_argument('store', help='directory of the new store')
+    parser.add_argument('lunp', nargs='+', help='lunp files (RNAplfold -u1), optionally gzip compressed')
+    parser.add_argument('--column', type=int, default=1,
+                        help='column of the probabilities, the length u of the unpaired region. default: 1')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format="[{levelname}] {message}",
+                        style="{")
+    paths = [Path(path) for path in args.lunp]
+    writeStore(args.store, ((transcriptId(path), parseLunpFile(path, 0, args.column).probabilities)
+                               for path in paths))
+    logging.info(f"accessibility store with {len(paths)} transcripts created: {args.store}")
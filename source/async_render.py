@@ -0,0 +1,213 @@
+import asyncio
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from cache import openCache
+from rna_to_img import (build_molecules_js,
+                        save_molecules_js,
+                        restore_molecules_js,
+                        moleculesArgs,
+                        moleculesCacheable,
+                        moleculesKey,
+                        modifyStructure,
+                        extractImages,
+                        saveImages)
+from modifications import getLabelPositions
+from page_pool import (MAX_PAGE_RENDERS,
+                       RENDER_GLOBALS,
+                       reset_page_js)
+from utils import template_barebone_html
+
+
+class SyncBridge:
+    """Synchronous view on an object of the async playwright API.
+
+    The modification pipeline in modifications.py is written against the
+    synchronous playwright API. A bridge lets this code run unchanged in a
+    worker thread: every method call is scheduled on the event loop owning
+    the async object and the worker thread waits for its result. Returned
+    playwright objects (pages, locators) are bridged as well.
+
+    While one worker waits for chromium, the event loop keeps serving
+    the calls of all other workers, so every page stays busy.
+    """
+
+    def __init__(self, target, loop):
+        self._target = target
+        self._loop = loop
+
+    def _wrap(self, result):
+        if type(result).__module__.startswith("playwright"):
+            return SyncBridge(result, self._loop)
+        return result
+
+    def _run(self, call):
+        async def awaitCall():
+            result = call()
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        return asyncio.run_coroutine_threadsafe(awaitCall(), self._loop).result()
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return self._wrap(attr)
+
+        def call(*args, **kwargs):
+            return self._wrap(self._run(lambda: attr(*args, **kwargs)))
+        return call
+
+
+async def openTemplatePageAsync(browser):
+    """Async counterpart of `openTemplatePage`."""
+    page = await browser.new_page()
+    assert template_barebone_html.exists()
+    await page.goto("file:///" + str(template_barebone_html))
+    return page
+
+
+class AsyncPagePool:
+    """Async counterpart of `PagePool`, reusing the pages of an async browser.
+
+    Pages are handed out and returned on the event loop, concurrent
+    renders never share a page.
+    """
+
+    def __init__(self, browser, max_renders: int = MAX_PAGE_RENDERS):
+        self.browser = browser
+        self.max_renders = max_renders
+        # [(page, number of renders)] of the pages ready for a render
+        self.idle = []
+
+    async def reset(self, page) -> bool:
+        """Async counterpart of `resetPage`."""
+        try:
+            return await page.evaluate(reset_page_js, RENDER_GLOBALS)
+        except Exception as e:
+            logging.warning(f"template page could not be reset: {e}")
+            return False
+
+    @asynccontextmanager
+    async def page(self):
+        """Async context manager handing out a template page for one render."""
+        if self.idle:
+            page, renders = self.idle.pop()
+        else:
+            page, renders = await openTemplatePageAsync(self.browser), 0
+        try:
+            yield page
+        except BaseException:
+            # the state of the page after a failed render is unknown
+            await page.close()
+            raise
+
+        if renders + 1 < self.max_renders and await self.reset(page):
+            self.idle.append((page, renders + 1))
+        else:
+            await page.close()
+
+    async def close(self) -> None:
+        """Close all pages of the pool."""
+        for page, _ in self.idle:
+            await page.close()
+        self.idle = []
+
+
+async def buildMoleculesAsync(page, v):
+    """Async counterpart of `buildMolecules`.
+
+    Waiting for the forcefield does not block a thread, the event loop
+    keeps driving the other pages in the meantime.
+    """
+    for var in ["structure", "sequence", "forcefield"]:
+        assert var in v
+    animation, timer = v["forcefield"], v["forcefield_timer"]
+
+    labels = getLabelPositions(v)
+
+    cache = openCache(v) if moleculesCacheable(v) else None
+    if cache is not None:
+        key = moleculesKey(v, labels)
+        svg = cache.get(key)
+        if svg is not None:
+            await page.evaluate(restore_molecules_js, svg.decode())
+            return
+
+    await page.evaluate(build_molecules_js, moleculesArgs(v, labels))
+
+    if animation and v["forcefield_ticks"] is None:
+        await page.wait_for_timeout(timer * 1000)
+
+    if cache is not None:
+        cache.put(key, (await page.evaluate(save_molecules_js)).encode())
+
+
+def finishRender(browser, page, v) -> dict:
+    """Apply all modifications and extract the images (runs in a worker thread)."""
+    modifyStructure(page, v)
+    return extractImages(browser, page, v)
+
+
+async def renderAsync(pool, v, executor) -> dict:
+    """Async counterpart of `render`, rendering on a page of `pool`.
+
+    The molecules are built with the async API, the modification pipeline
+    runs in a thread of `executor` through a `SyncBridge`.
+
+    Args:
+        pool (AsyncPagePool): Template pages of an async playwright browser.
+        v (dict): Validated input as returned by `validate`.
+        executor: Thread pool running the modification pipeline.
+
+    Returns:
+        dict: {"image": bytes, "legend": bytes or None}
+    """
+    loop = asyncio.get_running_loop()
+    async with pool.page() as page:
+        await buildMoleculesAsync(page, v)
+        return await loop.run_in_executor(executor, finishRender,
+                                          SyncBridge(pool.browser, loop), SyncBridge(page, loop), v)
+
+
+async def renderManyAsync(inputs, concurrency: int = 4):
+    """Render many validated inputs concurrently in one browser.
+
+    At most `concurrency` pages are rendered at the same time.
+
+    Args:
+        inputs: Iterable of validated inputs.
+        concurrency (int): Maximal number of pages rendering at once.
+
+    Returns:
+        list: For every input in order either its images
+        ({"image": bytes, "legend": bytes or None}) or the raised exception.
+    """
+    from playwright.async_api import async_playwright
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def renderLimited(pool, v, executor):
+        async with semaphore:
+            return await renderAsync(pool, v, executor)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            pool = AsyncPagePool(browser)
+            try:
+                return await asyncio.gather(*[renderLimited(pool, v, executor) for v in inputs],
+                                            return_exceptions=True)
+            finally:
+                await pool.close()
+                await browser.close()
+
+
+async def runAsync(v):
+    """Async counterpart of `run`: render one input and write its images."""
+    (images,) = await renderManyAsync([v], concurrency=1)
+    if isinstance(images, Exception):
+        raise images
+    saveImages(images, v)
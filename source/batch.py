@@ -0,0 +1,491 @@
+import asyncio
+import csv
+import heapq
+import json
+import logging
+import multiprocessing
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+from input_validation import (validate,
+                              logPredictionCounter)
+from rna_to_img import (render,
+                        saveImages)
+from async_render import (renderAsync,
+                          AsyncPagePool)
+from page_pool import PagePool
+from svg_engine import (FORCEFIELD_WARNING,
+                        render as renderPython)
+
+# options that only make sense for the whole batch, not for a single record
+BATCH_OPTIONS = ["batch", "batchTop", "concurrency", "workers", "daemon", "engine", "verbose"]
+# number of records a worker process takes from the queue at once
+SHARD_SIZE = 16
+
+
+def readManifest(path, top=None):
+    """Read the records of a batch manifest one by one.
+
+    A manifest is either a tsv file with a header row naming the options
+    of each column, or a jsonl file with one json object per line.
+    Empty tsv cells are left out of the record. A csv file is read as
+    output of IntaRNA (see `readIntaRNA`).
+
+    Args:
+        path: Path to a .tsv, .jsonl or .csv manifest.
+        top (int, optional): Only read the best interactions of every query
+            of an IntaRNA csv file. Defaults to None, all interactions.
+
+    Yields:
+        dict: One record per row, mapping option names to values.
+
+    Raises:
+        ValueError: If the manifest does not exist, has an unknown
+            file type or contains an invalid line.
+    """
+    path = Path(path)
+    if not path.exists():
+        raise ValueError(f"The given manifest could not be found: {path}")
+
+    if path.suffix == ".tsv":
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f, delimiter="\t"):
+                yield {key: value for key, value in row.items() if value not in ("", None)}
+    elif path.suffix == ".jsonl":
+        with open(path) as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Invalid json in manifest line {line_number}: {e}")
+                if not isinstance(record, dict):
+                    raise ValueError(f"Manifest line {line_number} is not a json object")
+                yield record
+    elif path.suffix == ".csv":
+        yield from readIntaRNA(path, top)
+    else:
+        raise ValueError(f"The manifest file type is not accepted: {path.suffix}" \
+                         " Allowed types are tsv, jsonl and csv")
+
+
+def intaRNARecord(row: dict, line_number: int) -> dict:
+    """Options of an interaction predicted by IntaRNA.
+
+    The interaction is taken from the column hybridDB (eg. 5|||..&3|||..),
+    hybridDPfull or hybridDP with start1 and start2, the first one present.
+    The sequences are taken from the columns seq1 and seq2, without them
+    the records id1 and id2 are read from --fastafile.
+    """
+    record = {}
+    if row.get("seq1") and row.get("seq2"):
+        record["sequence"] = f"{row['seq1']}&{row['seq2']}"
+    elif row.get("id1") and row.get("id2"):
+        record["fastaRecord1"] = row["id1"]
+        record["fastaRecord2"] = row["id2"]
+    else:
+        raise ValueError(f"IntaRNA line {line_number} has neither the columns seq1 and seq2 nor id1 and id2")
+
+    if row.get("hybridDB"):
+        record["structure"] = row["hybridDB"]
+    elif row.get("hybridDPfull"):
+        record["structure"] = row["hybridDPfull"]
+    elif row.get("hybridDP") and row.get("start1") and row.get("start2"):
+        # the dot-bracket structure of the interaction sites, as hybridDB
+        site1, _, site2 = row["hybridDP"].partition("&")
+        record["structure"] = f"{row['start1']}{site1.replace('(', '|')}&{row['start2']}{site2.replace(')', '|')}"
+    else:
+        raise ValueError(f"IntaRNA line {line_number} has no interaction, " \
+                         "one of the columns hybridDB, hybridDPfull or hybridDP, start1 and start2 is needed")
+    return record
+
+
+def readIntaRNA(path, top=None):
+    """Read the interactions of an IntaRNA csv file (--outMode=C) as records.
+
+    The file is read line by line, the header names the columns
+    (see IntaRNA --outCsvCols) and the separator is ";" (IntaRNA default)
+    or ",". Columns that are no interaction are ignored. With `top`, only
+    the `top` interactions with the lowest energy (column E) of every
+    query (column id2) are read, in that case the whole file is read
+    before the first record, keeping `top` interactions per query.
+
+    Args:
+        path (Path): Path to the csv file.
+        top (int, optional): Number of interactions per query.
+
+    Yields:
+        dict: The options of one interaction (see `intaRNARecord`).
+
+    Raises:
+        ValueError: If a line has no sequences or no interaction.
+    """
+    with open(path, newline="") as f:
+        header = f.readline()
+        separator = ";" if ";" in header else ","
+        columns = next(csv.reader([header], delimiter=separator))
+        rows = csv.DictReader(f, fieldnames=columns, delimiter=separator)
+        if top is None:
+            for line_number, row in enumerate(rows, 2):
+                yield intaRNARecord(row, line_number)
+            return
+
+        # {query: heap of the best (-energy, -line number, record)}
+        best = {}
+        for line_number, row in enumerate(rows, 2):
+            try:
+                energy = float(row.get("E") or 0)
+            except ValueError:
+                raise ValueError(f"IntaRNA line {line_number} has an invalid energy: {row['E']}")
+            heap = best.setdefault(row.get("id2"), [])
+            item = (-energy, -line_number, intaRNARecord(row, line_number))
+            if len(heap) < top:
+                heapq.heappush(heap, item)
+            else:
+                heapq.heappushpop(heap, item)
+    for heap in best.values():
+        for _, _, record in sorted(heap, reverse=True):
+            yield record
+
+
+def parseBool(key: str, value) -> bool:
+    """Convert a manifest value of a flag option into a bool."""
+    if isinstance(value, bool):
+        return value
+    if str(value).lower() in ["true", "1", "yes"]:
+        return True
+    if str(value).lower() in ["false", "0", "no"]:
+        return False
+    raise ValueError(f"The given value for {key} is not a boolean: {value}")
+
+
+def manifestArgs(record: dict, defaults: dict, number: int) -> dict:
+    """Build the argument dictionary of a single manifest record.
+
+    Every option not set in the record falls back to `defaults`, the
+    options given on the command line. Values are converted into the
+    same form argparse produces, so the result can go through `validate`.
+
+    The output name "default" is replaced by the manifest name and the
+    record number (eg. manifest_12.svg), so the names do not depend on
+    the time or on which process renders the record. So is "STDOUT",
+    the images of all records would be written to the same output.
+
+    Args:
+        record (dict): One record of `readManifest`.
+        defaults (dict): Parsed command line arguments.
+        number (int): Number of the record in the manifest, starting with 1.
+
+    Returns:
+        dict: Argument dictionary for `validate`.
+
+    Raises:
+        ValueError: If the record contains an unknown option.
+    """
+    args = dict(defaults)
+    for key, value in record.items():
+        if key not in defaults or key in BATCH_OPTIONS:
+            raise ValueError(f"Unknown option in manifest: {key}")
+        if isinstance(defaults[key], bool):
+            args[key] = parseBool(key, value)
+        else:
+            args[key] = str(value)
+
+    # eg dir1/subdir/default.png -> dir1/subdir/manifest_12.png
+    directory, _, file_name = args["output"].rpartition("/")
+    name = file_name.split(".")[0]
+    if name in ["default", "STDOUT"]:
+        file_name = file_name.replace(name, f"{Path(defaults['batch']).stem}_{number}", 1)
+        args["output"] = f"{directory}/{file_name}" if directory else file_name
+    return args
+
+
+def validateTop(args: dict):
+    """The number of interactions per query of --batchTop, None for all."""
+    assert "batchTop" in args
+    if args["batchTop"] == "None":
+        return None
+    return validatePositive(args, "batchTop")
+
+
+def validatePositive(args: dict, key: str) -> int:
+    """
+    Validate an option that has to be a positive integer.
+
+    Args:
+        args: Argument dictionary.
+        key: Key of the option, eg. 'concurrency' or 'workers'.
+
+    Returns:
+        The option as an integer.
+
+    Raises:
+        ValueError: If the option is not a positive integer.
+    """
+    assert key in args
+    if re.fullmatch(r"\d+", args[key]) and int(args[key]) >= 1:
+        return int(args[key])
+    raise ValueError(f"The given {key} must be 1 or higher and not {args[key]}")
+
+
+def startPlaywright(engine: str):
+    """Context manager of the sync playwright api.
+
+    The python engine renders without a browser, for it nothing is started.
+    """
+    if engine == "python":
+        return nullcontext()
+    from playwright.sync_api import sync_playwright
+    return sync_playwright()
+
+
+def forcefieldIgnored(v) -> bool:
+    """Whether the python engine draws a record without the forcefield it asks for."""
+    return v["engine"] == "python" and v["forcefield"]
+
+
+def renderRecord(pool, v) -> dict:
+    """Render a validated record on a page of `pool` or with the python engine."""
+    if v["engine"] == "python":
+        return renderPython(v)
+    with pool.page() as page:
+        return render(pool.browser, page, v)
+
+
+def runBatch(manifest, defaults: dict) -> int:
+    """Render every record of a manifest with one browser.
+
+    A failing record is logged and skipped, the remaining records
+    are still rendered. The template pages are reused across records
+    (see `PagePool`). With a concurrency above 1, the records are
+    rendered on that many pages at the same time (see `runBatchAsync`).
+    With more than 1 worker, the records are split across worker
+    processes, each with its own browser (see `runBatchSharded`).
+    The python engine (--engine python) renders without any browser,
+    the concurrency has no effect for it.
+
+    Args:
+        manifest: Path to a .tsv, .jsonl or .csv manifest (see `readManifest`).
+        defaults (dict): Parsed command line arguments, used for every
+            option a record does not set.
+
+    Returns:
+        int: The number of records that could not be rendered.
+    """
+    concurrency = validatePositive(defaults, "concurrency")
+    workers = validatePositive(defaults, "workers")
+    top = validateTop(defaults)
+    if workers > 1:
+        return runBatchSharded(manifest, defaults, workers)
+    if concurrency > 1 and defaults["engine"] != "python":
+        return asyncio.run(runBatchAsync(manifest, defaults, concurrency))
+
+    failed = 0
+    # the missing forcefield is logged once for the whole batch
+    forcefield_ignored = False
+    with startPlaywright(defaults["engine"]) as p:
+        browser = None if p is None else p.chromium.launch(headless=True)
+        pool = PagePool(browser)
+
+        for number, record in enumerate(readManifest(manifest, top), 1):
+            try:
+                v = validate(manifestArgs(record, defaults, number))
+                forcefield_ignored = forcefield_ignored or forcefieldIgnored(v)
+                saveImages(renderRecord(pool, v), v)
+                logging.info(f"record {number} rendered")
+            except Exception as e:
+                logging.error(f"record {number}: {e}")
+                failed += 1
+
+        if browser is not None:
+            pool.close()
+            browser.close()
+
+    if forcefield_ignored:
+        logging.warning(FORCEFIELD_WARNING)
+    return failed
+
+
+async def runBatchAsync(manifest, defaults: dict, concurrency: int) -> int:
+    """Render the records of a manifest on concurrent pages of one browser.
+
+    Records are read lazily, a new record is only started when one of
+    the `concurrency` slots is free. Validation and writing of the images
+    run in the same thread pool as the modification pipeline.
+
+    Args:
+        manifest: Path to a .tsv, .jsonl or .csv manifest (see `readManifest`).
+        defaults (dict): Parsed command line arguments.
+        concurrency (int): Maximal number of records rendered at once.
+
+    Returns:
+        int: The number of records that could not be rendered.
+    """
+    from playwright.async_api import async_playwright
+
+    loop = asyncio.get_running_loop()
+    slots = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def renderRecord(pool, executor, number, record):
+        nonlocal failed
+        try:
+            v = await loop.run_in_executor(executor, validate, manifestArgs(record, defaults, number))
+            images = await renderAsync(pool, v, executor)
+            await loop.run_in_executor(executor, saveImages, images, v)
+            logging.info(f"record {number} rendered")
+        except Exception as e:
+            logging.error(f"record {number}: {e}")
+            failed += 1
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            pool = AsyncPagePool(browser)
+            tasks = []
+            for number, record in enumerate(readManifest(manifest, validateTop(defaults)), 1):
+                await slots.acquire()
+                tasks.append(asyncio.create_task(renderRecord(pool, executor, number, record)))
+            await asyncio.gather(*tasks)
+            await pool.close()
+            await browser.close()
+
+    return failed
+
+
+def renderShards(tasks, results, defaults: dict) -> None:
+    """Worker process of `runBatchSharded`.
+
+    Launches its own browser (none for the python engine) and renders shards of records taken from
+    `tasks` until it receives None. For every record a tuple
+    (number, error, forcefield ignored) is put on `results`, error is
+    None on success (see `forcefieldIgnored`).
+
+    Args:
+        tasks: Queue of shards, lists of (number, record) tuples.
+        results: Queue for the status of every record.
+        defaults (dict): Parsed command line arguments.
+    """
+    with startPlaywright(defaults["engine"]) as p:
+        browser, launch_error = None, None
+        if p is not None:
+            try:
+                browser = p.chromium.launch(headless=True)
+            except Exception as e:
+                launch_error = f"worker could not launch browser: {e}"
+        pool = PagePool(browser)
+
+        for shard in iter(tasks.get, None):
+            for number, record in shard:
+                if launch_error is not None:
+                    results.put((number, launch_error, False))
+                    continue
+                try:
+                    v = validate(manifestArgs(record, defaults, number))
+                    saveImages(renderRecord(pool, v), v)
+                    results.put((number, None, forcefieldIgnored(v)))
+                except Exception as e:
+                    results.put((number, str(e), False))
+        logPredictionCounter()
+
+        if browser is not None:
+            pool.close()
+            browser.close()
+
+
+def runBatchSharded(manifest, defaults: dict, workers: int) -> int:
+    """Render the records of a manifest in several worker processes.
+
+    The manifest is split into shards of `SHARD_SIZE` records, which the
+    worker processes take from a shared queue. Every worker owns its own
+    browser and runs the `validate` -> `render` pipeline, the status of
+    each record is reported back through a result queue.
+
+    Args:
+        manifest: Path to a .tsv, .jsonl or .csv manifest (see `readManifest`).
+        defaults (dict): Parsed command line arguments.
+        workers (int): Number of worker processes.
+
+    Returns:
+        int: The number of records that could not be rendered.
+    """
+    # a bounded task queue keeps the memory flat for large manifests
+    tasks = multiprocessing.Queue(maxsize=2 * workers)
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=renderShards, args=(tasks, results, defaults))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+
+    failed = 0
+    received = 0
+    forcefield_ignored = False
+
+    def collect(block: bool) -> bool:
+        # log the status of one record, returns False if none was available
+        nonlocal failed, received, forcefield_ignored
+        try:
+            number, error, ignored = results.get(timeout=1) if block else results.get_nowait()
+        except queue.Empty:
+            return False
+        received += 1
+        forcefield_ignored = forcefield_ignored or ignored
+        if error is None:
+            logging.info(f"record {number} rendered")
+        else:
+            logging.error(f"record {number}: {error}")
+            failed += 1
+        return True
+
+    def putTask(task) -> None:
+        # wait for a free place in the queue, as long as a worker is alive
+        while True:
+            try:
+                tasks.put(task, timeout=1)
+                return
+            except queue.Full:
+                if not any(process.is_alive() for process in processes):
+                    raise ValueError("All worker processes of the batch stopped")
+                while collect(block=False):
+                    pass
+
+    total = 0
+    try:
+        shard = []
+        for number, record in enumerate(readManifest(manifest, validateTop(defaults)), 1):
+            shard.append((number, record))
+            total += 1
+            if len(shard) == SHARD_SIZE:
+                putTask(shard)
+                shard = []
+                while collect(block=False):
+                    pass
+        if shard:
+            putTask(shard)
+    finally:
+        for _ in processes:
+            if any(process.is_alive() for process in processes):
+                putTask(None)
+
+    while received < total:
+        if not collect(block=True) and not any(process.is_alive() for process in processes):
+            # drain what the workers reported before they stopped
+            while collect(block=False):
+                pass
+            lost = total - received
+            logging.error(f"{lost} records were lost by crashed worker processes")
+            failed += lost
+            break
+
+    for process in processes:
+        process.join()
+
+    if forcefield_ignored:
+        logging.warning(FORCEFIELD_WARNING)
+    return failed
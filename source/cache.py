@@ -0,0 +1,136 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+# size of a cache directory, before the least recently used entries are removed
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+# after an eviction the cache is filled to this fraction of its size
+EVICTION_TARGET = 0.9
+# prefix of the temporary files entries are written to, they are not entries yet
+TEMP_PREFIX = "tmp-"
+
+# DiskCache of every directory used by this process
+open_caches = {}
+
+
+class DiskCache:
+    """Content-addressed cache of bytes in a directory.
+
+    Every entry is stored in its own file, named after the sha256 hash
+    of its key. Entries are written to a temporary file and renamed,
+    so several processes (eg. batch workers) can share a directory.
+
+    The modification time of a file marks its last use. If the cache
+    grows above `max_bytes`, the least recently used entries are removed.
+    A failing cache never stops a render, errors are only logged.
+    """
+
+    def __init__(self, directory, max_bytes: int = MAX_CACHE_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        # estimated size of the directory, None until it was scanned
+        self.size = None
+
+    @staticmethod
+    def key(*parts) -> str:
+        """Key of an entry, the hash of json serializable parts."""
+        return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str):
+        """The bytes stored under `key` or None."""
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+            # mark the entry as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logging.warning(f"cache entry {path} could not be read: {e}")
+            return None
+        logging.info(f"cache hit {key[:12]}")
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store `data` under `key`, evicting old entries if the cache is full."""
+        path = self.path(key)
+        temp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=path.parent, prefix=TEMP_PREFIX,
+                                             delete=False) as f:
+                temp_name = f.name
+                f.write(data)
+            # the permissions of a usual file instead of 0600, output
+            # files can be hardlinks of entries (see rna_to_img.linkImage)
+            os.chmod(temp_name, 0o644)
+            try:
+                # the size of an entry that is replaced
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(temp_name, path)
+        except OSError as e:
+            logging.warning(f"cache entry {path} could not be written: {e}")
+            # a partly written entry would count as an entry in `scan`
+            if temp_name is not None:
+                Path(temp_name).unlink(missing_ok=True)
+            return
+
+        if self.size is None:
+            self.size = self.scan()[1]
+        else:
+            self.size += len(data) - replaced
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def scan(self) -> tuple:
+        """All entries as (modification time, size, path) and their total size.
+
+        Temporary files are left out, other processes may still write them.
+        """
+        entries = []
+        for path in self.directory.glob("*/*"):
+            if path.name.startswith(TEMP_PREFIX):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                # removed by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries, sum(size for _, size, _ in entries)
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits again."""
+        entries, self.size = self.scan()
+        for _, size, path in sorted(entries):
+            if self.size <= self.max_bytes * EVICTION_TARGET:
+                break
+            path.unlink(missing_ok=True)
+            self.size -= size
+        logging.info(f"cache {self.directory} evicted to {self.size} bytes")
+
+
+@lru_cache
+def fileDigest(path) -> str:
+    """sha256 of a file, part of the keys of entries created by its code."""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def openCache(v):
+    """The DiskCache of a validated input or None if caching is disabled."""
+    assert "cache" in v
+    if v["cache"] is None:
+        return None
+    directory = str(v["cache"])
+    if directory not in open_caches:
+        open_caches[directory] = DiskCache(directory)
+    return open_caches[directory]
@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+# index of a fasta file, to read single records of eg. a whole transcriptome.
+# the index has the format of samtools faidx (<fasta file>.fai) and is
+# created next to the fasta file the first time a record is read, or with:
+#   python3 fasta_index.py path/to/transcriptome.fasta
+# and used with:
+#   rna_to_img.py --fastafile=path/to/transcriptome.fasta --fastaRecord1=sRNA --fastaRecord2=transcript:120-340 ...
+import argparse
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+
+# suffix of the index file, appended to the name of the fasta file
+INDEX_SUFFIX = ".fai"
+
+# FastaIndex of every fasta file used by this process
+open_indexes = {}
+
+
+class FastaIndex:
+    """Records of a fasta file, read by seeking to their position.
+
+    For every record, the index stores its length, the offset of its first
+    nucleotide in the file and the number of nucleotides and bytes per line.
+    Every line of a record but the last one must have the same length.
+    Reading a part of a record only reads the lines of that part.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        # {record id: (length, offset, line nucleotides, line bytes)}
+        self.index = {}
+        index_path = Path(f"{self.path}{INDEX_SUFFIX}")
+        if index_path.exists() and index_path.stat().st_mtime >= self.path.stat().st_mtime:
+            with open(index_path) as f:
+                for line in f:
+                    record, length, offset, line_bases, line_width = line.rstrip("\n").split("\t")[:5]
+                    self.index[record] = (int(length), int(offset), int(line_bases), int(line_width))
+        else:
+            self.index = buildIndex(self.path)
+            try:
+                writeIndex(index_path, self.index)
+            except OSError as e:
+                # eg. a read only directory, the index is only kept in memory
+                logging.warning(f"fasta index {index_path} could not be written: {e}")
+
+    def fetch(self, record: str, first: int = 1, last: int = None) -> str:
+        """Nucleotides first to last (based 1, inclusive) of a record.
+
+        Raises:
+            ValueError: If the record is not in the fasta file or the
+                positions are outside of it.
+        """
+        if record not in self.index:
+            raise ValueError(f"The record {record} is not in the fasta file {self.path}")
+        length, offset, line_bases, line_width = self.index[record]
+        last = length if last is None else last
+        if not 1 <= first <= last <= length:
+            raise ValueError(f"The positions {first}-{last} are not in the record {record}" \
+                             f" of length {length}")
+
+        def position(nucleotide):
+            # offset of a nucleotide (based 0) in the file
+            return offset + nucleotide // line_bases * line_width + nucleotide % line_bases
+
+        with open(self.path, "rb") as f:
+            f.seek(position(first - 1))
+            data = f.read(position(last - 1) - position(first - 1) + 1)
+        return data.decode().replace("\n", "").replace("\r", "")
+
+
+def buildIndex(path) -> dict:
+    """Index every record of a fasta file, see `FastaIndex`.
+
+    The id of a record is the first word of its header.
+
+    Raises:
+        ValueError: If the file is compressed, has sequence lines before
+            the first header or records with lines of different lengths.
+    """
+    index = {}
+    record = None
+
+    def add():
+        if record is not None:
+            if record[0] in index:
+                raise ValueError(f"The fasta file {path} contains the record {record[0]} twice")
+            index[record[0]] = tuple(record[1:5])
+
+    with open(path, "rb") as f:
+        if f.read(2) == b"\x1f\x8b":
+            raise ValueError(f"The fasta file must not be compressed to be indexed: {path}")
+        f.seek(0)
+        offset = 0
+        # the last line of the current record was shorter than the ones before
+        short_line = False
+        for line in f:
+            line_width = len(line)
+            line_bases = len(line.rstrip(b"\r\n"))
+            if line.startswith(b">"):
+                add()
+                words = line[1:].decode().split()
+                if not words:
+                    raise ValueError(f"The fasta file {path} has a header without an id")
+                # id, length, offset, line nucleotides, line bytes
+                record = [words[0], 0, offset + line_width, 0, 0]
+                short_line = False
+            elif line_bases:
+                if record is None:
+                    raise ValueError(f"The fasta file {path} has a sequence without a header")
+                if record[3] == 0:
+                    record[3], record[4] = line_bases, line_width
+                elif short_line or line_bases > record[3] or \
+                        (line_bases == record[3] and line_width != record[4]):
+                    raise ValueError(f"The record {record[0]} of the fasta file {path}" \
+                                     " has lines of different lengths")
+                short_line = line_bases < record[3]
+                record[1] += line_bases
+            elif record is not None and record[1]:
+                # an empty line ends the sequence of a record
+                short_line = True
+            offset += line_width
+        add()
+    return index
+
+
+def writeIndex(index_path, index: dict) -> None:
+    """Write an index in the format of samtools faidx.
+
+    The index is written to a temporary file of its own and renamed,
+    processes (eg. batch workers) indexing the same file at the same
+    time each replace the index with a complete one.
+    """
+    index_path = Path(index_path)
+    f = tempfile.NamedTemporaryFile("w", dir=index_path.parent, prefix=f"{index_path.name}.",
+                                    suffix=".tmp", delete=False)
+    try:
+        with f:
+            for record, (length, offset, line_bases, line_width) in index.items():
+                f.write(f"{record}\t{length}\t{offset}\t{line_bases}\t{line_width}\n")
+        # the permissions of a usual file instead of 0600
+        os.chmod(f.name, 0o644)
+        os.replace(f.name, index_path)
+    except OSError:
+        Path(f.name).unlink(missing_ok=True)
+        raise
+
+
+def openIndex(path) -> FastaIndex:
+    """The FastaIndex of a fasta file, opened once per process."""
+    path = str(path)
+    if path not in open_indexes:
+        open_indexes[path] = FastaIndex(path)
+    return open_indexes[path]
+
+
+def parseRegion(region: str, index: FastaIndex) -> tuple:
+    """Split a record id with optional positions, eg. transcript:120-340.
+
+    An id that contains a colon itself is taken as a whole, if it is a
+    record of the index.
+
+    Returns:
+        tuple: The record id, the first and the last position. The
+        positions are None without a region.
+
+    Raises:
+        ValueError: If the positions are not valid.
+    """
+    match = re.fullmatch(r"(.+):(\d+)-(\d+)", region)
+    if match is None or region in index.index:
+        return region, None, None
+    first, last = int(match.group(2)), int(match.group(3))
+    if first < 1 or first > last:
+        raise ValueError(f"The given region is not valid: {region}")
+    return match.group(1), first, last
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+            description='create the index (.fai) of a fasta file, to read single records of it')
+    parser.add_argument('fasta', help='path to an uncompressed fasta file')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format="[{levelname}] {message}",
+                        style="{")
+    index = buildIndex(args.fasta)
+    writeIndex(f"{args.fasta}{INDEX_SUFFIX}", index)
+    logging.info(f"index of {len(index)} records created: {args.fasta}{INDEX_SUFFIX}")
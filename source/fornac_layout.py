@@ -0,0 +1,466 @@
+import math
+
+import numpy as np
+
+# python port of the parts of fornac (fornac/fornac.js) that place the
+# nodes of a molecule, when the forcefield is disabled.
+# The arithmetic follows fornac step by step, so the coordinates are the
+# same numbers fornac writes into the svg.
+
+BRACKET_LEFT = "([{<ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+BRACKET_RIGHT = ")]}>abcdefghijklmnopqrstuvwxyz"
+
+# default values of the FornaContainer options
+SVG_WIDTH = 300
+SVG_HEIGHT = 300
+MAX_NODE_RADIUS = 80
+NODE_RADIUS = 5
+LABEL_RADIUS = 6
+# distance between two neighbouring nucleotides and between a nucleotide and its label
+STEP = 15
+
+
+def removeBreaks(string: str):
+    """Remove all "&" from a structure or sequence string.
+
+    Returns:
+        tuple[str, list[int]]: The string without "&" and the positions of
+        the breaks (number of characters in front of each "&").
+    """
+    breaks = []
+    while "&" in string:
+        index = string.index("&")
+        breaks.append(index)
+        string = string[:index] + string[index+1:]
+    return string, breaks
+
+
+def dotbracketToPairtable(structure: str) -> list:
+    """Convert a dot-bracket string into a pairtable.
+
+    pairtable[0] is the length of the structure, pairtable[i] the
+    partner of nucleotide i (1-based) or 0 if it is unpaired.
+
+    Raises:
+        ValueError: If the structure contains an unknown symbol or an
+            unmatched bracket.
+    """
+    pairtable = [0] * (len(structure) + 1)
+    pairtable[0] = len(structure)
+    stacks = {bracket: [] for bracket in BRACKET_LEFT}
+
+    for index, char in enumerate(structure, 1):
+        if char in ".o":
+            continue
+        if char in BRACKET_LEFT:
+            stacks[char].append(index)
+        elif char in BRACKET_RIGHT:
+            opening = stacks[BRACKET_LEFT[BRACKET_RIGHT.index(char)]]
+            if not opening:
+                raise ValueError(f"Unmatched base at position {index}")
+            partner = opening.pop()
+            pairtable[index] = partner
+            pairtable[partner] = index
+        else:
+            raise ValueError(f"Unknown symbol in dotbracket string: {char}")
+
+    for stack in stacks.values():
+        if stack:
+            raise ValueError(f"Unmatched base at position {stack[0]}")
+    return pairtable
+
+
+def hasCrossingPairs(pairtable: list) -> bool:
+    """Check whether the pairtable contains pseudoknots (crossing basepairs)."""
+    stack = []
+    for i in range(1, pairtable[0] + 1):
+        j = pairtable[i]
+        if j > i:
+            stack.append(j)
+        elif j != 0 and j < i:
+            if stack.pop() != i:
+                return True
+    return False
+
+
+def maximumMatching(pairtable: list) -> np.ndarray:
+    """Maximal number of non crossing pairs of every subsequence.
+
+    matching[i, j] is the maximal number of pairs of the pairtable that can be
+    kept between i and j without crossing. Every column only depends on
+    earlier columns, so it is computed for all rows at once.
+    """
+    n = pairtable[0]
+    matching = np.zeros((n + 2, n + 2), dtype=np.int32)
+    for j in range(2, n + 1):
+        matching[1:j, j] = matching[1:j, j - 1]
+        i = pairtable[j]
+        if 0 < i < j:
+            # rows 1..i can pair i with j
+            candidates = matching[1:i + 1, i - 1] + 1 + matching[i + 1, j - 1]
+            np.maximum(matching[1:i + 1, j], candidates, out=matching[1:i + 1, j])
+    return matching
+
+
+def backtrackMaximumMatching(matching: np.ndarray, pairtable: list) -> list:
+    """Pairtable of one maximal non crossing subset of the basepairs."""
+    n = pairtable[0]
+    kept = [0] * (n + 1)
+    stack = [(1, n)]
+    while stack:
+        i, j = stack.pop()
+        if j - i - 1 < 0:
+            continue
+        score = matching[i, j]
+        if matching[i, j - 1] == score:
+            stack.append((i, j - 1))
+            continue
+        partner = pairtable[j]
+        inside = (matching[i, partner - 1] if partner > i else 0) + \
+                 (matching[partner + 1, j - 1] if j - partner - 1 > 0 else 0)
+        if i <= partner < j and inside + 1 == score:
+            kept[partner], kept[j] = j, partner
+            stack.append((partner + 1, j - 1))
+            if i < partner:
+                stack.append((i, partner - 1))
+    return kept
+
+
+def removePseudoknots(pairtable: list) -> list:
+    """Remove the pseudoknot pairs from a pairtable (in place).
+
+    Like fornac, the maximal set of non crossing pairs is kept.
+
+    Returns:
+        list[list[int]]: The removed pairs [i, j] with i < j.
+    """
+    if not hasCrossingPairs(pairtable):
+        return []
+    kept = backtrackMaximumMatching(maximumMatching(pairtable), pairtable)
+    removed = []
+    for i in range(1, len(pairtable)):
+        j = pairtable[i]
+        if j >= i and kept[i] != j:
+            removed.append([i, j])
+            pairtable[j] = 0
+            pairtable[i] = 0
+    return removed
+
+
+def ptToElements(pairtable: list) -> list:
+    """Split a pseudoknot free pairtable into its structural elements.
+
+    Returns:
+        list: Elements [type, level, nucleotides] with the types
+        s (stem), h (hairpin), i (interior loop), m (multiloop) and
+        e (exterior loop), sorted like fornac sorts them.
+    """
+    n = pairtable[0]
+    # fornac reads past the end of the pairtable, which ends the loops
+    pt = pairtable + [None, None]
+    elements = []
+    todo = [(0, 1, n)]
+    while todo:
+        level, i, j = todo.pop()
+        left, right = [i - 1], [j + 1]
+        if i > j:
+            continue
+        while pt[i] == 0:
+            left.append(i)
+            i += 1
+        while pt[j] == 0:
+            right.append(j)
+            j -= 1
+
+        if i > j:
+            left.append(i)
+            elements.append(["e" if level == 0 else "h", level, sorted(left)])
+            continue
+
+        if pt[i] != j:
+            loop = left + [i]
+            k = i
+            while k <= j:
+                todo.append((level, k, pt[k]))
+                loop.append(pt[k])
+                k = pt[k] + 1
+                while pt[k] == 0 and k <= j:
+                    loop.append(k)
+                    k += 1
+                loop.append(k)
+            loop.pop()
+            loop += right
+            elements.append(["e" if level == 0 else "m", level, sorted(loop)])
+            continue
+
+        left.append(i)
+        right.append(j)
+        if len(left + right) > 4:
+            elements.append(["e" if level == 0 else "i", level, sorted(left + right)])
+        stem = []
+        while pt[i] == j and i < j:
+            stem += [i, j]
+            i += 1
+            j -= 1
+            level += 1
+        elements.append(["s", level, sorted(stem)])
+        todo.append((level, i, j))
+
+    # fornac sorts the elements with the default javascript sort, which
+    # compares the elements as comma separated strings
+    return sorted(elements, key=lambda element: ",".join(str(x) for x in [element[0], element[1]] + element[2]))
+
+
+def loopAngles(pairtable: list) -> list:
+    """Angles between consecutive backbone steps (port of fornac's layout).
+
+    Every loop is drawn as a regular polygon, the angles of stems are
+    fixed. The loops are handled in the same order as fornac does, so
+    the sums are rounded the same way.
+    """
+    n = pairtable[0]
+    angles = [0.0] * (n + 5)
+    half_pi = math.pi / 2
+    # fornac reads past the end of the pairtable
+    pt = pairtable + [None, None, None]
+
+    def loop(i, j):
+        # sizes of the loop: nucleotides of the polygon and the stems leaving it
+        corners = 2
+        stems = []
+        previous = i - 1
+        j += 1
+        while i != j:
+            partner = pt[i]
+            if partner and i != 0:
+                corners += 2
+                p, q = i, partner
+                stems += [p, q]
+                i = partner + 1
+                start, end = p, q
+                stacked = 0
+                while True:
+                    p += 1
+                    q -= 1
+                    stacked += 1
+                    if not (pt[p] == q and pt[p] > p):
+                        break
+                k = stacked - 2
+                if stacked >= 2:
+                    angles[start + 1 + k] += half_pi
+                    angles[end - 1 - k] += half_pi
+                    angles[start] += half_pi
+                    angles[end] += half_pi
+                    if stacked > 2:
+                        for k in range(k, 0, -1):
+                            angles[start + k] = math.pi
+                            angles[end - k] = math.pi
+                if p <= q:
+                    yield (p, q)
+            else:
+                i += 1
+                corners += 1
+
+        polygon = math.pi * (corners - 2) / corners
+        bounds = stems + [j]
+        begin = 0 if previous < 0 else previous
+        for index in range(0, len(bounds), 2):
+            for k in range(bounds[index] - begin + 1):
+                angles[begin + k] += polygon
+            if index + 1 < len(bounds):
+                begin = bounds[index + 1]
+
+    # the loops are nested, a stack of generators replaces fornac's recursion
+    stack = [loop(0, n + 1)]
+    while stack:
+        try:
+            stack.append(loop(*next(stack[-1])))
+        except StopIteration:
+            stack.pop()
+    return angles
+
+
+def simpleXYCoordinates(pairtable: list) -> np.ndarray:
+    """Positions of all nucleotides without forcefield.
+
+    Args:
+        pairtable (list): Pseudoknot free pairtable.
+
+    Returns:
+        np.ndarray: Array of shape (n, 2) with the x, y coordinates.
+    """
+    n = pairtable[0]
+    angles = np.array(loopAngles(pairtable))
+    # the direction changes by pi - angle after each nucleotide
+    direction = np.concatenate(([0.0], np.add.accumulate(math.pi - angles[2:n])))[:n - 1]
+    steps = np.empty((n, 2))
+    steps[0] = 100
+    steps[1:, 0] = STEP * np.array([math.cos(a) for a in direction])
+    steps[1:, 1] = STEP * np.array([math.sin(a) for a in direction])
+    return np.add.accumulate(steps, axis=0)
+
+
+def labelPositions(positions: np.ndarray, pairtable: list) -> np.ndarray:
+    """Positions of the index labels of all nucleotides.
+
+    A label is placed 15 units away from its nucleotide, on the outside
+    of the loop or the stem the nucleotide belongs to.
+
+    Returns:
+        np.ndarray: Array of shape (n, 2) with the label positions.
+    """
+    n = pairtable[0]
+    if n == 1:
+        # fornac uses the shifted position itself as direction
+        shifted = positions - [STEP, 0]
+        offset = shifted + shifted
+    else:
+        pt = np.array(pairtable[1:])
+        node = np.arange(n)
+        prev = np.roll(node, 1)
+        next = np.roll(node, -1)
+        paired = pt != 0
+        # inside a stem, both neighbours are replaced by the partner
+        stacked = paired & paired[prev] & paired[next]
+        prev = np.where(stacked, pt - 1, prev)
+        next = np.where(stacked, pt - 1, next)
+        # unpaired nucleotides and stems point away from their neighbours,
+        # the first and last pair of a stem point away from the loop
+        inwards = (~paired | (paired[next] & paired[prev]))[:, None]
+        offset = np.where(inwards,
+                          (positions[next] - positions) + (positions[prev] - positions),
+                          (positions - positions[next]) + (positions - positions[prev]))
+    length = np.sqrt(offset[:, 0] * offset[:, 0] + offset[:, 1] * offset[:, 1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        normal = offset / length[:, None]
+    return positions + (-STEP * normal)
+
+
+def fakeNodeRadius(size: int) -> float:
+    """Radius of the invisible node fornac puts in the middle of a loop."""
+    return 18 / (2 * math.tan(6.283 / (2 * size)))
+
+
+def centroid(positions: np.ndarray, nucleotides: list) -> tuple:
+    """Mean position of the nucleotides, summed in the order fornac does."""
+    n = len(positions)
+    x = y = 0
+    count = 0
+    for nucleotide in nucleotides:
+        if nucleotide == 0 or nucleotide > n:
+            continue
+        x += positions[nucleotide - 1][0]
+        y += positions[nucleotide - 1][1]
+        count += 1
+    if count == 0:
+        return (math.nan, math.nan)
+    return (x / count, y / count)
+
+
+def middleNodes(positions: np.ndarray, pairtable: list, elements: list) -> list:
+    """Invisible nodes fornac adds to stabilize stems and loops.
+
+    Returns:
+        list[dict]: For every middle node in fornac's order its "num"
+        (-1 in stems and loops, -3 and -2 at the ends of the exterior loop),
+        "x", "y" and "radius".
+    """
+    n = pairtable[0]
+    nodes = []
+
+    def addFakeNode(nucleotides):
+        x, y = centroid(positions, nucleotides)
+        nodes.append({"num": -1, "x": x, "y": y, "radius": fakeNodeRadius(len(nucleotides))})
+
+    # reinforce stems
+    for kind, _, nucleotides in elements:
+        if kind != "s" or len(nucleotides) < 4:
+            continue
+        half = nucleotides[:len(nucleotides) // 2]
+        for a, b in zip(half, half[1:]):
+            addFakeNode([a, b, pairtable[b], pairtable[a]])
+
+    # reinforce loops
+    for kind, _, nucleotides in elements:
+        if kind == "s":
+            continue
+        loop = [i for i in nucleotides if 0 < i <= n]
+        if kind == "e":
+            for num, (x, y) in [(-3, positions[n - 1]), (-2, positions[0])]:
+                nodes.append({"num": num, "x": x, "y": y, "radius": 0})
+            # the two nodes above are part of the loop, but have no position
+            loop += [n + 1, n + 2]
+        addFakeNode(loop)
+    return nodes
+
+
+def elementTypes(elements: list, breaks: list, n: int) -> list:
+    """Element type of every nucleotide, used by the "loop" coloring.
+
+    Elements touching a break between two molecules count as exterior loop.
+    """
+    types = [None] * n
+    for kind, _, nucleotides in elements:
+        if any(i in breaks for i in nucleotides):
+            kind = "e"
+        for i in nucleotides:
+            if 0 < i <= n:
+                types[i - 1] = kind
+    return types
+
+
+def centerView(xs, ys, radii) -> tuple:
+    """Translation and scale fornac applies to fit all nodes into the svg.
+
+    Returns:
+        tuple[float, float, float]: x and y of the translation and the scale.
+    """
+    min_x, max_x = np.nanmin(xs), np.nanmax(xs)
+    min_y, max_y = np.nanmin(ys), np.nanmax(ys)
+    width = max_x - min_x
+    height = max_y - min_y
+    scale = 0.8 * min(SVG_WIDTH / (width + 1), SVG_HEIGHT / (height + 1), MAX_NODE_RADIUS / max(radii))
+    return (-min_x * scale + (SVG_WIDTH - width * scale) / 2,
+            -min_y * scale + (SVG_HEIGHT - height * scale) / 2,
+            scale)
+
+
+def computeLayout(structure: str) -> dict:
+    """Place all nodes fornac creates for a structure, without forcefield.
+
+    Args:
+        structure (str): Structure as passed to fornac, with "&" between
+            the molecules (see `formatStructure`).
+
+    Returns:
+        dict: with the keys
+            - "pairtable": pseudoknot free pairtable
+            - "pseudoknots": removed pseudoknot pairs
+            - "breaks": positions of the breaks between molecules
+            - "positions": nucleotide positions, shape (n, 2)
+            - "labels": label positions, shape (n, 2)
+            - "middle": invisible middle nodes (see `middleNodes`)
+            - "types": element type of every nucleotide
+            - "view": translation and scale of the plot (see `centerView`)
+    """
+    structure, breaks = removeBreaks(structure)
+    pairtable = dotbracketToPairtable(structure)
+    pseudoknots = removePseudoknots(pairtable)
+    elements = ptToElements(pairtable)
+
+    positions = simpleXYCoordinates(pairtable)
+    labels = labelPositions(positions, pairtable)
+    middle = middleNodes(positions, pairtable, elements)
+
+    xs = np.concatenate((positions[:, 0], labels[:, 0], [node["x"] for node in middle]))
+    ys = np.concatenate((positions[:, 1], labels[:, 1], [node["y"] for node in middle]))
+    radii = [NODE_RADIUS, LABEL_RADIUS] + [node["radius"] for node in middle]
+
+    return {"pairtable": pairtable,
+            "pseudoknots": pseudoknots,
+            "breaks": breaks,
+            "positions": positions,
+            "labels": labels,
+            "middle": middle,
+            "types": elementTypes(elements, breaks, pairtable[0]),
+            "view": centerView(xs, ys, radii)}
@@ -1,19 +1,100 @@
 import re
 import logging
-from utils import (listIntermolNodes, runCommand, parseLunpFile,  plfold_lunp, working_dir)
+import atexit
+import multiprocessing
+import os
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from access_store import (STORE_INDEX, STORE_PREFIX, openStore)
+from cache import (DiskCache, openCache)
+from fasta_index import (openIndex, parseRegion)
+from pair_table import pairTable
+from utils import (runCommand, parseLunpFile,  plfold_lunp, working_dir,
+                   scratchDirectory, AccessData, LunpData)
+from vienna import (foldConstrained, foldCoprocess, unpairedProbabilities, viennaVersion)
 from pathlib import Path
 import time
 
 # invisible Nodes between 2 molecules, seperating them
 GAP = 3
 
+# structures predicted by this process, by their cache key (see foldCached),
+# only the PREDICTED_STRUCTURES most recently used ones are kept
+PREDICTED_STRUCTURES = 1024
+predicted_structures = OrderedDict()
+# "hits" and "misses" of the structure prediction cache
+prediction_counter = Counter()
+# the predictions of the molecules run in threads at the same time
+predictions_lock = threading.Lock()
+
+# molecules up to this length are folded by RNAplfold as one window,
+# longer ones locally with these window (-W) and span (-L) sizes
+PLFOLD_WINDOW = 150
+PLFOLD_SPAN = 100
+
+# molecules longer than this are split into chunks, that are folded
+# by RNAplfold at the same time in `plfoldProcesses`
+PLFOLD_CHUNK = 5000
+
+# threads running the RNAfold and RNAplfold jobs of the molecules at the same time
+JOB_THREADS = 4
+
+# executors of this process by their name, with the id of the process
+# that created them (see getExecutor)
+executors = {}
+executors_lock = threading.Lock()
+
+def getExecutor(name: str, create):
+    """The executor `name` of this process, created by `create` on first use.
+
+    Executors are not created on import, most processes importing this
+    module (eg. the render daemon) never use them. A process forked from
+    one that used an executor creates its own, the threads and processes
+    of the parent do not exist in it.
+    """
+    with executors_lock:
+        if name not in executors or executors[name][0] != os.getpid():
+            executors[name] = (os.getpid(), create())
+        return executors[name][1]
+
+
+def plfoldProcesses() -> ProcessPoolExecutor:
+    """One process per core, started when the first chunk is folded.
+
+    The chunks are folded from a thread of `viennaJobs` while other
+    threads (eg. playwright) are running, the processes are started by
+    a fork server instead of forking this process.
+    """
+    return getExecutor("plfold", lambda: ProcessPoolExecutor(
+        mp_context=multiprocessing.get_context("forkserver")))
+
+
+def viennaJobs() -> ThreadPoolExecutor:
+    """Threads running the RNAfold and RNAplfold jobs of the molecules."""
+    return getExecutor("vienna", lambda: ThreadPoolExecutor(max_workers=JOB_THREADS,
+                                                            thread_name_prefix="vienna"))
+
+
+@atexit.register
+def shutdownExecutors() -> None:
+    """Cancel the waiting jobs and stop the executors created by this process."""
+    with executors_lock:
+        for pid, executor in executors.values():
+            if pid == os.getpid():
+                executor.shutdown(wait=True, cancel_futures=True)
+        executors.clear()
+
+
 def checkStructureInputSimple(structure: str) -> None:
     """
     Validate a structure string for correctly paired brackets.
 
-    Ensures that round brackets `()` and angle brackets `<>` are
-    properly opened and closed. For every opening bracket there must
-    be a corresponding closing bracket.
+    Ensures that round brackets `()`, angle brackets `<>`, square
+    brackets `[]` and curly brackets `{}` are properly opened and closed.
+    For every opening bracket there must be a corresponding closing
+    bracket, the basepairs may span both molecules.
 
     Args:
         structure: Structure string containing '.', '()', '<>' and
@@ -22,56 +103,17 @@ def checkStructureInputSimple(structure: str) -> None:
     Raises:
         ValueError: If there are too many opening or closing brackets.
     """
-    # check if the struture has only valid basepairs
-    # ie for every open bracket, one closing bracket
-    # () <> [] {}
-    basepairs = {"(": 0, "<": 0, "[": 0, "{": 0}
-    closing_bp = {")": "(", ">": "<", "]": "[", "{": "}"}
-
-    for char in structure:
-        if char in basepairs:
-            basepairs[char] += 1
-        if char in closing_bp:
-            open_bp = closing_bp[char]
-            basepairs[open_bp] -= 1        
-            if basepairs[open_bp] < 0:
-                raise ValueError(f"The number of brackets dont line up. Too many closing {char} brackets:\n" \
-                f"{structure}")
-        
-    for bp, count in basepairs.items():
-        if count > 0:
+    table = pairTable(structure)
+    if table.unmatched_closing:
+        char = table.structure[table.unmatched_closing[0]]
+        raise ValueError(f"The number of brackets dont line up. Too many closing {char} brackets:\n" \
+        f"{structure}")
+    for bp in ("(", "<", "[", "{"):
+        if bp in table.unmatched_opening:
             raise ValueError(f"The number of brackets dont line up. Too many opening {bp} brackets:\n" \
                 f"{structure}")
-        
-def findBasePairs(structure) -> list:
-    """
-    Identify base pair indices in a structure string.
-
-    Parses a dot-bracket style structure and returns index pairs
-    for matching brackets.
-
-    Args:
-        structure: Structure string containing bracket notation.
-
-    Returns:
-        A list of tuples where each tuple contains the indices
-        of a matching base pair (opening, closing).
-    """
-    basepair_list = []
-    basepairs = {"(": [], "<": [], "[": [], "{": []}
-    closing_bp = {")": "(", ">": "<", "]": "[", "{": "}"}
 
-    for index, char in enumerate(structure):
-        if char in basepairs:
-            basepairs[char] += [index]
-        if char in closing_bp:
-            open_bp = closing_bp[char]
-            if basepairs[open_bp]:
-                basepair_open = basepairs[open_bp].pop()
-                basepair_list += [(basepair_open, index)]
-    return basepair_list
-
-def removeBPoutsideBounds(structure: list, bounds) -> str:
+def removeBPoutsideBounds(structure: list, bounds, basepairs: list) -> str:
     """
     Remove base pairs outside specified bounds.
 
@@ -81,18 +123,18 @@ def removeBPoutsideBounds(structure: list, bounds) -> str:
     Args:
         structure: Structure as a list of characters.
         bounds: Tuple containing start and end indices.
+        basepairs: Basepairs of the structure (see `PairTable.pairs`).
 
     Returns:
         The modified structure as a string.
     """
     start, end = bounds
-    for start_bp, end_bp in findBasePairs(structure):
+    for start_bp, end_bp in basepairs:
         if start_bp < start or end_bp > end:
             structure[start_bp] = "."
             structure[end_bp] = "."
     return "".join(structure)
 
-
 def sameLength(ab: tuple) -> bool:
     """
     Check whether two strings have the same length.
@@ -417,6 +459,53 @@ def validateColoring(args: dict) -> str:
         return coloring
     raise ValueError(f"The given coloring input is not accepted: {coloring} (accept only loop or strand)")
 
+def validateEngine(args: dict, output_type: str) -> str:
+    """
+    Validate the engine option.
+
+    Args:
+        args: Argument dictionary containing the key 'engine'.
+        output_type: Validated output file type.
+
+    Returns:
+        The validated engine value.
+
+    Raises:
+        ValueError: If the engine value is invalid or the python
+            engine is asked for a png image.
+    """
+    assert "engine" in args
+    engine = args["engine"]
+    if engine not in ["browser", "python"]:
+        raise ValueError(f"The given engine input is not accepted: {engine} (accept only browser or python)")
+    if engine == "python" and output_type != "svg":
+        raise ValueError(f"The python engine only creates svg images, not {output_type}")
+    return engine
+
+def validateCache(args: dict):
+    """
+    Validate the cache option.
+
+    Args:
+        args: Argument dictionary containing the key 'cache'.
+
+    Returns:
+        The cache directory as a Path, None if caching is disabled.
+
+    Raises:
+        ValueError: If the cache directory can not be created.
+    """
+    assert "cache" in args
+    if args["cache"] == "None":
+        return None
+    directory = Path(args["cache"])
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        raise ValueError(f"The given cache directory could not be created: {e}")
+    return directory
+
+
 def checkHybridInput(hybrid, sequence, offsets) -> None:
     """
     Validate hybrid structure input.
@@ -601,6 +690,32 @@ def validateCropping(args, mol) -> int:
     return ValueError    
 
 
+def cropBounds(table, mol: int, crop):
+    """
+    Part of a molecule that is kept by cropping.
+
+    Args:
+        table: PairTable of both structures.
+        mol: Molecule 1 or 2.
+        crop: Nucleotides kept on both sides of the intermolecular region.
+
+    Returns:
+        The first and the last kept index (based 0), or None if the
+        molecule is not cropped or has no intermolecular basepairs.
+    """
+    intermol = table.intermolecularNodes(mol)
+    if crop is None or not intermol:
+        return None
+    start, end = intermol[0], intermol[-1]
+    first, behind_last = table.bounds(mol)
+    end_structure = behind_last - first
+    bigger_than_0 = start - crop > 0 
+    smaller_than_end = end + crop < end_structure
+    start_crop = start - crop if bigger_than_0 else 0 
+    end_crop = end + crop if smaller_than_end else end_structure
+    return start_crop, end_crop
+
+
 def croppingInput(v) -> dict:
     """
     Apply cropping to structure and sequence data.
@@ -639,38 +754,22 @@ def croppingInput(v) -> dict:
     if crop[1] is None and crop[2] is None:
         return {}
 
-    # get the intermolecular region indicies
-    region = []
-    for mol, struc in structure.items():
-        intermol = [i for i,_ in listIntermolNodes(struc)]
-        if intermol:
-            # if there are intermolecular basepairs
-            region += [(intermol[0], intermol[-1])]
-        else:
-            # if not, let it skip
-            region+= [(0,0)]
-            crop[mol] = None
+    table = pairTable(f"{structure[1]}&{structure[2]}")
 
     # ---------------------------------------------------------------
     # NNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNNN
     # remove ->|<-crop--|intermol-region|--crop->|<- remove
     # iterate through the 2 molecules
-    for mol, (start, end) in enumerate(region, 1):
-        # if no copping set, change nothing for this molecule 
-        if crop[mol] is None:
-            continue
-
-        end_structure = len(structure[mol])
-        # start and end based 1 -> based 0
-        start, end = start-1, end-1
+    for mol in (1, 2):
         # after cropping, the new submolecule is between start_crop and end_crop
-        bigger_than_0 = start - crop[mol] > 0 
-        smaller_than_end = end + crop[mol] < end_structure
-        start_crop = start - crop[mol] if bigger_than_0 else 0 
-        end_crop = end + crop[mol] if smaller_than_end else end_structure
+        bounds = cropBounds(table, mol, crop[mol])
+        # if no copping set or no intermolecular basepairs, change nothing for this molecule 
+        if bounds is None:
+            continue
+        start_crop, end_crop = bounds
 
         # remove all basepairs outside bounds
-        structure[mol]= removeBPoutsideBounds(list(structure[mol]), (start_crop, end_crop))
+        structure[mol]= removeBPoutsideBounds(list(structure[mol]), (start_crop, end_crop), table.pairs(mol))
 
         # crop substring: [start index : end Index + 1]
         structure[mol]= structure[mol][start_crop:end_crop+1] 
@@ -746,6 +845,16 @@ def validate(args) -> dict:
     """
     validated = {}
 
+    # --------------------------------------------------------------
+    # fasta input, records of the file can set the start indices
+    if args["fastafile"] != "None":
+        if args["sequence"] != "":
+            raise ValueError("Invalid combination of Inputs: \n" \
+                f"sequence input either through fasta file or through --sequence String. not both")
+        args["sequence"] = validateInputFile(args)
+    elif args["fastaRecord1"] != "None" or args["fastaRecord2"] != "None":
+        raise ValueError("--fastaRecord1 and --fastaRecord2 can only be used with --fastafile")
+
     validated["offset1"] = validateOffset(args, "startIndex1")
     validated["offset2"] = validateOffset(args, "startIndex2")
     # no validation possible / needed
@@ -755,15 +864,7 @@ def validate(args) -> dict:
     validated["predictStructure1"] = args["predictStructure1"] 
     validated["predictStructure2"] = args["predictStructure2"] 
     validated["legend"] = args["legend"]
-
-
-    # --------------------------------------------------------------
-    # fasta input
-    if args["fastafile"] != "None":
-        if args["sequence"] != "":
-            raise ValueError("Invalid combination of Inputs: \n" \
-                f"sequence input either through fasta file or through --sequence String. not both")
-        args["sequence"] = validateInputFile(args)
+    validated["cache"] = validateCache(args)
 
 
     # -------------------------------------------------------------
@@ -791,24 +892,24 @@ def validate(args) -> dict:
     # if enabled, use structure prediction for intramolecular structure
     validated["molecules"] = getMolecules(validated)
 
-    if validated["predictStructure1"] or validated["predictStructure2"]:
-        validated["structure"] = predictIntramolStructure(validated)
-
-    # if an interaction between 2 Molecules is given, fornac does not display 
-    # the first 2 nucelotides of the second molecule. 
-    # in the variables "structure" and "sequence" a fix has been added
-    # but "structure1" and "structure2" are data only and do not have the fix
-    # update: {"structure1", "structure2", "structure", "structure_dict"}
-    validated.update(formatStructure(validated))
-
-
-
+    # the accessibility only depends on the sequences (and with a flank
+    # on the cropped region), RNAplfold runs while the structure is predicted
+    validated["accessibilityStore"] = validateAccessibilityStore(args)
+    validated["accessibility1"] = validateAccessibilityInput(args, "accessibility1")
+    validated["accessibility2"] = validateAccessibilityInput(args, "accessibility2")
+    validated["accessibilityFlank"] = validateAccessibilityFlank(args)
+    validated["accessibilityColumn"] = validateAccessibilityColumn(args)
+    for i in ("1","2"):
+        validated[f"crop{i}"] = validateCropping(args, "") if args["crop"] != "None" else validateCropping(args, i)
 
     # --------------------------------------------------------------
-    # rest
+    # rest, validated before RNAplfold is started: an invalid option
+    # must not wait for the jobs to finish
 
     validated["output_name"], validated["output_legend"], validated["output_type"] = validateOutput(args)
 
+    validated["engine"] = validateEngine(args, validated["output_type"])
+
     validated["coloring"] = validateColoring(args)
 
     validated["highlighting"] = validateHighlighting(args)
@@ -817,17 +918,31 @@ def validate(args) -> dict:
 
     validated["labelInterval"] = validateLabelInterval(args)
 
-    validated["accessibility1"] = validateAccessibilityInput(args, "accessibility1")
-    validated["accessibility2"] = validateAccessibilityInput(args, "accessibility2")
-
-    validated["access_data"] = parseAccessibility(validated)
-
     for i in ("1","2"):
         validated[f"highlightSubseq{i}"] = validateSubsequenceInput(args, validated, i)
-        validated[f"crop{i}"] = validateCropping(args, "") if args["crop"] != "None" else validateCropping(args, i)
 
     validated["forcefield"], validated["forcefield_timer"] = validateForcefieldInput(args)
+    validated["forcefield_ticks"] = validateForcefieldTicks(args)
+    if validated["forcefield_ticks"] is not None:
+        # the ticks replace the timer, even if it disabled the forcefield
+        validated["forcefield"] = True
 
+    accessibility_jobs = startAccessibilityJobs(validated, pairTable(validated["structure"]))
+
+    if validated["predictStructure1"] or validated["predictStructure2"]:
+        validated["structure"] = predictIntramolStructure(validated)
+
+    # if an interaction between 2 Molecules is given, fornac does not display 
+    # the first 2 nucelotides of the second molecule. 
+    # in the variables "structure" and "sequence" a fix has been added
+    # but "structure1" and "structure2" are data only and do not have the fix
+    # update: {"structure1", "structure2", "structure", "structure_dict"}
+    validated.update(formatStructure(validated))
+
+
+
+
+    validated["access_data"] = parseAccessibility(validated, accessibility_jobs)
 
     # ---------------------------
     # crop all input
@@ -837,32 +952,76 @@ def validate(args) -> dict:
     return validated
 
 
-def parseAccessibility(v):
+def startAccessibilityJobs(v, table) -> dict:
+    """
+    Start RNAplfold for every molecule with --accessibility RNAplfold.
+
+    The molecules are predicted at the same time in `viennaJobs`.
+    With --accessibilityFlank, only the part of a molecule that is kept
+    by cropping and the flanks on both sides of it are folded.
+
+    Args:
+        v: Dictionary with the validated sequences and options.
+        table: PairTable of the structures, without the fornac fix.
+
+    Returns:
+        Dictionary of molecule ("1", "2") to the Future of its
+        probabilities (see `predictAccessibility`) and the index
+        (based 0) of the first folded nucleotide.
+    """
+    for var in ["accessibility1", "accessibility2", "sequence1", "sequence2",
+                "RNAplfold", "cache", "molecules", "crop1", "crop2", "accessibilityFlank"]:
+        assert var in v
+    cache = openCache(v)
+    flank = v["accessibilityFlank"]
+    jobs = {}
+    for mol in ("1", "2"):
+        seq = v[f"sequence{mol}"]
+        if v[f"accessibility{mol}"] != "RNAplfold" or seq == "":
+            continue
+        # cropping only makes sense in an intermolecular setting
+        bounds = None
+        if flank is not None and v["molecules"] == "2":
+            bounds = cropBounds(table, int(mol), v[f"crop{mol}"])
+        first, last = (0, len(seq) - 1) if bounds is None else bounds
+        first, last = max(first - (flank or 0), 0), min(last + (flank or 0), len(seq) - 1)
+        job = viennaJobs().submit(predictAccessibility, seq[first:last + 1], v["RNAplfold"], cache)
+        jobs[mol] = (job, first)
+    return jobs
+
+
+def parseAccessibility(v, jobs=None):
     """
     Depending on configuration, accessibility data is either:
     - disabled (None),
     - computed using RNAplfold ("RNAplfold"),
+    - taken from the accessibility store ("store:<transcript id>"),
     - or loaded from a provided lunp file.
 
+    jobs: RNAplfold jobs started by `startAccessibilityJobs`, 
+    they are started here if not given.
     """
 
     # get default lunp file
-    for var in ["accessibility1", "accessibility2", 
-                "sequence1", "sequence2", "RNAplfold"]:
+    for var in ["accessibility1", "accessibility2", "accessibilityStore", "accessibilityColumn",
+                "sequence1", "sequence2", "offset1", "offset2", "RNAplfold", "cache"]:
         assert var in v
     
-    RNAplfold_parameters = v["RNAplfold"]
+    if jobs is None:
+        jobs = startAccessibilityJobs(v, pairTable(f"{v['structure1']}&{v['structure2']}"))
     acc1 = v["accessibility1"]
     acc2 = v["accessibility2"]
     sequence1 = v["sequence1"]
     sequence2 = v["sequence2"]
     shift1 = 0
     shift2 = len(sequence1) + GAP
-    access_data = {}
+    # the probabilities stay in the arrays of RNAplfold and the lunp files
+    access_data = AccessData()
     mol = {"1": (acc1, sequence1, shift1),
            "2": (acc2, sequence2, shift2)}
+    offsets = {"1": v["offset1"], "2": v["offset2"]}
 
-    for access_file, seq, shift in mol.values():
+    for number, (access_file, seq, shift) in mol.items():
         # 3 distinct cases
         if access_file is None:
             # accessibilty disabled
@@ -873,23 +1032,22 @@ def parseAccessibility(v):
             # add to access data
             if seq == "":
                 continue
-            # if no additional winsize is given, use the whole sequence length as window
-            win_size = f"-W{len(seq)}"
-            if "-W" in RNAplfold_parameters or "--winsize" in RNAplfold_parameters:
-                win_size = ""
-
-            runCommand(f"echo {seq} | RNAplfold {win_size} -u1 {RNAplfold_parameters}", "(^$)")
-            access_data.update(parseLunpFile(plfold_lunp, shift))
-            # remove left over files
-            runCommand(f"rm plfold_lunp", "(^$)")
-            runCommand(f"rm plfold_dp.ps", "(^$)")
+            job, first = jobs[number]
+            # nan: RNAplfold gave no probability for the nucleotide,
+            # LunpData leaves it out
+            access_data.parts.append(LunpData(job.result(), first + shift))
 
+        elif access_file.startswith(STORE_PREFIX):
+            # the part of the transcript starting at the start index
+            store = openStore(v["accessibilityStore"])
+            transcript = access_file[len(STORE_PREFIX):]
+            access_data.parts.append(store.molecule(transcript, offsets[number], len(seq), shift))
 
         else:
             # otherwise, data shall be given: 
             # parse lunp file and apply shift
             # add to access data
-            access_data.update(parseLunpFile(access_file, shift))
+            access_data.parts.append(parseLunpFile(access_file, shift, v["accessibilityColumn"]))
 
     # check if access data is valid:
     validateAccessData(v, access_data)
@@ -898,6 +1056,191 @@ def parseAccessibility(v):
 
 
 
+def plfoldParameters(length: int, RNAplfold_parameters: str) -> str:
+    """
+    Add the window and span of RNAplfold to the given parameters.
+
+    Molecules up to PLFOLD_WINDOW nucleotides are folded globally, with
+    the whole molecule as window. Longer molecules are folded locally,
+    the time and memory of RNAplfold then only grow linearly with
+    their length. A window or span given with --RNAplfold is kept.
+
+    Args:
+        length: Length of the folded sequence.
+        RNAplfold_parameters: Parameters given with --RNAplfold.
+
+    Returns:
+        The parameters of the RNAplfold call, without -u.
+    """
+    options = []
+    if not re.search(r"(^|\s)(-W|--winsize)", RNAplfold_parameters):
+        options.append(f"-W{min(length, PLFOLD_WINDOW)}")
+        if length > PLFOLD_WINDOW and not re.search(r"(^|\s)(-L|--span)", RNAplfold_parameters):
+            options.append(f"-L{PLFOLD_SPAN}")
+    return " ".join(options + [RNAplfold_parameters]).strip()
+
+
+def predictAccessibility(seq: str, RNAplfold_parameters: str, cache=None) -> array:
+    """
+    Predict the probability of every nucleotide to be unpaired with RNAplfold.
+
+    The probabilities of a sequence are stored in the cache directory
+    (see --cache), by the sequence, the parameters and the version of
+    ViennaRNA, and only predicted once.
+
+    Args:
+        seq: RNA sequence.
+        RNAplfold_parameters: Parameters given with --RNAplfold.
+        cache: DiskCache of the input or None.
+
+    Returns:
+        Array of doubles, the probability of nucleotide i at index i-1.
+    """
+    parameters = plfoldParameters(len(seq), RNAplfold_parameters)
+
+    if cache is not None:
+        key = DiskCache.key("RNAplfold", seq, f"-u1 {parameters}", viennaVersion())
+        stored = cache.get(key)
+        if stored is not None:
+            return array("d", stored)
+
+    window = plfoldWindow(parameters)
+    if len(seq) > PLFOLD_CHUNK and window is not None and 4 * window <= PLFOLD_CHUNK:
+        probabilities = foldChunks(seq, parameters, window)
+    else:
+        probabilities = foldAccessibility(seq, parameters)
+
+    probabilities = array("d", probabilities)
+    if cache is not None:
+        cache.put(key, probabilities.tobytes())
+    return probabilities
+
+
+def plfoldWindow(parameters: str):
+    """The window size (-W) in parameters of RNAplfold, None if it is not set."""
+    match = re.search(r"(?:^|\s)(?:-W\s*|--winsize[=\s]+)(\d+)", parameters)
+    return int(match.group(1)) if match else None
+
+
+def foldAccessibility(seq: str, parameters: str) -> list:
+    """
+    Run RNAplfold -u1 on a sequence.
+
+    Args:
+        seq: RNA sequence.
+        parameters: Parameters of the call, see `plfoldParameters`.
+
+    Returns:
+        List of the probabilities of nucleotide i at index i-1,
+        nan if RNAplfold gave no probability for a nucleotide.
+    """
+    # in process with the python module of ViennaRNA, if it is installed
+    probabilities = unpairedProbabilities(seq, parameters)
+    if probabilities is None:
+        # the lunp file and the dot plot are removed with the scratch directory
+        with scratchDirectory() as scratch:
+            runCommand(f"echo {seq} | RNAplfold -u1 {parameters}", "(^$)", cwd=scratch)
+            lunp = parseLunpFile(Path(scratch) / plfold_lunp, 0)
+        probabilities = [lunp.get(index, float("nan")) for index in range(1, len(seq) + 1)]
+    return probabilities
+
+
+def foldChunks(seq: str, parameters: str, window: int) -> list:
+    """
+    Run RNAplfold -u1 on chunks of a long sequence at the same time.
+
+    RNAplfold averages the probability of a nucleotide over all windows
+    containing it. Each chunk is folded with `window` nucleotides of
+    its neighbours on both sides, so every window of a nucleotide in
+    the chunk lies inside the folded sequence. Only the probabilities
+    of the chunk itself are kept, they are the same as of one run over
+    the whole sequence.
+
+    Args:
+        seq: RNA sequence, longer than PLFOLD_CHUNK.
+        parameters: Parameters of the call, with a window size (-W).
+        window: The window size of the parameters.
+
+    Returns:
+        List of the probabilities of nucleotide i at index i-1.
+    """
+    chunks = []
+    for start in range(0, len(seq), PLFOLD_CHUNK):
+        end = min(start + PLFOLD_CHUNK, len(seq))
+        chunks.append((start, end, max(start - window, 0), min(end + window, len(seq))))
+    logging.info(f"RNAplfold folds {len(seq)} nucleotides in {len(chunks)} chunks")
+
+    folded = plfoldProcesses().map(foldAccessibility,
+                                   [seq[first:last] for _, _, first, last in chunks],
+                                   [parameters] * len(chunks))
+    probabilities = []
+    for (start, end, first, _), chunk in zip(chunks, folded):
+        probabilities += chunk[start - first:end - first]
+    return probabilities
+
+
+def foldCached(sequence, constraint, parameters, cache=None) -> str:
+    """
+    Predict the structure of a sequence with a hard constraint, at most once.
+
+    Args:
+        sequence: RNA sequence.
+        constraint: Constraint mask, "x" for nucleotides that stay unpaired.
+        parameters: Parameters for RNAfold.
+        cache: DiskCache of the input or None.
+
+    Returns:
+        The predicted structure in dot-bracket notation.
+    """
+    key = DiskCache.key("RNAfold -C", sequence, constraint, parameters, viennaVersion())
+    with predictions_lock:
+        intra_structure = predicted_structures.get(key)
+        if intra_structure is not None:
+            predicted_structures.move_to_end(key)
+            prediction_counter["hits"] += 1
+            return intra_structure
+    stored = cache.get(key) if cache is not None else None
+    if stored is not None:
+        with predictions_lock:
+            prediction_counter["hits"] += 1
+        rememberStructure(key, stored.decode())
+        return stored.decode()
+
+    with predictions_lock:
+        prediction_counter["misses"] += 1
+    # in process with the python module of ViennaRNA, if it is installed
+    intra_structure = foldConstrained(sequence, constraint, parameters)
+    if intra_structure is None:
+        # otherwise by an RNAfold process, that is kept for the next predictions
+        intra_structure = foldCoprocess(sequence, constraint, parameters)
+    if intra_structure is None:
+        # prepare the RNA fold call
+        RNAfoldcall = f"RNAfold --noPS -C {parameters} << EOF\nSEQ\nCONSTRAINTS\nEOF"
+        call = RNAfoldcall.replace("SEQ", sequence).replace("CONSTRAINTS", constraint)
+        intra_structure = runCommand(call, r"([\.()]+)")    
+
+    rememberStructure(key, intra_structure)
+    if cache is not None:
+        cache.put(key, intra_structure.encode())
+    return intra_structure
+
+
+def rememberStructure(key: str, structure: str) -> None:
+    """Keep a prediction for the process, dropping the least recently used one if full."""
+    with predictions_lock:
+        predicted_structures[key] = structure
+        predicted_structures.move_to_end(key)
+        while len(predicted_structures) > PREDICTED_STRUCTURES:
+            predicted_structures.popitem(last=False)
+
+
+def logPredictionCounter() -> None:
+    """Log how many structure predictions were taken from the cache."""
+    if prediction_counter:
+        logging.info(f"structure predictions: {prediction_counter['hits']} cached, "
+                     f"{prediction_counter['misses']} predicted")
+
+
 def validateAccessData(v, data):
     for index, prb in data.items():
         if str(index) not in v["sequence_dict"]:
@@ -913,6 +1256,92 @@ def validateForcefieldInput(args):
     else:
         return (True, timer)
 
+def validateAccessibilityStore(args: dict):
+    """
+    Validate the accessibility store option.
+
+    Args:
+        args: Argument dictionary containing the key 'accessibilityStore'.
+
+    Returns:
+        The directory of the store as a Path, None if no store is used.
+
+    Raises:
+        ValueError: If the directory is not an accessibility store.
+    """
+    assert "accessibilityStore" in args
+    if args["accessibilityStore"] == "None":
+        return None
+    directory = Path(args["accessibilityStore"])
+    if not (directory / STORE_INDEX).exists():
+        raise ValueError(f"The given accessibility store could not be found: {directory}")
+    return directory
+
+def validateAccessibilityFlank(args: dict):
+    """
+    Validate the accessibility flank option.
+
+    Args:
+        args: Argument dictionary containing the key 'accessibilityFlank'.
+
+    Returns:
+        The flank as an int, None if the whole molecules are folded.
+
+    Raises:
+        ValueError: If the flank is not a non negative integer.
+    """
+    assert "accessibilityFlank" in args
+    flank = args["accessibilityFlank"]
+    if flank == "None":
+        return None
+    if not re.fullmatch(r"\d+", flank):
+        raise ValueError(f"accessibilityFlank must be 0 or higher and not {flank}")
+    return int(flank)
+
+def validateAccessibilityColumn(args: dict):
+    """
+    Validate the accessibility column option.
+
+    Args:
+        args: Argument dictionary containing the key 'accessibilityColumn'.
+
+    Returns:
+        The column of the probabilities in a lunp file as an int.
+
+    Raises:
+        ValueError: If the column is not a positive integer.
+    """
+    assert "accessibilityColumn" in args
+    column = args["accessibilityColumn"]
+    if not re.fullmatch(r"\d+", column) or int(column) < 1:
+        raise ValueError(f"accessibilityColumn must be 1 or higher and not {column}")
+    return int(column)
+
+def validateForcefieldTicks(args: dict):
+    """
+    Validate the forcefield ticks option.
+
+    Args:
+        args: Argument dictionary containing the key 'forcefieldTicks'.
+
+    Returns:
+        The number of ticks as an int, None if the forcefield uses its timer.
+
+    Raises:
+        ValueError: If the number of ticks is not a positive integer.
+    """
+    assert "forcefieldTicks" in args
+    ticks = args["forcefieldTicks"]
+    if ticks == "None":
+        return None
+    try:
+        ticks = int(ticks)
+    except ValueError:
+        raise ValueError(f"Invalid integer for forcefieldTicks: {ticks}")
+    if ticks < 1:
+        raise ValueError(f"forcefieldTicks must be 1 or higher and not {ticks}")
+    return ticks
+
 def validateFloat(args, key) -> float:
     string = args[key]
     try:
@@ -963,23 +1392,29 @@ def validateAccessibilityInput(args, key) -> str:
     Validate accessibility input.
 
     Checks whether the given accessibility input is valid, either as
-    a predefined keyword or as a path to an existing file.
+    a predefined keyword, a transcript of the accessibility store
+    ("store:<transcript id>") or as a path to an existing file.
 
     Args:
         args: Argument dictionary.
         key: Key corresponding to the accessibility parameter.
 
     Returns:
-        The path to Accessibility input file, the RNAplfold string value or None.
+        The path to Accessibility input file, the RNAplfold or store string value or None.
 
     Raises:
-        ValueError: If the input is invalid or the file does not exist.
+        ValueError: If the input is invalid, the file does not exist or
+            a transcript is selected without an accessibility store.
     """
     assert key in args
     if args[key] == "None":
         return None
     if args[key] == "RNAplfold":
         return "RNAplfold"
+    if args[key].startswith(STORE_PREFIX):
+        if args["accessibilityStore"] == "None":
+            raise ValueError(f"{args[key]} needs an accessibility store (--accessibilityStore)")
+        return args[key]
     if Path(args[key]).exists():
         return args[key]
     raise ValueError(f"The given Input File could not be found: {args[key]}")
@@ -1015,6 +1450,8 @@ def validateInputFile(args)-> str:
 
     Reads a FASTA file, ensures the number of sequences does not exceed
     two, and combines them into a single string separated by '&'.
+    With --fastaRecord1/2 only the given records are read (see
+    `fetchFastaRecords`), the file may contain any number of them.
 
     Args:
         args: Argument dictionary containing the file path.
@@ -1031,6 +1468,9 @@ def validateInputFile(args)-> str:
     if not Path(inputFile).exists():
         raise ValueError(f"The given Input File could not be found: {inputFile}")
 
+    if args["fastaRecord1"] != "None" or args["fastaRecord2"] != "None":
+        return fetchFastaRecords(args)
+
     # parse fasta file
     sequences = parse_fasta(inputFile)
 
@@ -1040,6 +1480,48 @@ def validateInputFile(args)-> str:
     
     return "&".join(sequences.values())
 
+def fetchFastaRecords(args) -> str:
+    """
+    Read the sequences of --fastaRecord1/2 from an indexed FASTA file.
+
+    A record is given by its id (the first word of its header), optionally
+    followed by the positions of a part of it, eg. transcript:120-340.
+    The start index of a molecule read from a part is the position of
+    that part, so the nucleotides are labeled like in the whole record.
+
+    Args:
+        args: Argument dictionary containing the file path and the records.
+
+    Returns:
+        A combined sequence string.
+
+    Raises:
+        ValueError: If a record or region is not in the file, or a region
+            is combined with a start index.
+    """
+    assert "fastaRecord1" in args
+    assert "fastaRecord2" in args
+    if args["fastaRecord1"] == "None":
+        raise ValueError("--fastaRecord2 can only be used together with --fastaRecord1")
+    index = openIndex(args["fastafile"])
+
+    sequences = []
+    for i in ("1", "2"):
+        if args[f"fastaRecord{i}"] == "None":
+            continue
+        record, first, last = parseRegion(args[f"fastaRecord{i}"], index)
+        if first is None:
+            sequences.append(index.fetch(record))
+            continue
+        if args[f"startIndex{i}"] != "1":
+            raise ValueError("Invalid combination of Inputs: \n" \
+                f"the start index of molecule {i} is the start of the region {args[f'fastaRecord{i}']}." \
+                f" --startIndex{i} can not be given as well")
+        args[f"startIndex{i}"] = str(first)
+        sequences.append(index.fetch(record, first, last))
+    logging.info(f"read {len(sequences)} records of {args['fastafile']}")
+    return "&".join(sequences)
+
 def parse_fasta(file_path) -> dict:
     """
     Parse a FASTA file into a dictionary of sequences.
@@ -1106,13 +1588,18 @@ def predictIntramolStructure(v) -> str:
         structure[str(mol)] = string
 
     parameters = v["RNAfold"]
+    cache = openCache(v)
 
+    # the molecules are predicted at the same time
+    jobs = {}
     for mol in mols:
         if v[f"predictStructure{mol}"]:
             # check if struc prediction mol is true
             seq = v[f"sequence{mol}"]
             struc = structure[mol]
-            structure[mol] = predictSequence(struc, seq, parameters)
+            jobs[mol] = viennaJobs().submit(predictSequence, struc, seq, parameters, cache)
+    for mol, job in jobs.items():
+        structure[mol] = job.result()
 
 
 
@@ -1120,28 +1607,29 @@ def predictIntramolStructure(v) -> str:
 
     
 
-def predictSequence(inter_structure, sequence, parameters) ->str:
+def predictSequence(inter_structure, sequence, parameters, cache=None) ->str:
     """
     Predict intramolecular structure for a single sequence.
 
     Calls an external RNA folding tool with constraints derived from
     the intermolecular structure and integrates the predicted result.
+    The last PREDICTED_STRUCTURES predictions are kept by the process,
+    all of them in the cache directory (see --cache), counted in
+    `prediction_counter`.
 
     Args:
         inter_structure: Structure containing intermolecular constraints.
         sequence: RNA sequence.
         parameters: Parameters for the RNA folding tool.
+        cache: DiskCache of the input or None.
 
     Returns:
         A structure string combining inter- and intramolecular interactions.
     """
     # predict intramol structure for a given sequence and structure
     # the intermolecular structure stays preserved
-    # prepare the RNA fold call
-    RNAfoldcall = f"RNAfold --noPS -C {parameters} << EOF\nSEQ\nCONSTRAINTS\nEOF"
     constraint = "".join([char if char == "." else "x" for char in inter_structure])
-    call = RNAfoldcall.replace("SEQ", sequence).replace("CONSTRAINTS", constraint)
-    intra_structure = runCommand(call, r"([\.()]+)")    
+    intra_structure = foldCached(sequence, constraint, parameters, cache)
 
     # predicted Intramol structure should use < > brackets, 
     # to seperate from intermol structure
@@ -1,9 +1,54 @@
-from utils import (runCommand,listIntermolNodes)
+from pair_table import pairTable
+from utils import (runCommand,scratchDirectory)
+from vienna import pairProbabilities
 import re 
+from pathlib import Path
 
 # invisible Nodes between 2 molecules, seperating them
 GAP = 3
 
+# javascript of every edit an EditPlan can contain, by name. Each edit
+# takes one argument, the argument stored together with it in the plan
+EDITS = {}
+
+
+class EditPlan:
+    """Declarative list of edits to the svg fornac has built.
+
+    The modification functions in this module do not touch the page,
+    they add named edits (see `EDITS`) with their argument to a plan.
+    `apply` sends the whole plan to the page in one `page.evaluate`,
+    instead of one round trip per node, label or overlay.
+    """
+
+    def __init__(self):
+        # [[name, argument], ...] in the order the edits are applied
+        self.edits = []
+
+    def add(self, name: str, arg=None) -> None:
+        assert name in EDITS
+        self.edits.append([name, arg])
+
+    def script(self) -> str:
+        """javascript applying a plan, containing the edits this plan uses.
+
+        Every edit is called with its argument and `find(map, key)`, which
+        returns the elements of the index `indexElements` built that are
+        still part of the document.
+        """
+        names = dict.fromkeys(name for name, _ in self.edits)
+        edits = ",\n".join(f"{name}: {EDITS[name]}" for name in names)
+        return "(plan) => {\n    const edits = {\n" + edits + "};\n" \
+               "    const find = (map, key) => (window.varriIndex[map][key] || [])" \
+               ".filter((el) => el.isConnected);\n" \
+               "    plan.forEach(([name, arg]) => edits[name](arg, find));\n}"
+
+    def apply(self, page) -> None:
+        """Apply all edits of the plan to a page in a single round trip."""
+        if self.edits:
+            page.evaluate(self.script(), self.edits)
+
+
 def sequence_coloring(first_seq, second_seq) -> list:
     """Generate a color list for two sequences.
 
@@ -26,17 +71,26 @@ def sequence_coloring(first_seq, second_seq) -> list:
     return color
 
 
-
-def setAttributeForElements(page, target_attr, target_value, set_attr, set_value):
-    page.evaluate("""([target_attr, target_value, set_attr, set_value]) => {
+EDITS["setAttributeForElements"] = """([target_attr, target_value, set_attr, set_value]) => {
             document.querySelectorAll(`[${target_attr}="${target_value}"]`).forEach((el) => {
                     el.setAttribute(set_attr, set_value);
                   });
-        }""", [target_attr, target_value, set_attr, set_value])
+        }"""
+
+def setAttributeForElements(plan, target_attr, target_value, set_attr, set_value):
+    plan.add("setAttributeForElements", [target_attr, target_value, set_attr, set_value])
     
 
 
-def changeBackgroundColor(page, v) -> None:
+EDITS["changeBackgroundColor"] = """(coloring) => {
+            if (coloring.length == 0) {return;}
+            var list_of_nodes = document.querySelectorAll('[r="5"]');
+            for (const [index, node] of Object.entries(list_of_nodes)){            
+                node.setAttribute("style", "fill: " + coloring[index] + ";");
+            }
+        }"""
+
+def changeBackgroundColor(plan, v) -> None:
     """Apply sequence-based coloring to circle elements in the DOM.
 
     Uses `sequence_coloring` to generate a list of colors and assigns them
@@ -44,7 +98,7 @@ def changeBackgroundColor(page, v) -> None:
     fill style.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         v (dict): Dictionary containing:
             - "sequence1" (Sequence): First sequence.
             - "sequence2" (Sequence): Second sequence.
@@ -59,15 +113,20 @@ def changeBackgroundColor(page, v) -> None:
     # TODO check coloring.length == 0 cant happen
 
     # color all circles with the given color in the coloring list
-    page.evaluate("""(coloring) => {
-            if (coloring.length == 0) {return;}
-            var list_of_nodes = document.querySelectorAll('[r="5"]');
-            for (const [index, node] of Object.entries(list_of_nodes)){            
-                node.setAttribute("style", "fill: " + coloring[index] + ";");
-            }
-        }""", coloring)
+    plan.add("changeBackgroundColor", coloring)
     
-def updateNodeToolTips(page, v):
+
+
+EDITS["updateNodeToolTips"] = """(index_dict, find) => {
+            for (const [key, value] of Object.entries(index_dict)) {
+                var [seq, num] = value;
+                find("node", key).forEach((node) => {
+                    node.firstChild.innerHTML = `${seq}[${num}]`;
+              });
+          }
+        }"""
+
+def updateNodeToolTips(plan, v):
     """Compute and set node labels and marker indices for both sequences.
 
     Builds a numbering for sequence positions using provided offsets (handles
@@ -77,7 +136,7 @@ def updateNodeToolTips(page, v):
     node.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         v (dict): Dictionary with keys:
             - "offset1" (int): Start offset for sequence 1.
             - "offset2" (int): Start offset for sequence 2.
@@ -90,14 +149,7 @@ def updateNodeToolTips(page, v):
     index_dict = {str(i): v for i, v in getIndexDictionary(v).items()}
 
     # TODO ?
-    page.evaluate("""(index_dict) => {
-            for (const [key, value] of Object.entries(index_dict)) {
-                var [seq, num] = value;
-                document.querySelectorAll('circle[node_num="'+ key + '"]').forEach((node) => {
-                    node.firstChild.innerHTML = `${seq}[${num}]`;
-              });
-          }
-        }""", index_dict)
+    plan.add("updateNodeToolTips", index_dict)
 
 
 def getSequenceIndicies(seq, offset, length):
@@ -164,17 +216,15 @@ def getIndexDictionary(v):
 
         
 
-def setIndexLabels(page, v) -> None:
-    """Set index labels for sequence positions with priority-based placement.
+def getIndexLabels(v) -> dict:
+    """Decide which labels display an index, with priority-based placement.
 
     Determines which positions should display index labels based on a
     three-tier priority system: sequence boundaries (highest priority),
     basepair region boundaries (medium priority), and regular intervals
-    (lowest priority). Prevents overlapping labels using `validateLabelPos`
-    and updates the DOM accordingly.
+    (lowest priority). Prevents overlapping labels using `validateLabelPos`.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
         v (dict): Dictionary containing:
             - "structure1" (str): Dot-bracket notation for first structure.
             - "structure2" (str): Dot-bracket notation for second structure.
@@ -184,7 +234,8 @@ def setIndexLabels(page, v) -> None:
             - "sequence_dict" (dict): Mapping of node indices to sequence values.
 
     Returns:
-        None
+        dict[int, int]: Mapping from node index (1-based) to the displayed
+        index, 0 if the label at this position shows no index.
     """
     for var in ["structure1", "structure2", "sequence1", "labelInterval", "molecules", "sequence_dict"]:
         assert var in v
@@ -231,7 +282,6 @@ def setIndexLabels(page, v) -> None:
             for pos in region:
                 _, number = index_dict[pos]
                 index_labels[pos] = validateLabelPos(pos, index_labels, number)
-                colorLabelRed(page, pos)
 
     # ----------------- prio 3 -------------------------------
     # numbering = [(seq1, 1), ...] 
@@ -239,37 +289,114 @@ def setIndexLabels(page, v) -> None:
     for pos, (_, number) in index_dict.items():
         if number % interval == 0 or number == 1:
             index_labels[pos] = validateLabelPos(pos, index_labels, number)    
-    
-    page.evaluate("""(indexing) => {
+
+    return index_labels
+
+
+def getLength(v) -> int:
+    """Number of nodes fornac creates for the nucleotides, including dummy nodes."""
+    assert "sequence" in v
+    return len(v["sequence"].replace("&", ""))
+
+
+def getLabelPositions(v) -> list:
+    """Positions of the labels that display an index.
+
+    fornac only adds the labels at these positions to the svg (see
+    fornac_hotfix.md). The other labels stay in its graph as hidden
+    nodes, they take part in the layout but get no elements.
+
+    Args:
+        v (dict): Dictionary as described in `getIndexLabels`.
+
+    Returns:
+        list[int]: Sorted node indices (1-based) of the shown labels.
+    """
+    length = getLength(v)
+    return [pos for pos, value in getIndexLabels(v).items() if value != 0 and pos <= length]
+
+
+EDITS["setLabelTexts"] = """(indexing) => {
             document.querySelectorAll('[label_type="label"]').forEach((label,index)=>{
                         label.innerHTML = indexing[index];   
                   });   
-        }""", list(index_labels.values()))
+        }"""
 
-    
+def setIndexLabels(plan, v) -> None:
+    """Set index labels for sequence positions with priority-based placement.
+
+    Uses `getIndexLabels` to decide which labels display an index and
+    colors the labels at the borders of the intermolecular basepair
+    regions red. fornac adds no elements for labels without an index
+    (see `getLabelPositions`), only middle nodes numbered like labels
+    are removed.
+
+    Args:
+        plan (EditPlan): Plan the edit is added to.
+        v (dict): Dictionary as described in `getIndexLabels`.
+
+    Returns:
+        None
+    """
+    index_labels = getIndexLabels(v)
+
+    if v["molecules"] == "2":
+        for region in getIntermolBasepairRegion(v["structure1"], v["structure2"]):
+            for pos in region:
+                colorLabelRed(plan, pos)
+
+    plan.add("setLabelTexts", [index_labels[pos] for pos in getLabelPositions(v)])
+
+    # behind the last nucleotide, the positions belong to middle nodes
+    # of fornac (see `setLabelsId`)
+    length = getLength(v)
     for pos, value in index_labels.items():
-        if value == 0:
-            removeLabel(page, pos)
-            removeLabellink(page,pos)
+        if value == 0 and pos > length:
+            removeLabel(plan, pos)
 
-def colorLabelRed(page, target_index):
+
+EDITS["removeLabel"] = """(index, find) => {
+            find("labelGroup", index).forEach((node) => {
+                    node.remove();
+                  });
+        }"""
+
+
+def removeLabel(plan, index):
+    """Remove label elements for a given index.
+
+    Deletes all label group elements in the DOM that match the specified index.
+
+    Args:
+        plan (EditPlan): Plan the edit is added to.
+        index (int): Label index to remove.
+
+    Returns:
+        None
+    """
+    plan.add("removeLabel", index)
+
+
+EDITS["colorLabelRed"] = """(target_index, find) => {
+            find("label", target_index).forEach((label) => {
+                  label.setAttribute("style", "stroke: red;stroke-width: 0.8;");
+                  });
+        }"""
+
+def colorLabelRed(plan, target_index):
     """Highlight a label by coloring it red.
 
     Applies a red stroke style to all label elements associated with
     the given index.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         target_index (int): Index of the label to highlight.
 
     Returns:
         None
     """
-    page.evaluate("""(target_index) => {
-            document.querySelectorAll(`[label_num="${target_index}"]`).forEach((label) => {
-                  label.setAttribute("style", "stroke: red;stroke-width: 0.8;");
-                  });
-        }""", str(target_index))
+    plan.add("colorLabelRed", str(target_index))
 
 
 def validateLabelPos(pos: int, indexing: dict, number: int) -> int:
@@ -306,62 +433,19 @@ def validateLabelPos(pos: int, indexing: dict, number: int) -> int:
     return number
 
 
-def removeLabel(page, index):
-    """Remove label elements for a given index.
-
-    Deletes all label group elements in the DOM that match the specified index.
-
-    Args:
-        page: Playwright-like page object used to evaluate JavaScript.
-        index (int): Label index to remove.
-
-    Returns:
-        None
-    """
-    page.evaluate("""(index) => {            
-            document.querySelectorAll('[label_gnum="'+ index +'"]').forEach((node) => {
-                    node.remove();                  
-                  });
-        }""", index)
-
-def removeLabellink(page, index):
-    """Remove label link elements associated with a given index.
-
-    Deletes line elements that represent label links starting at the
-    specified index.
-
-    Args:
-        page: Playwright-like page object used to evaluate JavaScript.
-        index (int): Index of the label link to remove.
-
-    Returns:
-        None
-    """
-    page.evaluate("""(index) => {            
-            document.querySelectorAll('line[start="'+ index +'"]').forEach((line)=>{
-                if (line.getAttribute("link_type") == "label_link") {
-                        line.remove();
-                    }  
-                });
- 
-        }""", index)
-
-    
-def highlightingRegion(page, v):
-    """Highlight intermolecular basepair regions in the DOM.
+def getRegionNodes(v) -> list:
+    """List all nodes inside the intermolecular basepair regions.
 
     Uses `getIntermolBasepairRegion` to identify contiguous regions of
-    intermolecular basepairs and applies a red stroke style to all
-    corresponding nodes.
+    intermolecular basepairs in both structures.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
         v (dict): Dictionary containing:
             - "structure1" (str): First structure.
             - "structure2" (str): Second structure (must not be empty).
 
     Returns:
-        None
+        list[int]: Fornac node ids of the regions, in order.
     """
     for var in ["structure1", "structure2"]:
         assert var in v
@@ -375,41 +459,57 @@ def highlightingRegion(page, v):
     intermol_nodes = []
     for (start, end) in basepair_region:
         intermol_nodes += [i for i in range(start, end + 1, 1)]
+    return intermol_nodes
 
-    addStyleToNodes(page, intermol_nodes, "stroke: red;")
 
+def highlightingRegion(plan, v):
+    """Highlight intermolecular basepair regions in the DOM.
 
-def addStyleToNodes(page, node_ids, style):
+    Applies a red stroke style to all nodes of `getRegionNodes`.
+
+    Args:
+        plan (EditPlan): Plan the edit is added to.
+        v (dict): Dictionary containing:
+            - "structure1" (str): First structure.
+            - "structure2" (str): Second structure (must not be empty).
+
+    Returns:
+        None
+    """
+    addStyleToNodes(plan, getRegionNodes(v), "stroke: red;")
+
+
+EDITS["addStyleToNodes"] = """([node_ids, style], find) => {
+            node_ids.forEach((node_id)=>{
+                  find("node", node_id).forEach((node)=>{
+                        node.setAttribute("style", node.getAttribute("style") + style);
+                     });
+                  });
+        }"""
+
+def addStyleToNodes(plan, node_ids, style):
     """Apply additional CSS styles to specified nodes.
 
     Iterates over given node IDs and appends the provided style string
     to the existing style attribute of each corresponding SVG circle element.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         node_ids (Sequence[int]): List of node IDs to style.
         style (str): CSS style string to append.
 
     Returns:
         None
     """
-    page.evaluate("""([node_ids, style]) => {
-            node_ids.forEach((node_id)=>{
-                  document.querySelectorAll(`circle[node_num="${node_id}"]`).forEach((node)=>{
-                        node.setAttribute("style", node.getAttribute("style") + style);
-                     });
-                  });
-        }""", [node_ids, style])
+    plan.add("addStyleToNodes", [node_ids, style])
 
-def highlightSubsequence(page, v, seq):
-    """Highlight a subsequence of nodes in the Fornac plot.
+def getSubsequenceNodes(v, seq) -> list:
+    """Translate the subsequences to highlight into Fornac node ids.
 
-    Calculates the node range corresponding to the requested subsequence (using
-    the provided start/end positions and sequence offsets), converts them to
-    Fornac node IDs, and draws a translucent green polyline around those nodes.
+    Calculates the node range corresponding to every requested subsequence
+    (using the provided start/end positions and sequence offsets).
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
         v (dict): Dictionary containing keys:
             - "highlightSubseq1" / "highlightSubseq2" (tuple[int, int]): Start and end indices to highlight.
             - "offset1" / "offset2" (int): Offset used to map sequence positions to Fornac node indices.
@@ -417,7 +517,8 @@ def highlightSubsequence(page, v, seq):
         seq (str): Sequence identifier, "1" or "2", used to choose which highlight keys to read.
 
     Returns:
-        None
+        list[list[int]]: Node ids of every subsequence. A subsequence of a
+        single nucleotide contains exactly one node id.
     """
     key_highlightSubseq = f"highlightSubseq{seq}"
     key_startIndex = f"offset{seq}"
@@ -429,6 +530,7 @@ def highlightSubsequence(page, v, seq):
     for var in [key_highlightSubseq, key_startIndex, "sequence1",]:
         assert var in v
 
+    subsequence_nodes = []
     # iterate through all subsequences
     for subsequence in v[key_highlightSubseq]:
         # translate start end index to position of nodes in fornac
@@ -437,13 +539,7 @@ def highlightSubsequence(page, v, seq):
 
         if start == end:
             # get web node id for the index
-            web_id = index_dict[start]
-            # use web node id to get Position
-            x, y = getPositionOfNode(page,web_id)
-            # add circle
-            attributes = {"cx": x, "cy": y, "r": "7px", "style":"fill:purple;opacity:0.3;"}
-            addElement(page, "circle", attributes)
-            # skip everyth
+            subsequence_nodes += [[index_dict[start]]]
             continue
 
         # startIndex ------> start --------> end -----> endIndex
@@ -466,62 +562,75 @@ def highlightSubsequence(page, v, seq):
         start_node += shift
         end_node += shift
 
-        indicies = list(range(start_node, end_node + 1))
-        polyline(page, indicies, 
+        subsequence_nodes += [list(range(start_node, end_node + 1))]
+    return subsequence_nodes
+
+
+def highlightSubsequence(plan, v, seq):
+    """Highlight a subsequence of nodes in the Fornac plot.
+
+    Draws a translucent purple polyline around the nodes of every
+    subsequence of `getSubsequenceNodes`, a single nucleotide gets
+    a translucent circle instead.
+
+    Args:
+        plan (EditPlan): Plan the edit is added to.
+        v (dict): Dictionary as described in `getSubsequenceNodes`.
+        seq (str): Sequence identifier, "1" or "2", used to choose which highlight keys to read.
+
+    Returns:
+        None
+    """
+    for indicies in getSubsequenceNodes(v, seq):
+        if len(indicies) == 1:
+            # add circle at the position of the node
+            addNodeCircle(plan, indicies[0], {"r": "7px", "style":"fill:purple;opacity:0.3;"})
+            continue
+
+        polyline(plan, indicies, 
                         "stroke:purple;stroke-width:10;opacity:0.3;fill:None;" \
                         "stroke-linejoin: miter;stroke-miterlimit: 0.1;")
         
 
-def getPositionOfNode(page, node_id):
-    """Add a visual background node representing  data.
 
-    """
-    position = page.evaluate("""(node_id) => {
+EDITS["addNodeCircle"] = """([node_id, attributes], find) => {
                   var pos = [];
-                  document.querySelectorAll(`g[num="n${node_id}"]`).forEach((node)=>{
+                  find("gnode", `n${node_id}`).forEach((node)=>{
                     const transform = node.getAttribute("transform");
                     Array.from(transform.matchAll(/-?\d+(?:\.\d+)?/g)).forEach(([val])=>{
                             pos.push(val);
                          });
                     });
-                return pos;
-    }""", node_id)
-    return position
-def addElement(page, element, attr):
-    """Add a visual background node representing  data.
-
-    """
-    position = page.evaluate("""([element, attr]) => {
-                var el = document.createElement(element);
-                Object.entries(attr).forEach(([key, value]) => {
+                var el = document.createElement("circle");
+                Object.entries({"cx": pos[0], "cy": pos[1], ...attributes}).forEach(([key, value]) => {
                         el.setAttribute(key, value);      
                              });
                 fornac_plot = document.getElementsByClassName("fornac-plot")[0];
                 fornac_plot.insertBefore(el, fornac_plot.firstChild);
-            }""", [element, attr])
-    return position
+            }"""
 
+def addNodeCircle(plan, node_id, attributes):
+    """Draw a circle on top of a node in the Fornac plot.
 
-def polyline(page, indicies, style):  
-    """Draw a styled polyline connecting a set of node positions in the Fornac plot.
-
-    Calculates the x/y positions of each node identified by `indicies` by
-    reading their SVG transform attributes, then creates an SVG `polyline`
-    element with the supplied style and inserts it at the top of the plot.
+    Reads the position of the node from its SVG transform attribute and
+    inserts a circle with the given attributes at this position at the
+    top of the plot.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
-        indicies (Sequence[int]): Fornac node IDs to connect in order.
-        style (str): CSS style string applied to the created polyline element.
+        plan (EditPlan): Plan the edit is added to.
+        node_id (int): Fornac node ID the circle is drawn on.
+        attributes (dict): Attributes of the circle besides its position.
 
     Returns:
         None
     """
+    plan.add("addNodeCircle", [node_id, attributes])
+
 
-    page.evaluate("""([indicies, style]) => {
+EDITS["polyline"] = """([indicies, style], find) => {
             var pos_string = "";
             indicies.forEach((index)=>{
-                  document.querySelectorAll(`g[num="n${index}"]`).forEach((node)=>{
+                  find("gnode", `n${index}`).forEach((node)=>{
                     const transform = node.getAttribute("transform");
                     const match = Array.from(transform.matchAll(/-?\d+(?:\.\d+)?/g));
                     pos_string += `${match[0]},${match[1]} `;
@@ -533,14 +642,32 @@ def polyline(page, indicies, style):
         poly.setAttribute("style", style); 
         fornac_plot = document.getElementsByClassName("fornac-plot")[0];
         fornac_plot.insertBefore(poly, fornac_plot.firstChild);
-        }""", [indicies, style])
+        }"""
+
+def polyline(plan, indicies, style):  
+    """Draw a styled polyline connecting a set of node positions in the Fornac plot.
+
+    Calculates the x/y positions of each node identified by `indicies` by
+    reading their SVG transform attributes, then creates an SVG `polyline`
+    element with the supplied style and inserts it at the top of the plot.
+
+    Args:
+        plan (EditPlan): Plan the edit is added to.
+        indicies (Sequence[int]): Fornac node IDs to connect in order.
+        style (str): CSS style string applied to the created polyline element.
+
+    Returns:
+        None
+    """
+
+    plan.add("polyline", [indicies, style])
 
     
 def getIntermolBasepairRegion(structure1, structure2) -> list:
     """Determine intermolecular basepair regions for both structures.
 
     Identifies the range of positions involved in intermolecular basepairs
-    for each structure using `listIntermolNodes`. Converts indices to
+    for each structure from their `pairTable`. Converts indices to
     1-based coordinates and shifts the second structure to match the global
     Fornac coordinate system.
 
@@ -557,13 +684,14 @@ def getIntermolBasepairRegion(structure1, structure2) -> list:
     """
     basepair_region = []
     offset = len(structure1) + GAP
+    table = pairTable(f"{structure1}&{structure2}")
 
-    for structure,shift in [(structure1, 0), (structure2, offset)]:
-        basepair_list = [index for (index,_) in listIntermolNodes(structure, shift)]
+    for mol, shift in [(1, 0), (2, offset)]:
+        basepair_list = table.intermolecularNodes(mol)
         if not basepair_list:
             return []
         # fornac starts counting nodes with 1 -> list index start with 0
-        region = (basepair_list[0], basepair_list[-1])
+        region = (basepair_list[0] + shift + 1, basepair_list[-1] + shift + 1)
         basepair_region += [region]
 
 
@@ -571,7 +699,22 @@ def getIntermolBasepairRegion(structure1, structure2) -> list:
 
     
 
-def highlightingBasepairs(page, v):
+
+EDITS["highlightingBasepairs"] = """(split, find) => {
+        document.querySelectorAll('[link_type="basepair"]').forEach((link) => {
+            var nodes = [link.getAttribute("start"), link.getAttribute("end")];
+            // if not intermolecular basepair, ignore
+            if (!(nodes[0] < split && nodes[1] > split)) {return;}
+            // color basepair border red
+            nodes.forEach((node_num) => {
+                node = find("node", node_num)[0];
+                node.setAttribute("style", node.getAttribute("style") + "stroke: red;");
+                });
+            
+        });
+    }"""
+
+def highlightingBasepairs(plan, v):
     """
     Highlight individual intermolecular basepair circles.
 
@@ -580,7 +723,7 @@ def highlightingBasepairs(page, v):
     the DOM, and sets a red stroke on the corresponding circle nodes.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         v (dict): Dictionary containing at least "sequence1" (Sequence).
 
     Returns:
@@ -593,24 +736,20 @@ def highlightingBasepairs(page, v):
     # it is a intermolecular basepair. higlight those bases with a red circle
 
 
-    page.evaluate("""(split) => {
+    plan.add("highlightingBasepairs", split)  
+
+
+EDITS["removeSecondLink"] = """() => {
         document.querySelectorAll('[link_type="basepair"]').forEach((link) => {
             var nodes = [link.getAttribute("start"), link.getAttribute("end")];
-            // if not intermolecular basepair, ignore
-            if (!(nodes[0] < split && nodes[1] > split)) {return;}
-            // color basepair border red
-            nodes.forEach((node_num) => {
-                node = document.querySelector('circle[node_num="' + node_num + '"]');
-                node.setAttribute("style", node.getAttribute("style") + "stroke: red;");
-                });
-            
+            // only allow inter basepairs form seq1 to seq2
+            if (Number(nodes[0]) > Number(nodes[1])){
+                link.remove();
+            } 
         });
-    }""", split)  
-
-
-
+    }"""
 
-def removeSecondLink(page):
+def removeSecondLink(plan):
     """
     Remove duplicate basepair links from the DOM.
 
@@ -619,77 +758,74 @@ def removeSecondLink(page):
     eliminating duplicate links that Fornac generates.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
 
     Returns:
         None
     """
-    page.evaluate("""() => {
-        document.querySelectorAll('[link_type="basepair"]').forEach((link) => {
-            var nodes = [link.getAttribute("start"), link.getAttribute("end")];
-            // only allow inter basepairs form seq1 to seq2
-            if (Number(nodes[0]) > Number(nodes[1])){
-                link.remove();
-            } 
-        });
-    }""")
+    plan.add("removeSecondLink")
 
 
-def removeNode(page, id):
+EDITS["removeNode"] = """(id, find) => {
+        find("gnode", "n" + id.toString()).forEach(node => {
+            node.remove();
+        }); 
+    }"""
+
+def removeNode(plan, id):
     """Remove a node from the DOM by its ID.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         id: The ID of the node to remove.
 
     Returns:
         None
     """
-    page.evaluate("""(id) => {
-        var list_of_nodes = document.querySelectorAll('[num="n' + id.toString() + '"]');
-        list_of_nodes.forEach(node => {
-            node.remove();
+    plan.add("removeNode", id)
+
+
+EDITS["removeArrow"] = """(id, find) => {
+        find("gnode", "n" + id.toString()).forEach(node => {
+            node.firstChild.remove();
         }); 
-    }""", id)
+    }"""
 
-def removeArrow(page, id):
+def removeArrow(plan, id):
     """Remove the arrow element from a node by its ID.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         id: The ID of the node from which to remove the arrow.
 
     Returns:
         None
     """
-    page.evaluate("""(id) => {
-        var list_of_nodes = document.querySelectorAll('[num="n' + id.toString() + '"]');
-        list_of_nodes.forEach(node => {
-            node.firstChild.remove();
-        }); 
-    }""", id)
+    plan.add("removeArrow", id)
+
 
-def removeLink(page, start_id, end_id):
+EDITS["removeLink"] = """([start, end], find) => {
+        find("link", start).forEach((link) => {
+            if (link.getAttribute("link_type") == "backbone" && link.getAttribute("end") == end){
+                link.remove();
+            } 
+        });
+    }"""
+
+def removeLink(plan, start_id, end_id):
     """Remove a backbone link between two nodes.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         start_id: The ID of the starting node of the link.
         end_id: The ID of the ending node of the link.
 
     Returns:
         None
     """
-    page.evaluate("""(link_ids) => {
-        document.querySelectorAll('[link_type="backbone"]').forEach((link) => {
-            var nodes = link.getAttribute("start") + "," + link.getAttribute("end");
-            if (nodes==link_ids){
-                link.remove();
-            } 
-        });
-    }""", f"{start_id},{end_id}")    
+    plan.add("removeLink", [str(start_id), str(end_id)])    
 
-def removeDummyNodes(page, sequence: list):
+def removeDummyNodes(plan, sequence: list):
     """Remove dummy nodes from the DOM based on sequence positions.
 
     Iterates through the provided sequence and removes nodes, arrows, and links
@@ -697,7 +833,7 @@ def removeDummyNodes(page, sequence: list):
     Fornac's 1-based indexing.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         sequence (list): Sequence list where "." indicates dummy nodes to remove.
 
     Returns:
@@ -710,12 +846,22 @@ def removeDummyNodes(page, sequence: list):
     # the indexing is still correct
     for index, n in enumerate(sequence):
         if n == ".":
-            removeLink(page, index, index + 1)
-            removeArrow(page, index + 1)
-            removeNode(page, index)
+            removeLink(plan, index, index + 1)
+            removeArrow(plan, index + 1)
+            removeNode(plan, index)
 
 
-def visualiseBasepairStength(page, v):
+EDITS["visualiseBasepairStength"] = """(sequence_dict) => {
+        document.querySelectorAll('[link_type="basepair"]').forEach((link) => {
+            l1 = sequence_dict[link.getAttribute("start")];
+            l2 = sequence_dict[link.getAttribute("end")];
+            if ((l1 == "G" && l2 == "U") || (l1 == "U" && l2 == "G")) {
+                link.setAttribute("stroke-dasharray","1,1");     
+            }
+        });
+    }"""
+
+def visualiseBasepairStength(plan, v):
     """
     Visualize basepair strength by styling G-U basepairs.
 
@@ -724,7 +870,7 @@ def visualiseBasepairStength(page, v):
     representing G-U pairs, which are weaker than G-C or A-U pairs.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         v (dict): Dictionary containing at least "sequence1" and "sequence2".
 
     Returns:
@@ -732,30 +878,10 @@ def visualiseBasepairStength(page, v):
     """
     assert "sequence_dict" in v
     sequence_dict = v["sequence_dict"]
-    page.evaluate("""(sequence_dict) => {
-        document.querySelectorAll('[link_type="basepair"]').forEach((link) => {
-            l1 = sequence_dict[link.getAttribute("start")];
-            l2 = sequence_dict[link.getAttribute("end")];
-            if ((l1 == "G" && l2 == "U") || (l1 == "U" && l2 == "G")) {
-                link.setAttribute("stroke-dasharray","1,1");     
-            }
-        });
-    }""", sequence_dict)
-
-
-def setLinksId(page):
-    """Assign start and end node IDs to link elements.
-
-    Parses the textual content of link elements in the DOM to extract
-    node IDs and sets them as "start" and "end" attributes on each line.
+    plan.add("visualiseBasepairStength", sequence_dict)
 
-    Args:
-        page: Playwright-like page object used to evaluate JavaScript.
 
-    Returns:
-        None
-    """
-    page.evaluate("""() => {
+EDITS["setLinksId"] = """() => {
         var list_of_lines = document.querySelectorAll('line');
         list_of_lines.forEach(line => {
             // get the start and end node
@@ -765,34 +891,85 @@ def setLinksId(page):
             line.setAttribute("end", end.toString());
                   
         }); 
-    }""")
+    }"""
 
-def setLabelsId(page):
-    """Assign sequential IDs to label elements in the DOM.
+def setLinksId(plan):
+    """Assign start and end node IDs to link elements.
 
-    Iterates over label group elements and assigns unique identifiers
-    for both the group ("label_gnum") and its child label ("label_num"),
-    based on their order in the document.
+    Parses the textual content of link elements in the DOM to extract
+    node IDs and sets them as "start" and "end" attributes on each line.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
 
     Returns:
         None
     """
-    page.evaluate("""() => {
+    plan.add("setLinksId")
+
+
+EDITS["setLabelsId"] = """([labels, length]) => {
         var list_of_labels = document.querySelectorAll('g[num="n-1"]');
         list_of_labels.forEach((label, index) => {
-            label.setAttribute("label_gnum", (index+1).toString());
-            label.firstChild.setAttribute("label_num", (index+1).toString());
+            // the middle nodes of fornac share num="n-1" with the labels,
+            // they follow the labels and are numbered behind the last nucleotide
+            var pos = index < labels.length ? labels[index] : length + 1 + index - labels.length;
+            label.setAttribute("label_gnum", pos.toString());
+            label.firstChild.setAttribute("label_num", pos.toString());
         }); 
-    }""")
+    }"""
 
-def updateLinkTooltips(page, v):
+def setLabelsId(plan, v):
+    """Assign the position of its nucleotide to each label element in the DOM.
 
-    updated_indicies = {str(key): str(index) for (key, (_, index)) in getIndexDictionary(v).items()}
-    # TODO
-    page.evaluate("""(updated_indicies) => {
+    Iterates over label group elements and assigns the position of the
+    labeled nucleotide (see `getLabelPositions`) for both the group
+    ("label_gnum") and its child label ("label_num"). The middle nodes
+    fornac adds behind the labels are numbered after the last nucleotide.
+
+    Args:
+        plan (EditPlan): Plan the edit is added to.
+        v (dict): Dictionary as described in `getIndexLabels`.
+
+    Returns:
+        None
+    """
+    plan.add("setLabelsId", [getLabelPositions(v), getLength(v)])
+
+
+EDITS["indexElements"] = """() => {
+        // elements by attribute value in document order, so the edits
+        // find their targets without scanning the whole document
+        const index = {node: {}, gnode: {}, label: {}, labelGroup: {}, link: {}};
+        const add = (map, key, el) => (index[map][key] ??= []).push(el);
+        document.querySelectorAll('circle[node_num]').forEach((el) => add("node", el.getAttribute("node_num"), el));
+        document.querySelectorAll('[num]').forEach((el) => add("gnode", el.getAttribute("num"), el));
+        document.querySelectorAll('[label_num]').forEach((el) => add("label", el.getAttribute("label_num"), el));
+        document.querySelectorAll('[label_gnum]').forEach((el) => add("labelGroup", el.getAttribute("label_gnum"), el));
+        document.querySelectorAll('line[start]').forEach((el) => add("link", el.getAttribute("start"), el));
+        window.varriIndex = index;
+    }"""
+
+
+def indexElements(plan):
+    """Index the nodes, labels and links of the svg for the following edits.
+
+    Has to follow `setLinksId` and `setLabelsId`, it indexes the circles
+    by "node_num", the node groups by "num", the labels by "label_num"
+    and "label_gnum" and the links by their "start" node. The edits look
+    up their elements in this index (see `EditPlan.script`), which keeps
+    every edit linear in the length of the sequence.
+
+    Args:
+        plan (EditPlan): Plan the edit is added to.
+
+    Returns:
+        None
+    """
+    plan.add("indexElements")
+
+
+EDITS["updateLinkTooltips"] = """(updated_indicies) => {
         var list_of_lines = document.querySelectorAll('line');
         list_of_lines.forEach(line => {
             // get the start and end node
@@ -805,13 +982,31 @@ def updateLinkTooltips(page, v):
                 line.firstChild.textContent = updated_indicies[start] + "-" + updated_indicies[end];      
             }
         }); 
-    }""", updated_indicies)
+    }"""
 
+def updateLinkTooltips(plan, v):
+
+    updated_indicies = {str(key): str(index) for (key, (_, index)) in getIndexDictionary(v).items()}
+    # TODO
+    plan.add("updateLinkTooltips", updated_indicies)
 
-def backgroundhighlightingBasepairs(page, v):
+
+def getBasepairStacks(v) -> list:
+    """Group the intermolecular basepairs into stacks.
+
+    Neighbouring basepairs (i, j) and (i+1, j-1) belong to the same stack.
+    Every stack is returned as the outline of its nodes, the sorted node
+    ids with the first id repeated at the end to close the outline.
+
+    Args:
+        v (dict): Dictionary as described in `listIntermolPairs`.
+
+    Returns:
+        list[list[int]]: One closed outline of node ids per stack.
+    """
     intermol_pairs = listIntermolPairs(v)
     if intermol_pairs == []:
-        return
+        return []
     stack = [intermol_pairs.pop(0)]
     highlightbackground = []
     for open, close in intermol_pairs:
@@ -826,20 +1021,22 @@ def backgroundhighlightingBasepairs(page, v):
 
     area = sorted([x for t in stack for x in t])
     highlightbackground += [area + [area[0]]]
+    return highlightbackground
+
 
-    for stack in highlightbackground:
-        polyline(page, stack, "fill:red;opacity:0.2;stroke:red;stroke-width:7")
+def backgroundhighlightingBasepairs(plan, v):
+    for stack in getBasepairStacks(v):
+        polyline(plan, stack, "fill:red;opacity:0.2;stroke:red;stroke-width:7")
 
 
-def backgroundhighlightingRegion(page, v):
+def backgroundhighlightingRegion(plan, v):
     """Highlight intermolecular regions with a filled background.
 
-    Identifies contiguous intermolecular basepair regions and draws a
-    filled polyline over the corresponding nodes to visually emphasize
-    the region.
+    Draws a filled polyline over the nodes of `getRegionNodes` to
+    visually emphasize the region.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         v (dict): Dictionary containing:
             - "structure1" (str): First structure.
             - "structure2" (str): Second structure.
@@ -847,93 +1044,59 @@ def backgroundhighlightingRegion(page, v):
     Returns:
         None
     """
-    for var in ["structure1", "structure2"]:
-        assert var in v
-    structure1 = v["structure1"]
-    structure2 = v["structure2"]
-    
-    assert structure2 != ""
-    # [(start, end), (start, end)]
-    basepair_region = getIntermolBasepairRegion(structure1, structure2)
-
-    intermol_nodes = []
-    for (start, end) in basepair_region:
-        intermol_nodes += [i for i in range(start, end + 1, 1)]
-    
-    polyline(page, intermol_nodes, "fill:red;opacity:0.2")
+    polyline(plan, getRegionNodes(v), "fill:red;opacity:0.2")
 
 
 
 def listIntermolPairs(v):
     """Extract intermolecular basepairs from combined structure data.
 
-    Builds a combined structure representation from two input structures,
-    marks intermolecular basepairs using `listIntermolNodes`, and returns
-    a list of basepair index tuples.
+    Takes the basepairs between the two structures from their `pairTable`
+    and converts them into fornac node ids.
 
     Args:
         v (dict): Dictionary containing:
-            - "structure_dict" (dict): Combined structure representation.
             - "structure1" (str): First structure (dot-bracket notation).
             - "structure2" (str): Second structure.
 
     Returns:
         list[tuple[int, int]]: List of basepair index pairs.
     """
-    for var in ["structure_dict", "structure1", "structure2"]:
+    for var in ["structure1", "structure2"]:
         assert var in v
-    struc = v["structure_dict"]
     struc1 = v["structure1"]
     struc2 = v["structure2"]
-    shift = len(struc1) + GAP
-
-    intermol = {i: "." for i, _  in struc.items()}
-    for index, bracket in listIntermolNodes(struc1) + listIntermolNodes(struc2, shift):
-        intermol[index] = bracket
-    
-    return listBasepairs(intermol)
+    # node ids of molecule 2 start behind the gap
+    shift = GAP + 1
+    table = pairTable(f"{struc1}&{struc2}")
+    return [(i + 1, j + shift) for i, j in table.intermolecularPairs()]
 
 
-def listBasepairs(struc: dict):
-    """Parse basepairs from a dot-bracket-like structure dictionary.
 
-    Uses a stack-based approach to match opening and closing brackets
-    and extract basepair index tuples for multiple bracket types.
+def accessibilityOverlays(access_data, len_seq) -> list:
+    """Style and tooltip of the overlay node of every accessible nucleotide.
 
     Args:
-        struc (dict[int, str]): Mapping of positions to structure characters.
+        access_data (dict): Mapping from node id to probability.
+        len_seq (int): Length of the first sequence, nodes behind it
+            belong to the second sequence.
 
     Returns:
-        list[tuple[int, int]]: Sorted list of basepair index pairs.
+        list[tuple[int, str, str]]: (node id, style, tooltip) per node.
     """
-    basepairs = []
-    open_basepairs = {"(": [], "<": [], "[": [], "{": []}
-    brackets = [("(",")"), ("[","]"), ("{", "}"), ("<",">")]
-    for index, char in struc.items():
-        for (open, close) in brackets:
-            # check for open basepair, add to stack
-            if char == open:
-                open_basepairs[open] += [index]
-                break               
-            # check for close basepair, remove from stack
-            # if stack empty, it is an intermolecular basepair
-            if char == close:
-                if open_basepairs[open]:
-                    basepairs += [(open_basepairs[open].pop(), index)]
-                break
-
-    basepairs.sort()
-    return basepairs
-
-
-
-def visualiseAccessibilty(page, access_data, len_seq):
+    overlays = []
     for index, prb in access_data.items():
         # add if prb is None, then continue
         color = "purple" if index <= len_seq else "red"
         style = f"fill: {color};opacity: {map_probability_to_opacity(prb)}; stroke-width: 0;"
         prb_tooltip = "\n" + "{:.2e}".format(prb)
-        addAccessibilityOverlay(page, index, style, prb_tooltip)
+        overlays += [(index, style, prb_tooltip)]
+    return overlays
+
+
+def visualiseAccessibilty(plan, access_data, len_seq):
+    for index, style, prb_tooltip in accessibilityOverlays(access_data, len_seq):
+        addAccessibilityOverlay(plan, index, style, prb_tooltip)
 
 def map_probability_to_opacity(prb):
     """Convert a probability value to an opacity value.
@@ -950,16 +1113,24 @@ def map_probability_to_opacity(prb):
     return 1 - prb
 
 
+EDITS["addAccessibilityOverlay"] = """([id, style, tooltip], find) => {
+        find("node", id).forEach((node)=>{
+            var overlay_node = node.cloneNode(true);
+            overlay_node.setAttribute("node_num", `o${id}`); 
+            overlay_node.setAttribute("style", style);
+            overlay_node.firstChild.innerHTML += tooltip;
+            node.after(overlay_node);
+            });
+    }"""
 
-
-def addAccessibilityOverlay(page, id, style, tooltip):
+def addAccessibilityOverlay(plan, id, style, tooltip):
     """Add a visual overlay node representing accessibility data.
 
     Clones an existing node, applies a new style and tooltip, and inserts
     it directly after the original node in the DOM.
 
     Args:
-        page: Playwright-like page object used to evaluate JavaScript.
+        plan (EditPlan): Plan the edit is added to.
         id (int): Node ID to overlay.
         style (str): CSS style string for the overlay node.
         tooltip (str): Additional tooltip text to append.
@@ -967,15 +1138,7 @@ def addAccessibilityOverlay(page, id, style, tooltip):
     Returns:
         None
     """
-    page.evaluate("""([id, style, tooltip]) => {
-        document.querySelectorAll(`circle[node_num="${id}"]`).forEach((node)=>{
-            var overlay_node = node.cloneNode(true);
-            overlay_node.setAttribute("node_num", `o${id}`); 
-            overlay_node.setAttribute("style", style);
-            overlay_node.firstChild.innerHTML += tooltip;
-            node.after(overlay_node);
-            });
-    }""", [id, style, tooltip])
+    plan.add("addAccessibilityOverlay", [id, style, tooltip])
 
 
 
@@ -990,7 +1153,8 @@ def calculateProbabilities(sequence, offset, path, RNAfold_parameters):
     Args:
         sequence (str): RNA sequence.
         offset (int): Offset applied to node indices.
-        path (str): Path to the RNAfold output file.
+        path (str): Name of the RNAfold output file (eg. utils.dot_ps),
+            RNAfold writes it into a scratch directory.
         RNAfold_parameters (str): Additional parameters for RNAfold.
 
     Returns:
@@ -999,11 +1163,21 @@ def calculateProbabilities(sequence, offset, path, RNAfold_parameters):
     Raises:
         FileNotFoundError: If the output file cannot be found.
     """
-    runCommand(f"echo {sequence} | RNAfold -p --noPS {RNAfold_parameters}", "([\.()]+)")
+    # in process with the python module of ViennaRNA, if it is installed
+    probabilities = pairProbabilities(sequence, RNAfold_parameters)
+    if probabilities is not None:
+        return {str(id + offset): prb for id, prb in enumerate(probabilities, 1) if prb > 0}
 
-    probabillity = {}
+    # the output file is removed with the scratch directory
+    with scratchDirectory() as scratch:
+        runCommand(f"echo {sequence} | RNAfold -p --noPS {RNAfold_parameters}", "([\.()]+)",
+                   cwd=scratch)
+        return readDotPlot(Path(scratch) / Path(path).name, offset)
 
-    
+
+def readDotPlot(path, offset) -> dict:
+    """Sum the basepair probabilities of every nucleotide in a dot plot of RNAfold."""
+    probabillity = {}
     try:
         with open(path, "r") as f:
             for match in re.findall("\d+ \d+ \d.\d+ ubox", f.read()):
@@ -1017,9 +1191,139 @@ def calculateProbabilities(sequence, offset, path, RNAfold_parameters):
                         probabillity[dict_id] = sqrt ** 2
     except FileNotFoundError:
         raise FileNotFoundError
-    
-    # remove left over file
-    runCommand(f"rm {path}", "($^)")
+    return probabillity
+
+
+def planModifications(v) -> EditPlan:
+    """Plan all modifications of the structure fornac has built.
+
+    Args:
+        v (dict): Validated input as returned by `validate`.
+
+    Returns:
+        EditPlan: The edits in the order they have to be applied.
+    """
+    for var in ["molecules", "coloring", "highlighting", "sequence",
+                "backgroundhighlighting", "sequence1"]:
+        assert var in v
+
+    # amount of molecules [1, 2]
+    molecules = v["molecules"]
+    # options [default, distinct]
+    coloring_type = v["coloring"]
+    # options [nothing, pairs, region]
+    highlighting = v["highlighting"]
+    # option [(int,int)]
+    subsequence1 =  v["highlightSubseq1"]
+    subsequence2 =  v["highlightSubseq2"]
+    # seq1&...seq2
+    seq = v["sequence"]
+    # options [nothing, pairs, region]
+    backgroundhighlighting = v["backgroundhighlighting"]
+    # options [True, False]
+    showAccessibility1 = v["accessibility1"]
+    showAccessibility2 = v["accessibility2"]
+    access_data = v["access_data"]
+
+    split = len(v["sequence1"])
+
+    plan = EditPlan()
+
+    # -------------------------------------------------------------
+    # preparing the svg for modification:
+    # set Id for Links and labels for direct access
+    setLinksId(plan)
+    setLabelsId(plan, v)
+    # index nodes, labels and links for all following edits
+    indexElements(plan)
+    # remove dummy nodes that make up the seperating space
+    # between the 2 molecules
+    removeDummyNodes(plan, seq)
+    # remove the second layer of intermolecular links
+    # now: only links from node1 to node2 where node1 < node2
+    if molecules == "2":
+        removeSecondLink(plan)
+
+
+    # -----------------------------------------------------
+    # changing the background color
+    # this option colors all nucleotides of one sequence in one color
+    if coloring_type == "strand":
+        changeBackgroundColor(plan, v)
 
+    # -----------------------------------------------------
+    # displaying the correct Numbers:
+
+    # changing the tooltip number of each node 
+    updateNodeToolTips(plan, v)
+    # changing the tooltip for each link
+    updateLinkTooltips(plan, v)
+    # and set the correct index labels
+    setIndexLabels(plan, v)
+
+    # -----------------------------------------------------
+    # changing the higlighting of nodes to show
+    # intermolecular setting
+    # only works when 2 molecules given
+    if molecules == "2":
+        if highlighting == "region":
+            highlightingRegion(plan, v)
+        if highlighting == "basepairs":
+            highlightingBasepairs(plan, v)
     
-    return probabillity
+    # -----------------------------------------------------
+    # changing the backgroundhighlighting of nodes to show
+    # intermolecular setting
+    # only works when 2 molecules given
+    if molecules == "2":
+        if backgroundhighlighting == "region":
+            backgroundhighlightingRegion(plan, v)
+        if backgroundhighlighting == "basepairs":
+            backgroundhighlightingBasepairs(plan, v)
+
+    #-----------------------------------------------
+    # visualise basepair strenght (G-U )
+    if v["guBasepairs"]:
+        visualiseBasepairStength(plan, v)
+
+    #------------------------------------------------
+    # highlight subsequence
+    if subsequence1 is not None:
+        highlightSubsequence(plan, v, "1")
+    if molecules == "2" and subsequence2 is not None:
+        highlightSubsequence(plan, v, "2")
+
+    #------------------------------------------------
+    # show accessibility of Nucleotides  
+    if showAccessibility1 != None or showAccessibility2 != None:
+        visualiseAccessibilty(plan, access_data, split)
+
+    return plan
+
+
+def planLegend(v) -> EditPlan:
+    """Plan the edits of the legend template.
+
+    Hides the row of the second molecule if only one is given and
+    the accessibility scales that are not shown.
+
+    Args:
+        v (dict): Validated input as returned by `validate`.
+
+    Returns:
+        EditPlan: The edits of the legend.
+    """
+    for var in ["molecules", "accessibility1", "accessibility2"]:
+        assert var in v
+
+    plan = EditPlan()
+    # if mol ==1 make row == 2 invisible
+    if v["molecules"] == "1":
+        setAttributeForElements(plan, "row", "2", "display", "None")
+    if v["accessibility1"] == None:
+        setAttributeForElements(plan, "id", "colorbox1", "fill", "lightblue")
+        setAttributeForElements(plan, "id", "scale1", "display", "None")
+    if v["accessibility2"] == None:
+        setAttributeForElements(plan, "id", "colorbox2", "fill", "#F4BB44")
+        setAttributeForElements(plan, "id", "scale2", "display", "None")
+    return plan
@@ -0,0 +1,90 @@
+import logging
+from contextlib import contextmanager
+
+from rna_to_img import openTemplatePage
+
+# a page is closed and replaced after this many renders, so memory
+# fornac or d3 keep alive between renders can not pile up
+MAX_PAGE_RENDERS = 50
+
+# globals a render leaves on the page: the container of buildMolecules,
+# the element index of the edit plan and variables the edits assign
+RENDER_GLOBALS = ["varriContainer", "varriIndex", "fornac_plot", "node", "link", "l1", "l2"]
+
+# resets a template page to the state after loading it, returns
+# false if the page can not be reused
+reset_page_js = """(render_globals) => {
+            // stop the forcefield of the last render
+            if (window.varriContainer) {
+                window.varriContainer.force.stop();
+            }
+            document.querySelector("#rna_ss").innerHTML = " ";
+            render_globals.forEach((name) => { delete window[name]; });
+
+            return typeof fornac !== "undefined"
+                && document.querySelectorAll("svg").length == 0
+                && render_globals.every((name) => !(name in window));
+        }"""
+
+
+def resetPage(page) -> bool:
+    """Reset a template page after a render.
+
+    Removes the svg fornac built and all globals of the render.
+
+    Returns:
+        bool: True if the page is clean and can be used for the next render.
+    """
+    try:
+        return page.evaluate(reset_page_js, RENDER_GLOBALS)
+    except Exception as e:
+        logging.warning(f"template page could not be reset: {e}")
+        return False
+
+
+class PagePool:
+    """Template pages with d3 and fornac loaded, reused across renders.
+
+    Opening a page with `openTemplatePage` parses and compiles d3 and
+    fornac every time. A pool keeps the pages of finished renders and
+    resets them (see `resetPage`) instead of navigating again.
+
+    A page is not returned to the pool if its render raised an error,
+    if the reset fails or if it already rendered `max_renders` inputs.
+    Pages are handed out to one render at a time, the pool is meant
+    for the thread owning the sync playwright API.
+    """
+
+    def __init__(self, browser, max_renders: int = MAX_PAGE_RENDERS):
+        self.browser = browser
+        self.max_renders = max_renders
+        # [(page, number of renders)] of the pages ready for a render
+        self.idle = []
+
+    def prepare(self) -> None:
+        """Make sure a loaded page is ready for the next render."""
+        if not self.idle:
+            self.idle.append((openTemplatePage(self.browser), 0))
+
+    @contextmanager
+    def page(self):
+        """Context manager handing out a template page for one render."""
+        self.prepare()
+        page, renders = self.idle.pop()
+        try:
+            yield page
+        except BaseException:
+            # the state of the page after a failed render is unknown
+            page.close()
+            raise
+
+        if renders + 1 < self.max_renders and resetPage(page):
+            self.idle.append((page, renders + 1))
+        else:
+            page.close()
+
+    def close(self) -> None:
+        """Close all pages of the pool."""
+        for page, _ in self.idle:
+            page.close()
+        self.idle = []
@@ -0,0 +1,99 @@
+from array import array
+from functools import lru_cache
+
+# opening bracket of every basepair type and its closing bracket
+BRACKETS = {"(": ")", "[": "]", "{": "}", "<": ">"}
+CLOSING = {close: open for open, close in BRACKETS.items()}
+# partner of an unpaired nucleotide
+UNPAIRED = -1
+
+
+class PairTable:
+    """Basepairs of a structure in dot-bracket notation, parsed in one pass.
+
+    The structure may contain two molecules separated by "&", the table
+    covers both without the "&": the nucleotides of the first molecule
+    have the indices (based 0) below `length1`. partner[i] is the index
+    of the nucleotide paired with i or UNPAIRED. Brackets of one type are
+    matched like parentheses, independent of the other types.
+
+    intermolecular[i] is 1 for both nucleotides of a basepair between the
+    molecules and for brackets without a partner. Within a single molecule
+    such a bracket pairs with the other molecule, the intermolecular
+    basepairs are marked with carets (^):
+
+    eg ((..(..)) and ((..)..))
+       ^                     ^
+    eg ((<<...))... and ...>>..
+         ^^                ^^
+    """
+
+    def __init__(self, structure: str):
+        self.length1 = structure.find("&") if "&" in structure else len(structure)
+        self.structure = structure.replace("&", "")
+        self.partner = array("i", [UNPAIRED]) * len(self.structure)
+        self.intermolecular = bytearray(len(self.structure))
+        # brackets without a partner: the closing ones in order,
+        # the opening ones by their type
+        self.unmatched_closing = []
+        self.unmatched_opening = {}
+
+        stacks = {bracket: [] for bracket in BRACKETS}
+        partner = self.partner
+        length1 = self.length1
+        for index, char in enumerate(self.structure):
+            if char in stacks:
+                stacks[char].append(index)
+            elif char in CLOSING:
+                stack = stacks[CLOSING[char]]
+                if not stack:
+                    self.unmatched_closing.append(index)
+                    self.intermolecular[index] = 1
+                    continue
+                opening = stack.pop()
+                partner[opening] = index
+                partner[index] = opening
+                if opening < length1 <= index:
+                    self.intermolecular[opening] = self.intermolecular[index] = 1
+
+        for bracket, stack in stacks.items():
+            if stack:
+                self.unmatched_opening[bracket] = stack
+                for index in stack:
+                    self.intermolecular[index] = 1
+
+    def bounds(self, mol: int) -> tuple:
+        """First index and the index behind the last nucleotide of molecule 1 or 2."""
+        return (0, self.length1) if mol == 1 else (self.length1, len(self.structure))
+
+    def pairs(self, mol: int) -> list:
+        """Basepairs (i, j), i < j, within molecule 1 or 2, indices of the molecule (based 0)."""
+        start, end = self.bounds(mol)
+        partner = self.partner
+        return [(i - start, partner[i] - start) for i in range(start, end)
+                if i < partner[i] < end]
+
+    def intermolecularNodes(self, mol: int) -> list:
+        """Sorted indices of the molecule (based 0) with an intermolecular flag."""
+        start, end = self.bounds(mol)
+        nodes = []
+        index = self.intermolecular.find(1, start, end)
+        while index != -1:
+            nodes.append(index - start)
+            index = self.intermolecular.find(1, index + 1, end)
+        return nodes
+
+    def intermolecularPairs(self) -> list:
+        """Basepairs (i, j) between the molecules, sorted by the index i of molecule 1."""
+        partner = self.partner
+        return [(i, partner[i]) for i in self.intermolecularNodes(1) if partner[i] >= self.length1]
+
+
+@lru_cache(maxsize=8)
+def pairTable(structure: str) -> PairTable:
+    """The PairTable of a structure, parsed once for all its consumers.
+
+    A render asks for the table of the same structure in validation,
+    cropping and every modification, only the first one parses it.
+    """
+    return PairTable(structure)
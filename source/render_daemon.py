@@ -0,0 +1,312 @@
+#!/usr/bin/python3
+import argparse
+import base64
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import sys
+from pathlib import Path
+
+from utils import render_socket
+
+
+# -----------------------------------------------------------------
+# message protocol: every message is a json object, prefixed with its
+# length as 4 byte unsigned integer (big endian)
+HEADER = struct.Struct(">I")
+
+
+def sendMessage(sock, message: dict) -> None:
+    """Send a length prefixed json message over a socket.
+
+    Args:
+        sock: Connected socket.
+        message (dict): json serializable message.
+    """
+    data = json.dumps(message).encode()
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def receiveExactly(sock, size: int) -> bytes:
+    """Read exactly `size` bytes from a socket.
+
+    Raises:
+        ConnectionError: If the connection closes before all bytes arrived.
+    """
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("render daemon connection closed unexpectedly")
+        data += chunk
+    return data
+
+
+def receiveMessage(sock) -> dict:
+    """Receive a length prefixed json message from a socket."""
+    (size,) = HEADER.unpack(receiveExactly(sock, HEADER.size))
+    return json.loads(receiveExactly(sock, size))
+
+
+def encodeValidated(v: dict) -> dict:
+    """Convert a validated input dictionary into a json serializable one.
+
+    Paths become strings and the integer keys of "access_data"
+    are stored as a list of [index, probability] pairs, so that
+    `decodeValidated` can restore them.
+
+    Args:
+        v (dict): Validated input as returned by `validate`.
+
+    Returns:
+        dict: json serializable copy of `v`.
+    """
+    encoded = {key: str(value) if isinstance(value, Path) else value
+               for key, value in v.items()}
+    encoded["access_data"] = [[index, prb] for index, prb in v["access_data"].items()]
+    return encoded
+
+
+def decodeValidated(encoded: dict) -> dict:
+    """Restore a validated input dictionary encoded by `encodeValidated`."""
+    v = dict(encoded)
+    v["access_data"] = {index: prb for index, prb in encoded["access_data"]}
+    return v
+
+
+def checkSocketOwner(socket_path) -> None:
+    """Make sure a socket belongs to the current user.
+
+    Everybody can create a socket in a shared directory like /tmp, the
+    inputs must not be sent to a daemon of another user.
+
+    Raises:
+        ValueError: If the socket belongs to another user.
+    """
+    if Path(socket_path).stat().st_uid != os.getuid():
+        raise ValueError(f"The socket {socket_path} belongs to another user")
+
+
+# -----------------------------------------------------------------
+# client side, used by rna_to_img.py
+
+def daemonRunning(socket_path) -> bool:
+    """Check whether a render daemon of the current user is listening on the given socket.
+
+    Args:
+        socket_path: Path to the unix socket of the daemon.
+
+    Returns:
+        bool: True if a connection could be established.
+    """
+    if not Path(socket_path).exists():
+        return False
+    try:
+        checkSocketOwner(socket_path)
+    except ValueError as e:
+        logging.warning(f"{e}, rendering locally")
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(socket_path))
+            sendMessage(sock, {"command": "ping"})
+            return receiveMessage(sock).get("status") == "ok"
+    except (OSError, ValueError):
+        return False
+
+
+def requestRender(socket_path, v: dict) -> dict:
+    """Let a running render daemon render a validated input.
+
+    Args:
+        socket_path: Path to the unix socket of the daemon.
+        v (dict): Validated input as returned by `validate`.
+
+    Returns:
+        dict: {"image": bytes, "legend": bytes or None}, the same
+        result `render` returns for a local browser.
+
+    Raises:
+        ValueError: If the daemon could not render the input or the
+            socket belongs to another user.
+    """
+    checkSocketOwner(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sendMessage(sock, {"command": "render", "v": encodeValidated(v)})
+        response = receiveMessage(sock)
+
+    if "error" in response:
+        raise ValueError(f"Render daemon failed: {response['error']}")
+    legend = response["legend"]
+    return {"image": base64.b64decode(response["image"]),
+            "legend": base64.b64decode(legend) if legend is not None else None}
+
+
+# -----------------------------------------------------------------
+# server side
+
+class RenderHandler(socketserver.BaseRequestHandler):
+    """Handles one client connection: a ping, a render or a shutdown."""
+
+    def handle(self):
+        message = receiveMessage(self.request)
+        command = message.get("command")
+
+        if command == "ping":
+            sendMessage(self.request, {"status": "ok"})
+            return
+        if command == "shutdown":
+            sendMessage(self.request, {"status": "ok"})
+            self.server.shutdown_requested = True
+            return
+        if command != "render":
+            sendMessage(self.request, {"error": f"unknown command: {command}"})
+            return
+
+        try:
+            images = self.server.renderRequest(decodeValidated(message["v"]))
+            legend = images["legend"]
+            response = {"image": base64.b64encode(images["image"]).decode(),
+                        "legend": base64.b64encode(legend).decode() if legend is not None else None}
+        except Exception as e:
+            logging.exception("render failed")
+            response = {"error": str(e)}
+        sendMessage(self.request, response)
+
+        # prepare the next template page only after the client got its answer
+        self.server.preparePage()
+
+
+class RenderDaemon(socketserver.UnixStreamServer):
+    """Unix socket server owning one warm chromium browser.
+
+    Requests are handled one after another, the sync playwright API
+    may only be used from the thread that started it. A template page
+    with d3 and fornac already loaded is kept ready for the next request,
+    pages are reset and reused between requests (see `PagePool`).
+    """
+
+    def __init__(self, socket_path, browser):
+        # imported here, rna_to_img itself imports the client functions
+        from page_pool import PagePool
+        self.browser = browser
+        self.pool = PagePool(browser)
+        self.shutdown_requested = False
+        self.preparePage()
+        super().__init__(str(socket_path), RenderHandler)
+
+    def server_bind(self):
+        super().server_bind()
+        # only the current user may send requests
+        os.chmod(self.server_address, 0o600)
+
+    def preparePage(self) -> None:
+        """Make sure a template page is ready for the next request."""
+        self.pool.prepare()
+
+    def renderRequest(self, v: dict) -> dict:
+        """Render one validated input on a template page of the pool."""
+        from rna_to_img import render
+        with self.pool.page() as page:
+            return render(self.browser, page, v)
+
+    def serve(self) -> None:
+        """Handle requests until a shutdown command is received."""
+        while not self.shutdown_requested:
+            self.handle_request()
+
+
+def prepareSocket(socket_path: Path) -> None:
+    """Prepare the path of the socket before the daemon listens on it.
+
+    The directory of the default socket is created, only accessible by
+    the current user. A socket left over by a daemon of the current
+    user that did not shut down cleanly is removed.
+
+    Raises:
+        ValueError: If the directory of the default socket or the left
+            over socket belongs to another user or others can access it.
+    """
+    directory = socket_path.parent
+    if directory == render_socket.parent:
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        stat = directory.stat()
+        if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+            raise ValueError(f"The directory {directory} of the socket must only be" \
+                             " accessible by the current user")
+    if socket_path.exists():
+        checkSocketOwner(socket_path)
+        socket_path.unlink()
+
+
+def serve(socket_path) -> None:
+    """Start a browser and serve render requests on a unix socket.
+
+    Args:
+        socket_path: Path of the unix socket to listen on.
+    """
+    from playwright.sync_api import sync_playwright
+
+    socket_path = Path(socket_path)
+    if daemonRunning(socket_path):
+        raise ValueError(f"A render daemon is already running on {socket_path}")
+    prepareSocket(socket_path)
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        try:
+            with RenderDaemon(socket_path, browser) as daemon:
+                logging.info(f"render daemon listening on {socket_path}")
+                daemon.serve()
+                daemon.pool.close()
+        finally:
+            socket_path.unlink(missing_ok=True)
+            browser.close()
+
+
+def stop(socket_path) -> None:
+    """Ask the render daemon listening on `socket_path` to shut down."""
+    checkSocketOwner(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sendMessage(sock, {"command": "shutdown"})
+        receiveMessage(sock)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+			prog='render_daemon.py',
+			description='keeps a headless chromium browser with the fornac template ' \
+			'loaded and renders requests forwarded by rna_to_img.py')
+    parser.add_argument(
+			'--socket',
+			help='path of the unix socket the daemon listens on',
+            default=str(render_socket))
+    parser.add_argument(
+			'--stop',
+			help='stop the daemon listening on --socket',
+            action='store_true')
+    parser.add_argument(
+            '-v',
+			'--verbose',
+			help='Enable Logging',
+            action='store_true')
+    args = vars(parser.parse_args())
+
+    logging.basicConfig(level=logging.INFO if args["verbose"] else logging.ERROR,
+                        format="[{levelname}] {message}",
+                        style="{")
+    try:
+        if args["stop"]:
+            stop(args["socket"])
+        else:
+            serve(args["socket"])
+    except (ValueError, OSError) as e:
+        logging.error(e)
+        sys.exit(2)
+    except KeyboardInterrupt:
+        pass
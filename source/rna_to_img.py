@@ -1,35 +1,33 @@
 #!/usr/bin/python3
 import argparse
-from playwright.sync_api import sync_playwright
 import urllib.parse
 import sys
+import os
+import shutil
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
 
 
 # import input validation functions:
-from input_validation import ( validate)
-
-from modifications import (changeBackgroundColor,
-                           highlightingRegion,
-                           highlightingBasepairs,
-                           visualiseBasepairStength,
-                           removeSecondLink,
-                           highlightSubsequence,
-                           removeDummyNodes,
-                           setLinksId,
-                           updateLinkTooltips,
-                           setLabelsId,
-                           updateNodeToolTips,
-                           setIndexLabels,
-                           backgroundhighlightingBasepairs,
-                           backgroundhighlightingRegion,
-                           visualiseAccessibilty,
-                           setAttributeForElements
-                           )
+from input_validation import ( validate,
+                               logPredictionCounter)
+
+from modifications import (planModifications,
+                           getLabelPositions)
+
+from cache import (DiskCache,
+                   fileDigest,
+                   openCache)
 
 from utils import (fornac_css, 
+                fornac_js,
                 template_barebone_html,
-                template_legende_html)
+                template_legende_html,
+                render_socket)
+
+from render_daemon import (daemonRunning,
+                           requestRender)
 
 
 
@@ -41,6 +39,9 @@ svg_template = '<svg xmlns="http://www.w3.org/2000/svg" viewBox=VIEWBOX> \n' \
                 'SVG_PLACEHOLDER' \
                 '\n</svg>'
 
+# legends built by this process, by their legendVariant
+legend_images = {}
+
 
 try:
     assert (fornac_css).exists()
@@ -50,23 +51,93 @@ except FileNotFoundError:
     logging.error("fornac.css was not found in project directory")
 
 
-def buildMolecules(page, v):
-    for var in ["structure", "sequence", "forcefield"]:
-        assert var in v
-    # complete structure and sequence with fix
-    structure, sequence = v["structure"], v["sequence"], 
-    animation, timer = v["forcefield"], v["forcefield_timer"]
+# the forcefield with --forcefieldTicks stops, once its alpha (the
+# strength of the movement) falls below this value
+CONVERGED_ALPHA = 0.005
 
-    page.evaluate("""([structure, sequence, animation]) => {
-            var container = new fornac.FornaContainer("#rna_ss", {'animation': animation, 'labelInterval': 1});
+# creates the FornaContainer and adds the molecules to it
+# labels: positions of the index labels, fornac only adds these labels to the svg
+# ticks: steps of the forcefield, computed before returning. The d3 timer
+# moving the forcefield in real time only starts after this script, so the
+# layout does not depend on the speed of the machine. null keeps the timer
+build_molecules_js = """([structure, sequence, animation, labels, ticks, converged]) => {
+            var container = new fornac.FornaContainer("#rna_ss", {'animation': animation, 'labelInterval': labels});
             var options = {'structure': structure,
                         'sequence': sequence
             };
             container.addRNA(options.structure, options);
-        }""", [structure, sequence, animation])
+            // kept for resetting the page (see page_pool.py)
+            window.varriContainer = container;
+
+            if (animation && ticks !== null) {
+                var force = container.force;
+                // tick() updates the svg and returns true, once d3 stops on its own
+                for (var i = 0; i < ticks && force.alpha() >= converged; i++) {
+                    if (force.tick()) break;
+                }
+                force.stop();
+            }
+        }"""
+
+# the svg fornac built, stored in and restored from the layout cache
+save_molecules_js = """() => document.querySelector("#rna_ss").innerHTML"""
+restore_molecules_js = """(svg) => {
+            document.querySelector("#rna_ss").innerHTML = svg;
+        }"""
+
+
+def moleculesArgs(v, labels) -> list:
+    """Arguments of build_molecules_js for a validated input."""
+    for var in ["structure", "sequence", "forcefield", "forcefield_ticks"]:
+        assert var in v
+    return [v["structure"], v["sequence"], v["forcefield"], labels,
+            v["forcefield_ticks"], CONVERGED_ALPHA]
+
+
+def moleculesCacheable(v) -> bool:
+    """True if the svg fornac builds is the same for every render of the input.
+
+    Only the forcefield moved by the d3 timer depends on the time it got,
+    a fixed number of ticks (--forcefieldTicks) is deterministic.
+    """
+    return not v["forcefield"] or v["forcefield_ticks"] is not None
+
+
+def moleculesKey(v, labels) -> str:
+    """Cache key of the svg fornac builds without the timed forcefield.
+
+    The svg only depends on the structure, the sequence, the index labels,
+    the ticks of the forcefield and the code of fornac.
+    """
+    ticks = v["forcefield_ticks"] if v["forcefield"] else None
+    return DiskCache.key("fornac svg", fileDigest(fornac_js), v["structure"], v["sequence"],
+                         labels, ticks, CONVERGED_ALPHA)
+
+
+def buildMolecules(page, v):
+    for var in ["structure", "sequence", "forcefield"]:
+        assert var in v
+    animation, timer = v["forcefield"], v["forcefield_timer"]
+
+    labels = getLabelPositions(v)
+
+    # the layout of the timed forcefield is not deterministic, it is never cached
+    cache = openCache(v) if moleculesCacheable(v) else None
+    if cache is not None:
+        key = moleculesKey(v, labels)
+        svg = cache.get(key)
+        if svg is not None:
+            page.evaluate(restore_molecules_js, svg.decode())
+            return
+
+    page.evaluate(build_molecules_js, moleculesArgs(v, labels))
     
-    if animation:
+    # with --forcefieldTicks, the forcefield already finished in build_molecules_js
+    if animation and v["forcefield_ticks"] is None:
             page.wait_for_timeout(timer * 1000)
+
+    if cache is not None:
+        cache.put(key, page.evaluate(save_molecules_js).encode())
     
 # -----------------------------------------------------------------
 def setupLogging(v: dict):
@@ -78,7 +149,18 @@ def setupLogging(v: dict):
                         style="{")
     
 
-def extractImage(page, browser, file_name, file_type, viewbox):
+def extractImage(page, browser, file_type, viewbox) -> bytes:
+    """Serialize the svg of a page into the final image.
+
+    Args:
+        page: Playwright page containing the built svg.
+        browser: Playwright browser, used to rasterize png images.
+        file_type (str): Output file type, either "svg" or "png".
+        viewbox (str): viewBox attribute of the final svg.
+
+    Returns:
+        bytes: The svg code or the png image data.
+    """
     #  extracting the built svg file
     svg = page.locator("svg").first.inner_html()
 
@@ -86,190 +168,245 @@ def extractImage(page, browser, file_name, file_type, viewbox):
     final_svg = svg_template.replace("SVG_PLACEHOLDER", svg)
     final_svg = final_svg.replace("VIEWBOX", viewbox)
 
-    error = ""
+    if file_type == "png":
+        return rasterizeSvg(browser, final_svg)
+    return final_svg.encode()
+
 
+def rasterizeSvg(browser, final_svg: str) -> bytes:
+    """Create a png image of svg code, by taking a screenshot of it."""
+    svg_page = browser.new_page()
+    url_svg = urllib.parse.quote(final_svg)
+    svg_page.goto(f"data:image/svg+xml,{url_svg}")
+    png = svg_page.screenshot()
+    svg_page.close()
+    return png
+
+
+def writeImage(image: bytes, file_name, file_type) -> None:
+    """Write an extracted image to its output file or to STDOUT.
+
+    Args:
+        image (bytes): svg code or png data returned by `extractImage`.
+        file_name: Output path or "STDOUT".
+        file_type (str): Output file type, either "svg" or "png".
+
+    Raises:
+        ValueError: If the output path can not be written.
+    """
     if file_name == "STDOUT":
-        print(final_svg)
-    else:
-        try:
-            if file_type == "png":
-                # create a new page with the svg code and take a screenshot
-                svg_page = browser.new_page()
-                url_svg = urllib.parse.quote(final_svg)
-                svg_page.goto(f"data:image/svg+xml,{url_svg}")
-                svg_page.screenshot(path=file_name)
-                
-                logging.info(f"png File created: {file_name}")
-            if file_type == "svg":
-                # writing the svg code as a string into a file
-                with open(file_name, "w") as f:
-                    f.write(final_svg)
-                logging.info(f"svg File created: {file_name}")
-
-        except PermissionError:
-            error = "Permission Denied for Path: "
-        except ValueError:
-            error = "Path is invalid: "
-        except FileNotFoundError:
-            error = "Path does not exist: "
+        print(image.decode())
+        return
+
+    error = ""
+    try:
+        if os.path.isfile(file_name) and os.stat(file_name).st_nlink > 1:
+            # the file may be a legend linked to the cache (see linkImage),
+            # writing into it would change the cache entry too
+            os.unlink(file_name)
+        with open(file_name, "wb") as f:
+            f.write(image)
+        logging.info(f"{file_type} File created: {file_name}")
+    except PermissionError:
+        error = "Permission Denied for Path: "
+    except ValueError:
+        error = "Path is invalid: "
+    except FileNotFoundError:
+        error = "Path does not exist: "
 
     if error:
-        print("[Error] " + error + str(file_name))
-        sys.exit(2)
+        raise ValueError(error + str(file_name))
+
+
+def saveImages(images: dict, v) -> None:
+    """Write the rendered image and, if created, its legend."""
+    for var in ["output_name", "output_legend", "output_type"]:
+        assert var in v
+    writeImage(images["image"], v["output_name"], v["output_type"])
+    if images["legend"] is not None:
+        cache = openCache(v)
+        entry = cache.path(legendKey(v)) if cache is not None else None
+        if entry is None or not linkImage(entry, v["output_legend"], v["output_type"]):
+            writeImage(images["legend"], v["output_legend"], v["output_type"])
+
+
+def linkImage(source: Path, file_name, file_type) -> bool:
+    """Write an image by hardlinking or copying a file with its content.
+
+    Returns:
+        bool: False if the image could not be linked or copied,
+        it has to be written with `writeImage` instead.
+    """
+    if file_name == "STDOUT" or not source.exists():
+        return False
+    if os.path.exists(file_name) and os.path.samefile(source, file_name):
+        logging.info(f"{file_type} File created: {file_name}")
+        return True
+    temp_name = f"{file_name}.{os.getpid()}.tmp"
+    try:
+        try:
+            os.link(source, temp_name)
+        except OSError:
+            # eg. the cache is on another file system
+            shutil.copyfile(source, temp_name)
+        os.replace(temp_name, file_name)
+    except OSError as e:
+        logging.warning(f"{source} could not be linked to {file_name}: {e}")
+        Path(temp_name).unlink(missing_ok=True)
+        return False
+    logging.info(f"{file_type} File created: {file_name}")
+    return True
+
+
+def openTemplatePage(browser):
+    """Open a new page with the fornac template loaded."""
+    page = browser.new_page()
+    assert template_barebone_html.exists()
+    page.goto("file:///" + str(template_barebone_html))
+    return page
 
 
 # -----------------------------------------------------------------
 # open a headless chromium browser instance and load html file with
 # FornaContainer. Extract the created svg into a seperated svg file
 def run(v):
-    with sync_playwright() as p:
-        for var in ["molecules", "coloring", "highlighting", 
-                    "output_name", "output_type", "output_legend", "sequence",
-                    "backgroundhighlighting", "sequence1"]:
-            assert var in v
-
-        file_name, file_type = v["output_name"], v["output_type"]
-        legend = v["legend"]
-        # amount of molecules [1, 2]
-        molecules = v["molecules"]
-        # options [default, distinct]
-        coloring_type = v["coloring"]
-        # options [nothing, pairs, region]
-        highlighting = v["highlighting"]
-        # option [(int,int)]
-        subsequence1 =  v["highlightSubseq1"]
-        subsequence2 =  v["highlightSubseq2"]
-        # seq1&...seq2
-        seq = v["sequence"]
-        # options [nothing, pairs, region]
-        backgroundhighlighting = v["backgroundhighlighting"]
-        # options [True, False]
-        showAccessibility1 = v["accessibility1"]
-        showAccessibility2 = v["accessibility2"]
-        access_data = v["access_data"]
-
-        split = len(v["sequence1"])
-
-        
+    """Render one input with a new browser and write its images.
 
+    Args:
+        v: Validated input as returned by `validate`, or a Future of it.
+            The browser is launched and the template loaded while the
+            Future is validating the input (eg. running RNAplfold).
 
+    Raises:
+        ValueError: If the input of the Future is invalid.
+    """
+    # playwright is only needed when rendering locally, a call
+    # forwarded to the render daemon does not have to import it
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
         # start browser and load page with fornac script
         browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        assert template_barebone_html.exists()
-        page.goto("file:///" + str(template_barebone_html))
-        
-        # use fornac to generate structure
-        buildMolecules(page, v)
+        try:
+            page = openTemplatePage(browser)
+            if isinstance(v, Future):
+                v = v.result()
+                logging.info("input validation completed")
+        except ValueError:
+            browser.close()
+            raise
 
-    
-        # -------------------------------------------------------------
-        # preparing the svg for modification:
-        # set Id for Links and labels for direct access
-        setLinksId(page)
-        setLabelsId(page)
-        # remove dummy nodes that make up the seperating space
-        # between the 2 molecules
-        removeDummyNodes(page, seq)
-        # remove the second layer of intermolecular links
-        # now: only links from node1 to node2 where node1 < node2
-        if molecules == "2":
-            removeSecondLink(page)
-
-
-        # -----------------------------------------------------
-        # changing the background color
-        # this option colors all nucleotides of one sequence in one color
-        if coloring_type == "strand":
-            changeBackgroundColor(page, v)
-
-        # -----------------------------------------------------
-        # displaying the correct Numbers:
-
-        # changing the tooltip number of each node 
-        updateNodeToolTips(page, v)
-        # changing the tooltip for each link
-        updateLinkTooltips(page, v)
-        # and set the correct index labels
-        setIndexLabels(page, v)
-
-        # -----------------------------------------------------
-        # changing the higlighting of nodes to show
-        # intermolecular setting
-        # only works when 2 molecules given
-        if molecules == "2":
-            if highlighting == "region":
-                highlightingRegion(page, v)
-            if highlighting == "basepairs":
-                highlightingBasepairs(page, v)
-        
-        # -----------------------------------------------------
-        # changing the backgroundhighlighting of nodes to show
-        # intermolecular setting
-        # only works when 2 molecules given
-        if molecules == "2":
-            if backgroundhighlighting == "region":
-                backgroundhighlightingRegion(page, v)
-            if backgroundhighlighting == "basepairs":
-                backgroundhighlightingBasepairs(page, v)
-
-        #-----------------------------------------------
-        # visualise basepair strenght (G-U )
-        if v["guBasepairs"]:
-            visualiseBasepairStength(page, v)
-
-        #------------------------------------------------
-        # highlight subsequence
-        if subsequence1 is not None:
-            highlightSubsequence(page, v, "1")
-        if molecules == "2" and subsequence2 is not None:
-            highlightSubsequence(page, v, "2")
-
-        #------------------------------------------------
-        # show accessibility of Nucleotides  
-        if showAccessibility1 != None or showAccessibility2 != None:
-            visualiseAccessibilty(page, access_data, split)
-
-
-        #------------------------------------------------
-        # create legende
-        if legend:
-            buildLegend(browser, v)
-
-        # extract RNA Image
-        extractImage(page, browser, file_name, file_type, '"0 0 300 300"')
+        images = render(browser, page, v)
 
         # close chromium borwser
         browser.close()
 
+    saveImages(images, v)
+
+
+def render(browser, page, v) -> dict:
+    """Render one validated input on a page with the fornac template.
+
+    Builds the molecules with fornac, applies all modifications and
+    extracts the image and, if enabled, the legend.
+
+    Args:
+        browser: Playwright browser owning the page.
+        page: Page with the fornac template loaded (see `openTemplatePage`).
+        v (dict): Validated input as returned by `validate`.
+
+    Returns:
+        dict: {"image": bytes, "legend": bytes or None}
+    """
+    # use fornac to generate structure
+    buildMolecules(page, v)
+    modifyStructure(page, v)
+    return extractImages(browser, page, v)
+
+
+def modifyStructure(page, v) -> None:
+    """Apply all modifications to the structure fornac has built.
 
-def buildLegend(browser, v):
-    for var in ["molecules", "output_type", "output_legend",
-                "accessibility1", "accessibility1"]:
+    The modifications are planned in python (see `planModifications`)
+    and applied with a single `page.evaluate`.
+
+    Args:
+        page: Page on which `buildMolecules` has been called.
+        v (dict): Validated input as returned by `validate`.
+    """
+    planModifications(v).apply(page)
+
+
+def extractImages(browser, page, v) -> dict:
+    """Extract the finished image and, if enabled, build the legend.
+
+    Returns:
+        dict: {"image": bytes, "legend": bytes or None}
+    """
+    for var in ["output_type", "legend"]:
         assert var in v
-    
-    molecules = v["molecules"]
-    showAccessibility1 = v["accessibility1"]
-    showAccessibility2 = v["accessibility2"]
-    file_legend = v["output_legend"]
     file_type = v["output_type"]
-    # legende page
-    legende_page = browser.new_page()
-    # go to legende template 
-    assert template_barebone_html.exists()
-    legende_page.goto("file:///" + str(template_legende_html))
-    # if mol ==1 make row == 2 invisible
-    if molecules == "1":
-        setAttributeForElements(legende_page, "row", "2", "display", "None")
-    if showAccessibility1 == None:
-        setAttributeForElements(legende_page, "id", "colorbox1", "fill", "lightblue")
-        setAttributeForElements(legende_page, "id", "scale1", "display", "None")
-    if showAccessibility2 == None:
-        setAttributeForElements(legende_page, "id", "colorbox2", "fill", "#F4BB44")
-        setAttributeForElements(legende_page, "id", "scale2", "display", "None")
+
+    #------------------------------------------------
+    # create legende
+    legend_image = buildLegend(browser, v) if v["legend"] else None
+
+    # extract RNA Image
+    image = extractImage(page, browser, file_type, '"0 0 300 300"')
+
+    return {"image": image, "legend": legend_image}
+
+
+def legendVariant(v) -> tuple:
+    """Everything the legend of an input depends on.
+
+    The legend only shows the rows of the molecules and the scales
+    of the accessibilities that are given.
+    """
+    for var in ["molecules", "output_type", "accessibility1", "accessibility2"]:
+        assert var in v
+    return (v["molecules"], v["accessibility1"] is not None,
+            v["accessibility2"] is not None, v["output_type"])
+
+
+def legendKey(v) -> str:
+    """Cache key of the legend of an input."""
+    return DiskCache.key("legend", fileDigest(template_legende_html), *legendVariant(v))
 
 
-    extractImage(legende_page, browser, file_legend, file_type, '"0 0 560 200"')
+def buildLegend(browser, v) -> bytes:
+    """The legend of an input, built once per variant.
+
+    The svg is built from legende.html without a page (see
+    svg_engine.buildLegend). Legends are kept for the lifetime of the
+    process and in the cache directory, so a png legend is only
+    rasterized the first time its variant is needed.
+
+    Args:
+        browser: Playwright browser, used to rasterize png legends.
+            None is enough for svg legends.
+        v (dict): Validated input as returned by `validate`.
+
+    Returns:
+        bytes: The svg code or the png image data of the legend.
+    """
+    variant = legendVariant(v)
+    if variant in legend_images:
+        return legend_images[variant]
+
+    cache = openCache(v)
+    legend = cache.get(legendKey(v)) if cache is not None else None
+    if legend is None:
+        # imported here, svg_engine is only imported when it is used
+        from svg_engine import buildLegend as buildLegendSvg
+        legend = buildLegendSvg(v)
+        if v["output_type"] == "png":
+            legend = rasterizeSvg(browser, legend.decode())
+        if cache is not None:
+            cache.put(legendKey(v), legend)
+
+    legend_images[variant] = legend
+    return legend
 
 
 
@@ -278,7 +415,8 @@ def buildLegend(browser, v):
 # structure | example ((..((....)).(((....))).))
 # sequence | example CGCUUCAUAUAAUCCUAAUGACCUAU
 
-if __name__ == '__main__':
+def argumentParser() -> argparse.ArgumentParser:
+    """Parser of the command line options of rna_to_img.py."""
     parser = argparse.ArgumentParser(
 			prog='rna_to_svg.py',
 			description='takes as an input a rna structure and sequence and ' \
@@ -378,6 +516,17 @@ if __name__ == '__main__':
 			'--fastafile',
 			help='path to FASTA file, containing one or two sequences',
             default="None")
+    parser.add_argument(
+			'--fastaRecord1',
+			help='read the first sequence from the record of the FASTA file with this id, \n' \
+            'optionally only a part of it, eg. transcript:120-340 (based 1, inclusive). \n' \
+            'the file is indexed (.fai), it may contain any number of records. default: None',
+            default="None")
+    parser.add_argument(
+			'--fastaRecord2',
+			help='read the second sequence from a record of the FASTA file, see --fastaRecord1. \n' \
+            'default: None',
+            default="None")
     parser.add_argument(
 			'--predictStructure1',
 			help='enable intramolecular structure prediction for the first sequence',
@@ -396,6 +545,12 @@ if __name__ == '__main__':
             'set the timer, how many seconds the forcefield may move the molecules.\n' \
             'recommended 0.01 seconds',
             default='0.1')     
+    parser.add_argument(
+			'--forcefieldTicks',
+			help='enable fornacs forcefield for a fixed number of steps instead of a timer. \n' \
+            'the steps are computed at once, the structure moves the same on every machine. \n' \
+            'the forcefield stops earlier, if the structure settled. default: None (use the timer)',
+            default="None")
     parser.add_argument(
 			'--accessibility1',
 			help='Visualising Node accessibility in sequence 1 \n'\
@@ -414,6 +569,24 @@ if __name__ == '__main__':
             '"RNAplfold" String uses the RNAplfold to predict probabilities and visualise \n'\
             'None (default)" does not visualise Accessibility',
             default="None")
+    parser.add_argument(
+			'--accessibilityStore',
+			help='directory of precomputed accessibilities (see access_store.py). \n' \
+            'select a transcript with --accessibility1/2=store:<transcript id>, \n' \
+            'the molecule starts at position --startIndex1/2 of the transcript. default: None',
+            default="None")
+    parser.add_argument(
+			'--accessibilityFlank',
+			help='with --crop, RNAplfold only folds the cropped part of a molecule \n' \
+            'and this many nucleotides on both sides of it, instead of the whole molecule. \n' \
+            'default: None (fold the whole molecule)',
+            default="None")
+    parser.add_argument(
+			'--accessibilityColumn',
+			help='column of the probabilities in a lunp file given with --accessibility1/2, \n' \
+            'the length u of the unpaired region ending at a nucleotide (RNAplfold -u). \n' \
+            'default: 1, the probability of the nucleotide itself',
+            default="1")
     parser.add_argument(
 			'--RNAfold',
 			help='add parameters to RNAfold call. Default ""\n' \
@@ -426,25 +599,95 @@ if __name__ == '__main__':
             'example RNAplfold call:\n' \
             'echo AAAAAAAAGGGGAAAACCCCAAAAAAGGGGGGGG | RNAplfold -W20 -u1',
             default="")    
+    parser.add_argument(
+			'--engine',
+			help='how the image is drawn \n' \
+            'browser: fornac in a headless chromium browser (default) \n' \
+            'python: port of the fornac layout, without a browser. \n' \
+            'only svg output, the forcefield is not available',
+            default='browser')
+    parser.add_argument(
+			'--cache',
+			help='directory of the layout cache. the svg fornac builds without \n' \
+            'forcefield (--forcefield=0) or with --forcefieldTicks is stored there and \n' \
+            'reused for the same structure, sequence and labels. RNAplfold predictions \n' \
+            'and legends are stored there too. disabled by default',
+            default="None")
+    parser.add_argument(
+			'--batch',
+			help='render every record of a manifest (.tsv or .jsonl) with one browser. \n' \
+            'each record sets options by their long name (structure, sequence, output, ...), \n' \
+            'options not set in a record are taken from the command line. \n' \
+            'a .csv file is read as IntaRNA output (--outMode=C), one record per interaction',
+            default="None")
+    parser.add_argument(
+			'--batchTop',
+			help='only render the interactions with the lowest energy (column E) \n' \
+            'of every query (column id2) of an IntaRNA --batch. default: None (all)',
+            default="None")
+    parser.add_argument(
+			'--concurrency',
+			help='number of pages rendering records of a --batch at the same time, default: 1',
+            default="1")
+    parser.add_argument(
+			'--workers',
+			help='number of worker processes, each with its own browser, \n' \
+            'rendering the records of a --batch, default: 1',
+            default="1")
+    parser.add_argument(
+			'--daemon',
+			help='unix socket of a running render daemon (see render_daemon.py). \n' \
+            'if a daemon is listening, rendering is forwarded to it \n' \
+            'None renders locally with a new browser',
+            default=str(render_socket))
     parser.add_argument(
             '-v',
 			'--verbose',
 			help='Enable Logging',
             action='store_true') 
+    return parser
+
+
+if __name__ == '__main__':
     #-------------------------------------------------------------------------------
     # input validation
 
     # dictionary of all input variables
-    args = vars(parser.parse_args())
+    args = vars(argumentParser().parse_args())
     # dictionary of all validated input variables
     validated = {}
 
-    try:
-        # setup logging if enabled
-        validated["logging"] = args["verbose"]
-        setupLogging(validated)
-        logging.info("logging activated")
+    # setup logging if enabled
+    validated["logging"] = args["verbose"]
+    setupLogging(validated)
+    logging.info("logging activated")
+
+    if args["batch"] != "None":
+        from batch import runBatch
+        try:
+            failed = runBatch(args["batch"], args)
+        except ValueError as e:
+            logging.error(e)
+            sys.exit(2)
+        logPredictionCounter()
+        if failed:
+            logging.error(f"{failed} records of the batch could not be rendered")
+            sys.exit(2)
+        sys.exit(0)
+
+    daemon = None if args["daemon"] == "None" else Path(args["daemon"])
+    if args["engine"] == "browser" and (daemon is None or not daemonRunning(daemon)):
+        # rendering locally: chromium starts while the input is
+        # validated and RNAfold/RNAplfold are running
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                run(executor.submit(validate, args))
+        except ValueError as e:
+            logging.error(e)
+            sys.exit(2)
+        sys.exit(0)
 
+    try:
         validated.update(validate(args))
 
         logging.info("input validation completed")
@@ -455,4 +698,20 @@ if __name__ == '__main__':
         #traceback.print_exc()
         sys.exit(2)
 
-    run(validated)
+    try:
+        if validated["engine"] == "python":
+            # the python engine needs neither a browser nor the daemon
+            from svg_engine import FORCEFIELD_WARNING, render as renderPython
+            if validated["forcefield"]:
+                logging.warning(FORCEFIELD_WARNING)
+            saveImages(renderPython(validated), validated)
+        # forward the validated input to the render daemon, if one is running
+        elif daemon is not None and daemonRunning(daemon):
+            logging.info(f"forwarding to render daemon: {daemon}")
+            saveImages(requestRender(daemon, validated), validated)
+        else:
+            run(validated)
+
+    except ValueError as e:
+        logging.error(e)
+        sys.exit(2)
@@ -0,0 +1,674 @@
+import json
+import logging
+import math
+import re
+import xml.etree.ElementTree as ET
+from decimal import Decimal
+
+import numpy as np
+
+import fornac_layout
+from cache import (fileDigest,
+                   openCache)
+from fornac_layout import (computeLayout,
+                           removeBreaks,
+                           NODE_RADIUS,
+                           LABEL_RADIUS)
+from modifications import (EDITS,
+                           EditPlan,
+                           planModifications,
+                           planLegend,
+                           getLabelPositions)
+from utils import template_legende_html
+
+# renders the same svg as the browser pipeline (buildMolecules ->
+# modifyStructure -> extractImages), without starting chromium:
+# fornac_layout.py places the nodes, this module builds the svg
+# elements fornac would create and applies the modifications to them.
+
+# fill of the nucleotides with the "loop" coloring, as chromium
+# serializes the colors of fornac's structure color scheme
+LOOP_COLORS = {"s": "lightgreen",
+               "m": "rgb(255, 152, 150)",
+               "i": "rgb(219, 219, 141)",
+               "e": "lightsalmon",
+               "t": "lightcyan",
+               "h": "lightblue",
+               "x": "transparent"}
+
+# direction arrows of the nucleotides (see fornac.css options)
+NODE_STROKE_WIDTH = 0.8
+ARROW_SIZE = 6
+ARROW_WIDTH = 0.7
+
+# numbers in the transform of a node, same regex as modifications.polyline
+NUMBER_REGEX = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+# -----------------------------------------------------------------
+# minimal svg document
+
+class Element:
+    """Element of an svg document.
+
+    Attributes keep their insertion order, so the element serializes
+    with the attributes in the same order as the browser does.
+    Children are elements, `Comment`s or strings (text nodes).
+    """
+
+    def __init__(self, tag: str, attributes: dict = None, children: list = ()):
+        self.tag = tag
+        self.attributes = {}
+        self.children = []
+        self.parent = None
+        self.document = None
+        for name, value in (attributes or {}).items():
+            self.setAttribute(name, value)
+        for child in children:
+            self.append(child)
+
+    def getAttribute(self, name):
+        return self.attributes.get(name)
+
+    def setAttribute(self, name, value) -> None:
+        value = str(value)
+        if self.document is not None:
+            self.document.unindex(self, name)
+        self.attributes[name] = value
+        if self.document is not None:
+            self.document.index(self, name)
+
+    def append(self, child) -> None:
+        self.insert(len(self.children), child)
+
+    def insert(self, position: int, child) -> None:
+        if isinstance(child, Element):
+            child.parent = self
+            if self.document is not None:
+                self.document.attach(child)
+        self.children.insert(position, child)
+
+    def prepend(self, child) -> None:
+        """Insert a child in front of the first child (insertBefore(firstChild))."""
+        self.insert(0, child)
+
+    def after(self, sibling) -> None:
+        """Insert `sibling` directly behind this element."""
+        self.parent.insert(self.parent.children.index(self) + 1, sibling)
+
+    def remove(self) -> None:
+        if self.parent is None:
+            return
+        if self.document is not None:
+            self.document.detach(self)
+        self.parent.children.remove(self)
+        self.parent = None
+
+    def firstChild(self):
+        return self.children[0] if self.children else None
+
+    @property
+    def textContent(self) -> str:
+        return "".join(child if isinstance(child, str) else child.textContent
+                       for child in self.children if not isinstance(child, Comment))
+
+    @textContent.setter
+    def textContent(self, text) -> None:
+        for child in list(self.children):
+            if isinstance(child, Element):
+                child.remove()
+        self.children = [str(text)] if str(text) else []
+
+    def cloneNode(self) -> "Element":
+        """Deep copy of the element, not attached to any document."""
+        return Element(self.tag, self.attributes,
+                       [child.cloneNode() if isinstance(child, Element) else child
+                        for child in self.children])
+
+    def iter(self):
+        """Yield this element and all elements below it in document order."""
+        yield self
+        for child in self.children:
+            if isinstance(child, Element):
+                yield from child.iter()
+
+    def innerHTML(self) -> str:
+        return "".join(serialize(child) for child in self.children)
+
+    def outerHTML(self) -> str:
+        attributes = "".join(f' {name}="{escapeAttribute(value)}"'
+                             for name, value in self.attributes.items())
+        return f"<{self.tag}{attributes}>{self.innerHTML()}</{self.tag}>"
+
+
+class Comment:
+    """Comment node of an svg document."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def cloneNode(self) -> "Comment":
+        return Comment(self.text)
+
+
+class Document:
+    """Root of an svg document with an index over all attribute values.
+
+    The index replaces the attribute selectors of the browser pipeline,
+    `select("num", "n5")` corresponds to document.querySelectorAll('[num="n5"]').
+    """
+
+    def __init__(self, root: Element):
+        self.root = root
+        self._index = {}
+        self.attach(root)
+
+    def attach(self, element: Element) -> None:
+        for el in element.iter():
+            el.document = self
+            for name in el.attributes:
+                self.index(el, name)
+
+    def detach(self, element: Element) -> None:
+        for el in element.iter():
+            for name in el.attributes:
+                self.unindex(el, name)
+            el.document = None
+
+    def index(self, element: Element, name: str) -> None:
+        self._index.setdefault((name, element.attributes[name]), {})[element] = None
+
+    def unindex(self, element: Element, name: str) -> None:
+        if name in element.attributes:
+            self._index.get((name, element.attributes[name]), {}).pop(element, None)
+
+    def select(self, name: str, value, tag: str = None) -> list:
+        """All elements with the attribute `name` set to `value`.
+
+        The elements are returned in the order they were added, for the
+        elements fornac creates this is the document order.
+        """
+        return [element for element in self._index.get((name, str(value)), ())
+                if tag is None or element.tag == tag]
+
+
+def escapeText(text: str) -> str:
+    return text.replace("&", "&amp;").replace("\u00a0", "&nbsp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def escapeAttribute(value: str) -> str:
+    return value.replace("&", "&amp;").replace("\u00a0", "&nbsp;").replace('"', "&quot;")
+
+
+def serialize(node) -> str:
+    """Serialize a node like the browser serializes innerHTML."""
+    if isinstance(node, str):
+        return escapeText(node)
+    if isinstance(node, Comment):
+        return f"<!--{node.text}-->"
+    return node.outerHTML()
+
+
+def jsNumber(value) -> str:
+    """Format a number like javascript converts it into a string.
+
+    Examples:
+        >>> jsNumber(100.0), jsNumber(0.1), jsNumber(1.5e-07)
+        ('100', '0.1', '1.5e-7')
+    """
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    if value == int(value) and abs(value) < 1e21:
+        return str(int(value))
+    text = repr(value)
+    if "e" not in text:
+        return text
+    if 1e-6 <= abs(value) < 1e21:
+        # python switches to the exponent notation earlier than javascript
+        return format(Decimal(text), "f")
+    mantissa, exponent = text.split("e")
+    return f"{mantissa}e{'+' if int(exponent) > 0 else '-'}{abs(int(exponent))}"
+
+
+def translate(x, y) -> str:
+    return f"translate({jsNumber(x)},{jsNumber(y)})"
+
+
+# -----------------------------------------------------------------
+# counterpart of buildMolecules
+
+def arrowPath(x, y, prev_x, prev_y):
+    """Path of the direction arrow of a nucleotide, None if it has no direction."""
+    direction = [-(x - prev_x), -(y - prev_y)]
+    if direction[0] == 0 and direction[1] == 0:
+        return None
+    length = math.sqrt(direction[0] * direction[0] + direction[1] * direction[1])
+    l = [direction[0] / length, direction[1] / length]
+    c = [-l[1], l[0]]
+    radius = NODE_RADIUS + NODE_STROKE_WIDTH / 2
+    f = [radius * l[0], radius * l[1]]
+    a, u = ARROW_SIZE, ARROW_WIDTH
+    return ("M" + jsNumber(f[0] + a * (l[0] / 2 + c[0] * u / 2)) + "," +
+            jsNumber(f[1] + a * (l[1] / 2 + c[1] * u / 2)) +
+            "L" + jsNumber(f[0]) + "," + jsNumber(f[1]) +
+            "L" + jsNumber(f[0] + a * (l[0] / 2 - c[0] * u / 2)) + "," +
+            jsNumber(f[1] + a * (l[1] / 2 - c[1] * u / 2)))
+
+
+def parseSvgNumber(text: str) -> float:
+    """Read a number like chromium parses the numbers of an svg transform.
+
+    Chromium sums up the digits in 32 bit floats, the result is not
+    always the 32 bit float closest to the number.
+    """
+    f32 = np.float32
+    sign = f32(-1) if text.startswith("-") else f32(1)
+    integer_part, decimal_part, exponent = re.fullmatch(r"[+-]?(\d*)(?:\.(\d+))?(?:e([+-]?\d+))?",
+                                                        text).groups()
+    integer, multiplier = f32(0), f32(1)
+    for digit in reversed(integer_part):
+        integer = integer + multiplier * f32(int(digit))
+        multiplier = multiplier * f32(10)
+    decimal, fraction = f32(0), f32(1)
+    for digit in decimal_part or "":
+        fraction = fraction * f32(0.1)
+        decimal = decimal + f32(int(digit)) * fraction
+    number = (integer + decimal) * sign
+    if exponent is not None and int(exponent) != 0:
+        number = number * f32(10.0 ** int(exponent))
+    return float(number)
+
+
+def plotTransform(view) -> str:
+    """Transform of the fornac-plot group.
+
+    fornac sets the transform through a d3 transition, which reads the
+    numbers back from the svg transform chromium has parsed.
+    """
+    x, y, scale = (parseSvgNumber(jsNumber(value)) for value in view)
+    transform = ""
+    if x != 0 or y != 0:
+        transform += translate(x, y)
+    if scale != 1:
+        transform += f"scale({jsNumber(scale)},{jsNumber(scale)})"
+    return transform
+
+
+def link(link_type, start, end, source, target) -> Element:
+    """A rendered link between two nodes."""
+    return Element("line", {"class": "link fornac-link",
+                            "x1": jsNumber(source[0]), "y1": jsNumber(source[1]),
+                            "x2": jsNumber(target[0]), "y2": jsNumber(target[1]),
+                            "link_type": link_type,
+                            "pointer-events": "all",
+                            "start": start,
+                            "end": end},
+                   [Element("title")])
+
+
+# logged once per call of rna_to_img.py (a single input or a whole batch)
+# if the python engine renders an input that asks for the forcefield
+FORCEFIELD_WARNING = "The python engine has no forcefield, the structure is drawn without it"
+# entries of computeLayout holding numpy arrays
+LAYOUT_ARRAYS = ["positions", "labels"]
+
+
+def encodeLayout(layout: dict) -> bytes:
+    """json of a layout returned by `computeLayout`, for the layout cache.
+
+    Unlike pickle, reading an entry of a cache directory shared with
+    others can not execute code. Floats keep their exact value in json.
+    """
+    encoded = {key: value.tolist() if key in LAYOUT_ARRAYS else value
+               for key, value in layout.items()}
+    encoded["middle"] = [{key: float(value) if key in ("x", "y") else value
+                          for key, value in node.items()} for node in layout["middle"]]
+    encoded["view"] = [float(value) for value in layout["view"]]
+    return json.dumps(encoded).encode()
+
+
+def decodeLayout(data: bytes) -> dict:
+    """Restore a layout encoded by `encodeLayout`."""
+    layout = json.loads(data)
+    for key in LAYOUT_ARRAYS:
+        layout[key] = np.array(layout[key], dtype=float).reshape(-1, 2)
+    return layout
+
+
+def cachedLayout(v) -> dict:
+    """`computeLayout` of the structure, taken from the layout cache if enabled.
+
+    The layout only depends on the structure (and the code of fornac_layout.py),
+    highlighting, coloring, labels and accessibility are applied later.
+    """
+    cache = openCache(v)
+    if cache is None:
+        return computeLayout(v["structure"])
+
+    key = cache.key("fornac layout json", fileDigest(fornac_layout.__file__), v["structure"])
+    data = cache.get(key)
+    if data is not None:
+        try:
+            return decodeLayout(data)
+        except (ValueError, KeyError, TypeError) as e:
+            logging.warning(f"layout cache entry {key} is invalid and computed again: {e}")
+    layout = computeLayout(v["structure"])
+    cache.put(key, encodeLayout(layout))
+    return layout
+
+
+def buildMolecules(v) -> Document:
+    """Build the svg elements fornac creates for a structure.
+
+    Counterpart of rna_to_img.buildMolecules with the forcefield disabled.
+    Links already carry the "start" and "end" attributes `setLinksId` sets.
+
+    Args:
+        v (dict): Validated input as returned by `validate`.
+
+    Returns:
+        Document: The svg, its root element is the fornac-plot group.
+    """
+    for var in ["structure", "sequence"]:
+        assert var in v
+    layout = cachedLayout(v)
+    sequence, _ = removeBreaks(v["sequence"])
+    pairtable, breaks = layout["pairtable"], layout["breaks"]
+    positions = layout["positions"].tolist()
+    labels = layout["labels"].tolist()
+    n = pairtable[0]
+
+    # -------------------------------------------------------------
+    # links
+    links = Element("g", {"class": "fornac-links"})
+    for f in range(1, n + 1):
+        if pairtable[f] != 0:
+            links.append(link("basepair", f, pairtable[f], positions[f-1], positions[pairtable[f]-1]))
+        if f > 1 and f - 1 not in breaks and f - 2 not in breaks and f - 3 not in breaks:
+            links.append(link("backbone", f - 1, f, positions[f-2], positions[f-1]))
+    linked = [f > 1 and f - 1 not in breaks and f - 2 not in breaks and f - 3 not in breaks
+              for f in range(1, n + 1)]
+    for i, j in layout["pseudoknots"]:
+        links.append(link("pseudoknot", i, j, positions[i-1], positions[j-1]))
+    # fornac only adds the labels that display an index to the svg
+    shown_labels = getLabelPositions(v)
+    for k in shown_labels:
+        links.append(link("label_link", k, 1, positions[k-1], labels[k-1]))
+
+    # -------------------------------------------------------------
+    # nodes
+    nodes = Element("g", {"class": "fornac-nodes"})
+    # the two nucleotides behind a break are hidden by fornac
+    hidden = {b for b in breaks} | {b + 1 for b in breaks}
+    for k in range(1, n + 1):
+        x, y = positions[k-1]
+        gnode = Element("g", {"class": "gnode", "struct_name": "empty",
+                              "transform": translate(x, y),
+                              "num": f"n{k}", "rnum": f"n{n - k + 1}"})
+        if k - 1 in hidden:
+            gnode.append(Element("text", {"class": "fornac-nodeLabel", "label_type": "middle"},
+                                 [Element("title", {}, [f"empty:{k}"])]))
+            nodes.append(gnode)
+            continue
+
+        arrow = Element("path", {"class": "fornac-directionArrow", "node_num": k})
+        if k > 1 and linked[k-1]:
+            d = arrowPath(x, y, *positions[k-2])
+            if d is not None:
+                arrow.setAttribute("d", d)
+        fill = LOOP_COLORS.get(layout["types"][k-1], "lightgreen")
+        gnode.append(arrow)
+        gnode.append(Element("circle", {"class": "fornac-node", "node_type": "nucleotide",
+                                        "node_num": k, "r": NODE_RADIUS,
+                                        "style": f"fill: {fill};"},
+                             [Element("title", {}, [f"empty:{k}"])]))
+        gnode.append(Element("text", {"class": "fornac-nodeLabel", "label_type": "nucleotide"},
+                             [sequence[k-1], Element("title", {}, [f"empty:{k}"])]))
+        nodes.append(gnode)
+
+    for k in shown_labels:
+        x, y = labels[k-1]
+        nodes.append(Element("g", {"class": "gnode", "struct_name": "empty",
+                                   "transform": translate(x, y),
+                                   "num": "n-1", "rnum": f"n{n + 2}"},
+                             [Element("circle", {"class": "fornac-node", "r": LABEL_RADIUS,
+                                                 "node_type": "label", "node_num": -1}),
+                              Element("text", {"class": "fornac-nodeLabel", "label_type": "label"},
+                                      [str(k)])]))
+
+    for node in layout["middle"]:
+        nodes.append(Element("g", {"class": "gnode",
+                                   "transform": translate(node["x"], node["y"]),
+                                   "num": f"n{node['num']}", "rnum": f"n{n - node['num'] + 1}"},
+                             [Element("text", {"class": "fornac-nodeLabel", "label_type": "middle"},
+                                      [Element("title")])]))
+
+    plot = Element("g", {"class": "fornac-plot", "transform": plotTransform(layout["view"])},
+                   [links, nodes])
+    return Document(plot)
+
+
+# -----------------------------------------------------------------
+# counterparts of the edits in modifications.EDITS, applied by applyEditPlan
+
+def setLinksId(doc: Document, _) -> None:
+    # the links are built with their start and end attributes
+    pass
+
+
+def setLabelsId(doc: Document, arg) -> None:
+    labels, length = arg
+    for index, label in enumerate(doc.select("num", "n-1", "g")):
+        pos = labels[index] if index < len(labels) else length + 1 + index - len(labels)
+        label.setAttribute("label_gnum", pos)
+        label.firstChild().setAttribute("label_num", pos)
+
+
+def removeLabel(doc: Document, index) -> None:
+    for label in doc.select("label_gnum", index):
+        label.remove()
+
+
+def indexElements(doc: Document, _) -> None:
+    # the document keeps an index of all attributes (see `Document.select`)
+    pass
+
+
+def removeLink(doc: Document, link_ids) -> None:
+    start, end = link_ids
+    for line in doc.select("start", start, "line"):
+        if line.getAttribute("link_type") == "backbone" and line.getAttribute("end") == end:
+            line.remove()
+
+
+def removeArrow(doc: Document, node_id) -> None:
+    for node in doc.select("num", f"n{node_id}"):
+        node.firstChild().remove()
+
+
+def removeNode(doc: Document, node_id) -> None:
+    for node in doc.select("num", f"n{node_id}"):
+        node.remove()
+
+
+def removeSecondLink(doc: Document, _) -> None:
+    for line in doc.select("link_type", "basepair"):
+        if int(line.getAttribute("start")) > int(line.getAttribute("end")):
+            line.remove()
+
+
+def changeBackgroundColor(doc: Document, coloring) -> None:
+    for node, color in zip(doc.select("r", "5"), coloring):
+        node.setAttribute("style", f"fill: {color};")
+
+
+def updateNodeToolTips(doc: Document, index_dict) -> None:
+    for key, (seq, num) in index_dict.items():
+        for node in doc.select("node_num", key, "circle"):
+            node.firstChild().textContent = f"{seq}[{num}]"
+
+
+def updateLinkTooltips(doc: Document, updated_indicies) -> None:
+    for line in doc.root.iter():
+        if line.tag != "line":
+            continue
+        start = updated_indicies.get(line.getAttribute("start"), "undefined")
+        end = updated_indicies.get(line.getAttribute("end"), "undefined")
+        if line.getAttribute("link_type") == "label_link":
+            line.firstChild().textContent = start
+        else:
+            line.firstChild().textContent = f"{start}-{end}"
+
+
+def setLabelTexts(doc: Document, indexing) -> None:
+    for label, value in zip(doc.select("label_type", "label"), indexing):
+        label.textContent = value
+
+
+def colorLabelRed(doc: Document, target_index) -> None:
+    for label in doc.select("label_num", target_index):
+        label.setAttribute("style", "stroke: red;stroke-width: 0.8;")
+
+
+def addStyleToNodes(doc: Document, arg) -> None:
+    node_ids, style = arg
+    for node_id in node_ids:
+        for node in doc.select("node_num", node_id, "circle"):
+            node.setAttribute("style", node.getAttribute("style") + style)
+
+
+def highlightingBasepairs(doc: Document, split) -> None:
+    for line in doc.select("link_type", "basepair"):
+        start, end = int(line.getAttribute("start")), int(line.getAttribute("end"))
+        # if not intermolecular basepair, ignore
+        if not (start < split and end > split):
+            continue
+        for node_num in (start, end):
+            node = doc.select("node_num", node_num, "circle")[0]
+            node.setAttribute("style", node.getAttribute("style") + "stroke: red;")
+
+
+def addNodeCircle(doc: Document, arg) -> None:
+    node_id, attributes = arg
+    position = []
+    for node in doc.select("num", f"n{node_id}", "g"):
+        position += NUMBER_REGEX.findall(node.getAttribute("transform"))
+    doc.root.prepend(Element("circle", {"cx": position[0], "cy": position[1], **attributes}))
+
+
+def polyline(doc: Document, arg) -> None:
+    indicies, style = arg
+    points = ""
+    for index in indicies:
+        for node in doc.select("num", f"n{index}", "g"):
+            match = NUMBER_REGEX.findall(node.getAttribute("transform"))
+            points += f"{match[0]},{match[1]} "
+    doc.root.prepend(Element("polyline", {"points": points, "style": style}))
+
+
+def visualiseBasepairStength(doc: Document, sequence_dict) -> None:
+    for line in doc.select("link_type", "basepair"):
+        l1 = sequence_dict.get(line.getAttribute("start"))
+        l2 = sequence_dict.get(line.getAttribute("end"))
+        if (l1, l2) in [("G", "U"), ("U", "G")]:
+            line.setAttribute("stroke-dasharray", "1,1")
+
+
+def addAccessibilityOverlay(doc: Document, arg) -> None:
+    index, style, tooltip = arg
+    for node in doc.select("node_num", index, "circle"):
+        overlay_node = node.cloneNode()
+        overlay_node.setAttribute("node_num", f"o{index}")
+        overlay_node.setAttribute("style", style)
+        title = overlay_node.firstChild()
+        title.textContent = title.textContent + tooltip
+        node.after(overlay_node)
+
+
+def setAttributeForElements(doc: Document, arg) -> None:
+    target_attr, target_value, set_attr, set_value = arg
+    for element in doc.select(target_attr, target_value):
+        element.setAttribute(set_attr, set_value)
+
+
+EDIT_HANDLERS = {name: globals()[name] for name in EDITS}
+
+
+def applyEditPlan(doc: Document, plan: EditPlan) -> None:
+    """Apply the edits of a plan to a document, counterpart of `EditPlan.apply`."""
+    for name, arg in plan.edits:
+        EDIT_HANDLERS[name](doc, arg)
+
+
+# -----------------------------------------------------------------
+# counterparts of extractImages and buildLegend
+
+def extractImage(root: Element, viewbox) -> bytes:
+    # imported here, rna_to_img imports this module only when it is used
+    from rna_to_img import svg_template
+    final_svg = svg_template.replace("SVG_PLACEHOLDER", root.innerHTML())
+    return final_svg.replace("VIEWBOX", viewbox).encode()
+
+
+def parseSvg(source: str) -> Element:
+    """Parse svg code into an `Element`, keeping comments and whitespace."""
+    parser = ET.XMLParser(target=ET.TreeBuilder(insert_comments=True))
+    tree = ET.fromstring(source, parser=parser)
+
+    def convert(node) -> Element:
+        element = Element(node.tag.split("}")[-1], node.attrib)
+        if node.text:
+            element.append(node.text)
+        for child in node:
+            if child.tag is ET.Comment:
+                element.append(Comment(child.text))
+            else:
+                element.append(convert(child))
+            if child.tail:
+                element.append(child.tail)
+        return element
+
+    return convert(tree)
+
+
+def buildLegend(v) -> bytes:
+    """Build the legend svg from legende.html, used by rna_to_img.buildLegend."""
+    for var in ["molecules", "accessibility1", "accessibility2"]:
+        assert var in v
+    html = template_legende_html.read_text()
+    svg = Document(parseSvg(html[html.index("<svg"):html.index("</svg>") + len("</svg>")]))
+
+    applyEditPlan(svg, planLegend(v))
+
+    return extractImage(svg.root, '"0 0 560 200"')
+
+
+def render(v) -> dict:
+    """Render one validated input without a browser.
+
+    Produces the same svg as rna_to_img.render with the forcefield
+    disabled, the caller logs `FORCEFIELD_WARNING` if the input asks
+    for it. Only svg output is supported.
+
+    Args:
+        v (dict): Validated input as returned by `validate`.
+
+    Returns:
+        dict: {"image": bytes, "legend": bytes or None}
+    """
+    for var in ["output_type", "legend", "forcefield"]:
+        assert var in v
+    if v["output_type"] != "svg":
+        raise ValueError("The python engine only creates svg images")
+
+    doc = buildMolecules(v)
+    applyEditPlan(doc, planModifications(v))
+
+    svg = Element("svg", {}, [doc.root])
+    # imported here, rna_to_img imports this module only when it is used
+    from rna_to_img import buildLegend as buildLegendOnce
+    legend = buildLegendOnce(None, v) if v["legend"] else None
+    return {"image": extractImage(svg, '"0 0 300 300"'), "legend": legend}
@@ -1,8 +1,12 @@
 import subprocess
 import re
 import logging
+import gzip
+from array import array
+from collections.abc import Mapping
 from pathlib import Path
 import os
+import tempfile
 
 
 
@@ -11,69 +15,35 @@ project_dir = Path(__file__).resolve().parent.parent.absolute()
 working_dir = Path(os.getcwd())
 # get the path to fornac.css and template_barebone.html
 fornac_css = project_dir / "fornac" / "fornac.css"
+fornac_js = project_dir / "fornac" / "fornac.js"
 template_barebone_html = project_dir / "example_html" / "template_barebone.html"
 template_legende_html = project_dir / "example_html" / "legende.html"
 example_fasta = project_dir / "test" / "example.fasta"
-dot_ps = working_dir / "dot.ps"
-plfold_lunp = working_dir / "plfold_lunp"
+# files RNAfold -p and RNAplfold write into their working directory,
+# a scratch directory of the call (see scratchDirectory)
+dot_ps = "dot.ps"
+plfold_lunp = "plfold_lunp"
+# default unix socket of the render daemon, in a directory only the current
+# user can access: the runtime directory of the user or a directory of its
+# own in the temp directory (see render_daemon.prepareSocket)
+render_socket = Path(os.environ.get("XDG_RUNTIME_DIR") or
+                     Path(tempfile.gettempdir()) / f"varri-{os.getuid()}") / "varri_render.sock"
 # set the path and create the name of the new file without the file type
 
 
 # --------------------------------------------------------------
 
-def listIntermolNodes(struc: str, shift: int = 0) -> list[tuple[int, str]]:
-    """Identify intermolecular basepair positions in a structure string.
+def scratchDirectory():
+    """Temporary directory for the files of one RNAfold or RNAplfold call.
 
-    Analyzes a dot-bracket structure (without pseudoknots) and returns
-    positions involved in intermolecular basepairs. Unmatched opening
-    or closing brackets are considered intermolecular.
-
-    Supports multiple bracket types independently: (), [], {}, <>.
+    Calls running at the same time, in this or another process,
+    do not overwrite each others files. The directory and the
+    files are removed when the context manager exits.
+    """
+    return tempfile.TemporaryDirectory(prefix="varri_")
 
-    Args:
-        struc (str): Structure string in dot-bracket notation.
-        shift (int, optional): Offset added to each index. Defaults to 0.
 
-    Returns:
-        list[tuple[int, str]]: Sorted list of (index, bracket) pairs,
-        where index is 1-based and includes the applied shift.
-
-    For the following example Structures, the intermolecular basepairs are indicated with carets (^):s
-    eg (())...((...(())  and (())...))...(())
-    eg ((..(..)) and ((..)..))
-       ^                     ^
-
-    eg ((((...))... and ...))..
-       ^^                  ^^
-    eg ((<<...))... and ...>>..
-         ^^                ^^
-    """
-    inter_basepairs = []
-    open_basepairs = {"(": [], "<": [], "[": [], "{": []}
-    basepairs = [("(",")"), ("[","]"), ("{", "}"), ("<",">")]
-    for index, char in enumerate(struc, 1):
-        for (open, close) in basepairs:
-            # check for open basepair, add to stack
-            if char == open:
-                open_basepairs[open] += [(index+shift, char)]
-                break               
-            # check for close basepair, remove from stack
-            # if stack empty, it is an intermolecular basepair
-            if char == close:
-                if open_basepairs[open]:
-                    open_basepairs[open].pop()
-                else:
-                    inter_basepairs += [(index+shift, char)]
-                break
-
-    # all remaining open basepairs in the stack are intermolecular
-    for pairs in open_basepairs.values():
-        inter_basepairs += pairs
-
-    inter_basepairs.sort()
-    return inter_basepairs
-
-def runCommand(command: str, expected_output: str) -> str:
+def runCommand(command: str, expected_output: str, cwd=None) -> str:
     """Execute a shell command and extract expected output via regex.
 
     Runs the given command in a subprocess, captures stdout, and searches
@@ -84,6 +54,8 @@ def runCommand(command: str, expected_output: str) -> str:
         command (str): Shell command to execute.
         expected_output (str): Regular expression with a capturing group
             to extract the desired output.
+        cwd (optional): Working directory of the command, eg. a
+            `scratchDirectory`. Defaults to the current directory.
 
     Returns:
         str: The matched group from the command output.
@@ -94,7 +66,7 @@ def runCommand(command: str, expected_output: str) -> str:
     """
     # expected output must be inside a group
     logging.info("------------- Systemcall -------------\n" +  command)
-    result = subprocess.run(command, capture_output=True, text=True, shell=True)
+    result = subprocess.run(command, capture_output=True, text=True, shell=True, cwd=cwd)
     std_out = result.stdout.strip()
     std_err = result.stderr
     if std_err:
@@ -117,17 +89,109 @@ def runCommand(command: str, expected_output: str) -> str:
                          f"{std_out}")
 
 
-def parseLunpFile(path, shift):
-    probabillity = {}
-    try:
-        with open(path, "r") as f:
-            for match in re.findall("\d+\t.+", f.read()):
-                id_str, prb_str = match.split("\t")
-                id, prb =  int(id_str) + shift, float(prb_str)
-                probabillity[id] = prb
-    except FileNotFoundError:
-        raise FileNotFoundError
-    except ValueError:
-        raise ValueError("The given lunp file has an invalid line. "
-                         f"cannot convert to float: {prb_str}")
-    return probabillity
\ No newline at end of file
+class LunpData(Mapping):
+    """Probabilities of a lunp file, viewed as a dict of node index to probability.
+
+    The probabilities are kept in an array of doubles, the probability
+    of nucleotide i at index i-1. Nucleotides without a probability
+    (missing or "NA" in the file) are nan and not part of the view.
+    """
+
+    def __init__(self, probabilities: array, shift: int = 0):
+        self.probabilities = probabilities
+        self.shift = shift
+
+    def __getitem__(self, index):
+        position = index - self.shift - 1
+        if 0 <= position < len(self.probabilities):
+            prb = self.probabilities[position]
+            # nan != nan
+            if prb == prb:
+                return prb
+        raise KeyError(index)
+
+    def __iter__(self):
+        for position, prb in enumerate(self.probabilities):
+            # nan != nan
+            if prb == prb:
+                yield position + self.shift + 1
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class AccessData(Mapping):
+    """Probabilities of both molecules, viewed as one dict of node index to probability.
+
+    Combines the Mappings of the molecules (eg. `LunpData`) without
+    copying their probabilities into a dict. The node indices of the
+    molecules do not overlap.
+    """
+
+    def __init__(self, parts=()):
+        self.parts = list(parts)
+
+    def __getitem__(self, index):
+        for part in self.parts:
+            if index in part:
+                return part[index]
+        raise KeyError(index)
+
+    def __iter__(self):
+        for part in self.parts:
+            yield from part
+
+    def __len__(self):
+        return sum(len(part) for part in self.parts)
+
+
+def openLunpFile(path):
+    """Open a lunp file as text, gzip compressed files are decompressed."""
+    with open(path, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    return gzip.open(path, "rt") if compressed else open(path, "r")
+
+
+def parseLunpFile(path, shift, column: int = 1) -> LunpData:
+    """Read the unpaired probabilities of a lunp file line by line.
+
+    Every line of a lunp file starts with the index of a nucleotide,
+    followed by one column per length u of the unpaired region ending
+    there (RNAplfold -u). Lines starting with # are comments.
+
+    Args:
+        path: Path to the lunp file, optionally gzip compressed.
+        shift (int): Offset added to every index.
+        column (int, optional): Column of the probabilities, the length u.
+            Defaults to 1, the probability of the nucleotide itself.
+
+    Returns:
+        LunpData: The probabilities by shifted index.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If a line has no valid index or probability.
+    """
+    values = array("d")
+    with openLunpFile(path) as f:
+        for line in f:
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            fields = line.split()
+            if len(fields) <= column:
+                raise ValueError("The given lunp file has an invalid line. "
+                                 f"there is no column {column}: {line.strip()}")
+            id_str, prb_str = fields[0], fields[column]
+            try:
+                position = int(id_str) - 1
+                prb = float("nan") if prb_str == "NA" else float(prb_str)
+            except ValueError:
+                raise ValueError("The given lunp file has an invalid line. "
+                                 f"cannot convert to float: {prb_str}")
+            if position < 0:
+                raise ValueError(f"The given lunp file has an invalid index: {id_str}")
+            if position >= len(values):
+                # nucleotides missing in the file have no probability
+                values.extend([float("nan")] * (position + 1 - len(values)))
+            values[position] = prb
+    return LunpData(values, shift)
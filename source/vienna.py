@@ -0,0 +1,322 @@
+import argparse
+import atexit
+import logging
+import queue
+import re
+import shlex
+import shutil
+import subprocess
+import threading
+from functools import lru_cache
+
+try:
+    import RNA
+except ImportError:
+    # the python module of ViennaRNA is optional, without it
+    # RNAfold and RNAplfold are called as programs (see utils.runCommand)
+    RNA = None
+
+# every probability of the lunp file RNAplfold writes has this precision
+LUNP_PRECISION = "{:.7g}"
+
+# RNAfold only lists basepairs above this probability in its dot plot
+DOT_PLOT_CUTOFF = 1e-5
+
+# idle RNAfold co-processes by their parameters (see FoldProcess)
+fold_processes = {}
+fold_processes_lock = threading.Lock()
+# seconds a FoldProcess waits for the structure of a record
+FOLD_TIMEOUT = 600
+# seconds a FoldProcess may take to exit, before it is killed
+CLOSE_TIMEOUT = 5
+
+
+def viennaAvailable() -> bool:
+    """True if the python module of ViennaRNA can be used."""
+    return RNA is not None
+
+
+@lru_cache
+def viennaVersion() -> str:
+    """Version of ViennaRNA, of the python module or else of RNAplfold.
+
+    Part of the keys of cached predictions, a new version may predict
+    different probabilities.
+    """
+    if viennaAvailable():
+        return f"RNA {RNA.__version__}"
+    try:
+        result = subprocess.run(["RNAplfold", "--version"], capture_output=True, text=True)
+    except OSError:
+        return "unknown"
+    return result.stdout.strip()
+
+
+def parseParameters(parameters: str):
+    """Translate RNAfold/RNAplfold parameters into options of the python module.
+
+    Only the options below are known. Parameters with other options have
+    to be passed to the programs, in that case None is returned.
+
+    Args:
+        parameters (str): Parameters given with --RNAfold or --RNAplfold.
+
+    Returns:
+        argparse.Namespace or None: The parsed options.
+    """
+    parser = argparse.ArgumentParser(add_help=False, exit_on_error=False)
+    parser.add_argument("-T", "--temp", type=float)
+    parser.add_argument("-d", "--dangles", type=int)
+    parser.add_argument("--noLP", action="store_true")
+    parser.add_argument("--noGU", action="store_true")
+    parser.add_argument("-W", "--winsize", type=int)
+    parser.add_argument("-L", "--span", type=int)
+    try:
+        options, unknown = parser.parse_known_args(shlex.split(parameters))
+    except (argparse.ArgumentError, ValueError):
+        return None
+    if unknown:
+        logging.info(f"ViennaRNA options {unknown} are only known to the programs")
+        return None
+    return options
+
+
+def modelDetails(options):
+    """Energy model of a fold compound with the given options."""
+    md = RNA.md()
+    if options.temp is not None:
+        md.temperature = options.temp
+    if options.dangles is not None:
+        md.dangles = options.dangles
+    if options.noLP:
+        md.noLP = 1
+    if options.noGU:
+        md.noGU = 1
+    return md
+
+
+def foldConstrained(sequence: str, constraint: str, parameters: str):
+    """Minimum free energy structure of a sequence, like `RNAfold -C`.
+
+    Args:
+        sequence (str): RNA sequence.
+        constraint (str): Hard constraint in dot-bracket notation,
+            "x" marks nucleotides that have to stay unpaired.
+        parameters (str): Parameters given with --RNAfold.
+
+    Returns:
+        str or None: The structure in dot-bracket notation, None if the
+        python module is missing or the parameters are not supported.
+    """
+    options = parseParameters(parameters) if viennaAvailable() else None
+    if options is None:
+        return None
+    fc = RNA.fold_compound(sequence, modelDetails(options))
+    fc.hc_add_from_db(constraint, RNA.CONSTRAINT_DB_DEFAULT)
+    structure, mfe = fc.mfe()
+    logging.info(f"ViennaRNA mfe structure {structure} ({mfe:.2f} kcal/mol)")
+    return structure
+
+
+def unpairedProbabilities(sequence: str, parameters: str):
+    """Probability of every nucleotide to be unpaired, like `RNAplfold -u1`.
+
+    Without a window size in the parameters, the whole sequence is one window.
+
+    Args:
+        sequence (str): RNA sequence.
+        parameters (str): Parameters given with --RNAplfold.
+
+    Returns:
+        list[float] or None: The probability of nucleotide i at index i-1,
+        rounded like in the lunp file. None if the python module is missing
+        or the parameters are not supported.
+    """
+    options = parseParameters(parameters) if viennaAvailable() else None
+    if options is None:
+        return None
+    length = len(sequence)
+    md = modelDetails(options)
+    # RNAplfold shortens the window and span to the sequence length
+    md.window_size = min(options.winsize or length, length)
+    md.max_bp_span = min(options.span or md.window_size, md.window_size)
+
+    probabilities = [float("nan")] * length
+
+    def store(v, v_size, i, maxsize, what, data):
+        # v[u]: probability that the u nucleotides ending at i are unpaired
+        if what & RNA.PROBS_WINDOW_UP:
+            data[i - 1] = float(LUNP_PRECISION.format(v[1]))
+
+    fc = RNA.fold_compound(sequence, md, RNA.OPTION_WINDOW)
+    fc.probs_window(1, RNA.PROBS_WINDOW_UP, store, probabilities)
+    return probabilities
+
+
+def pairProbabilities(sequence: str, parameters: str):
+    """Probability of every nucleotide to be paired, like the dot plot of `RNAfold -p`.
+
+    Args:
+        sequence (str): RNA sequence.
+        parameters (str): Parameters given with --RNAfold.
+
+    Returns:
+        list[float] or None: The probability of nucleotide i at index i-1,
+        None if the python module is missing or the parameters are not supported.
+    """
+    options = parseParameters(parameters) if viennaAvailable() else None
+    if options is None:
+        return None
+    md = modelDetails(options)
+    fc = RNA.fold_compound(sequence, md)
+    # scale the partition function by the mfe, as RNAfold does
+    _, mfe = fc.mfe()
+    fc.exp_params_rescale(mfe)
+    fc.pf()
+
+    probabilities = [0.0] * len(sequence)
+    # 1-based matrix, only i < j is set
+    for i, row in enumerate(fc.bpp()):
+        for j, p in enumerate(row):
+            if i < j and p > DOT_PLOT_CUTOFF:
+                probabilities[i - 1] += p
+                probabilities[j - 1] += p
+    return probabilities
+
+
+class FoldProcess:
+    """RNAfold running in the background, predicting one record after another.
+
+    Every record (a fasta header, the sequence and the constraint) is
+    written to the stdin of the same RNAfold process, which answers
+    with the header, the sequence and the structure. The header tells
+    the answers apart. The energy parameters are loaded once, instead
+    of once per prediction.
+
+    With -C, RNAfold reads constraint lines until the next header, so
+    every record is followed by the header of the next one. The lines
+    RNAfold writes are collected by a thread, an answer that takes
+    longer than `timeout` seconds fails the prediction.
+    """
+
+    def __init__(self, parameters: str, timeout: float = None):
+        self.parameters = parameters
+        self.timeout = FOLD_TIMEOUT if timeout is None else timeout
+        self.process = subprocess.Popen(["RNAfold", "--noPS", "-C", *shlex.split(parameters)],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                        stderr=subprocess.DEVNULL, text=True, bufsize=1)
+        self.lines = queue.Queue()
+        threading.Thread(target=self.readLines, daemon=True).start()
+        self.records = 0
+
+    def readLines(self) -> None:
+        for line in self.process.stdout:
+            self.lines.put(line)
+        # RNAfold exited
+        self.lines.put(None)
+
+    def readLine(self) -> str:
+        try:
+            line = self.lines.get(timeout=self.timeout)
+        except queue.Empty:
+            raise ValueError(f"RNAfold co-process did not answer within {self.timeout} seconds")
+        if line is None:
+            raise ValueError("RNAfold co-process exited")
+        return line.rstrip("\n")
+
+    def write(self, text: str) -> None:
+        try:
+            self.process.stdin.write(text)
+            self.process.stdin.flush()
+        except OSError as e:
+            raise ValueError(f"RNAfold co-process failed: {e}")
+
+    def fold(self, sequence: str, constraint: str) -> str:
+        """The structure RNAfold predicts for a sequence and constraint.
+
+        Raises:
+            ValueError: If RNAfold exited, did not answer in time or
+                answered with another record.
+        """
+        self.records += 1
+        name = recordName(self.records)
+        # the header of the first record, the others were written with the record in front of them
+        header = f">{name}\n" if self.records == 1 else ""
+        self.write(f"{header}{sequence}\n{constraint}\n>{recordName(self.records + 1)}\n")
+        # lines in front of the header, eg. warnings, are skipped
+        header = self.readLine()
+        while not header.startswith(">"):
+            header = self.readLine()
+        if header != f">{name}":
+            raise ValueError(f"RNAfold co-process answered {header} to record {name}")
+        # the sequence, then the structure and its energy
+        line = self.readLine()
+        match = re.match(r"([\.()]+)\s", line)
+        while match is None:
+            if line.startswith(">"):
+                raise ValueError(f"RNAfold co-process answered record {name} without a structure")
+            line = self.readLine()
+            match = re.match(r"([\.()]+)\s", line)
+        return match.group(1)
+
+    def close(self) -> None:
+        try:
+            self.process.stdin.close()
+        except OSError:
+            # RNAfold already exited
+            pass
+        try:
+            self.process.wait(timeout=CLOSE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+def recordName(number: int) -> str:
+    """Fasta header of the record `number` of a FoldProcess."""
+    return f"varri_{number}"
+
+
+def foldCoprocess(sequence: str, constraint: str, parameters: str):
+    """Minimum free energy structure of a sequence, like `RNAfold -C`, by a FoldProcess.
+
+    The co-processes are kept until the program exits, a batch only
+    starts one RNAfold per thread predicting at the same time.
+
+    Args:
+        sequence (str): RNA sequence.
+        constraint (str): Hard constraint in dot-bracket notation.
+        parameters (str): Parameters given with --RNAfold.
+
+    Returns:
+        str or None: The structure in dot-bracket notation, None if RNAfold
+        is not installed, the parameters may change the output of RNAfold
+        or the co-process failed.
+    """
+    if shutil.which("RNAfold") is None or parseParameters(parameters) is None:
+        return None
+    with fold_processes_lock:
+        idle = fold_processes.setdefault(parameters, [])
+        process = idle.pop() if idle else None
+    try:
+        if process is None:
+            process = FoldProcess(parameters)
+        structure = process.fold(sequence, constraint)
+    except (OSError, ValueError) as e:
+        logging.warning(e)
+        if process is not None:
+            process.close()
+        return None
+    with fold_processes_lock:
+        fold_processes[parameters].append(process)
+    return structure
+
+
+@atexit.register
+def closeFoldProcesses() -> None:
+    """Stop all RNAfold co-processes."""
+    with fold_processes_lock:
+        for idle in fold_processes.values():
+            for process in idle:
+                process.close()
+        fold_processes.clear()
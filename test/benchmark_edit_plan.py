@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+# compares applying the modification plan of a large interaction with one
+# page.evaluate per edit (the round trips of the former pipeline) against
+# a single EditPlan.apply
+# usage: python3 test/benchmark_edit_plan.py [length of the interaction]
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir.parent / "source"))
+
+from playwright.sync_api import sync_playwright
+
+from conftest import ARGS
+from input_validation import validate
+from modifications import EditPlan, planModifications
+from rna_to_img import buildMolecules, openTemplatePage
+
+logging.basicConfig(level=logging.INFO,
+                        format="[{levelname}] {message}",
+                        style="{")
+
+
+def interaction(length: int) -> dict:
+    """Validated input of a random interaction with `length` nucleotides."""
+    random.seed(0)
+    len1 = length * 3 // 4
+    len2 = length - len1
+    # hairpins in both molecules and one intermolecular helix
+    hairpin = "((((....))))"
+    structure1 = hairpin * ((len1 - 40) // len(hairpin))
+    structure1 += "." * (len1 - 20 - len(structure1)) + "(" * 20
+    structure2 = ")" * 20 + hairpin * ((len2 - 20) // len(hairpin))
+    structure2 += "." * (len2 - len(structure2))
+    sequence1 = "".join(random.choice("ACGU") for _ in structure1)
+    sequence2 = "".join(random.choice("ACGU") for _ in structure2)
+
+    args = dict(ARGS, engine="browser")
+    args["structure"] = f"{structure1}&{structure2}"
+    args["sequence"] = f"{sequence1}&{sequence2}"
+    v = validate(args)
+    # random accessibilities instead of RNAplfold: one overlay per nucleotide
+    v["accessibility1"] = v["accessibility2"] = "benchmark"
+    v["access_data"] = {int(index): random.random() for index, n in v["sequence_dict"].items()
+                        if n != "."}
+    return v
+
+
+def applyPerEdit(page, plan: EditPlan) -> int:
+    """Apply every edit with its own page.evaluate, returns the round trips."""
+    for step in plan.edits:
+        single = EditPlan()
+        single.edits = [step]
+        single.apply(page)
+    return len(plan.edits)
+
+
+def applyPlan(page, plan: EditPlan) -> int:
+    plan.apply(page)
+    return 1
+
+
+if __name__ == '__main__':
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    v = interaction(length)
+    plan = planModifications(v)
+    logging.info(f"{length} nt, {len(plan.edits)} edits in the plan")
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        results = {}
+        for name, apply in [("one evaluate per edit", applyPerEdit),
+                            ("single edit plan", applyPlan)]:
+            page = openTemplatePage(browser)
+            buildMolecules(page, v)
+            start = time.perf_counter()
+            round_trips = apply(page, plan)
+            seconds = time.perf_counter() - start
+            results[name] = page.evaluate("() => document.querySelector('svg').outerHTML")
+            page.close()
+            logging.info(f"{name}: {round_trips} round trips, {seconds * 1000:.1f} ms")
+        browser.close()
+
+    if len(set(results.values())) != 1:
+        logging.error("the two ways of applying the plan created different svgs")
+        sys.exit(1)
@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+# compares the structure parsing of one render of a large interaction:
+# every consumer parsing the bracket string itself (the former pipeline)
+# against one pairTable shared by all consumers
+# usage: python3 test/benchmark_pair_table.py [lengths of the interactions]
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir.parent / "source"))
+
+from input_validation import (GAP, checkStructureInputSimple, cropBounds)
+from modifications import (getIntermolBasepairRegion, listIntermolPairs)
+from pair_table import pairTable
+
+logging.basicConfig(level=logging.INFO,
+                        format="[{levelname}] {message}",
+                        style="{")
+
+BRACKETS = [("(", ")"), ("[", "]"), ("{", "}"), ("<", ">")]
+# calls of getIntermolBasepairRegion in a render: the labels, the red
+# labels and the highlighted region
+REGION_CALLS = 3
+
+
+def interaction(length: int) -> tuple:
+    """Structures of a random interaction with `length` nucleotides."""
+    random.seed(0)
+    len1 = length * 3 // 4
+    len2 = length - len1
+    # nested hairpins of both bracket types and one intermolecular helix
+    hairpins = ["((((....))))", "<<<<....>>>>", "((<<....>>))"]
+
+    def hairpinsUpTo(length):
+        structure = ""
+        while len(structure) + 17 <= length:
+            structure += random.choice(hairpins) + "." * random.randint(0, 5)
+        return structure + "." * (length - len(structure))
+
+    structure1 = hairpinsUpTo(len1 - 20) + "(" * 20
+    structure2 = ")" * 20 + hairpinsUpTo(len2 - 20)
+    return structure1, structure2
+
+
+# -----------------------------------------------------------------
+# the former parsers, one per consumer
+
+def formerIntermolNodes(struc: str, shift: int = 0) -> list:
+    inter_basepairs = []
+    open_basepairs = {"(": [], "<": [], "[": [], "{": []}
+    for index, char in enumerate(struc, 1):
+        for (open, close) in BRACKETS:
+            if char == open:
+                open_basepairs[open] += [(index+shift, char)]
+                break
+            if char == close:
+                if open_basepairs[open]:
+                    open_basepairs[open].pop()
+                else:
+                    inter_basepairs += [(index+shift, char)]
+                break
+    for pairs in open_basepairs.values():
+        inter_basepairs += pairs
+    inter_basepairs.sort()
+    return inter_basepairs
+
+
+def formerBasePairs(structure: str) -> list:
+    basepair_list = []
+    basepairs = {"(": [], "<": [], "[": []}
+    closing_bp = {")": "(", ">": "<", "]": "["}
+    for index, char in enumerate(structure):
+        if char in basepairs:
+            basepairs[char] += [index]
+        if char in closing_bp:
+            open_bp = closing_bp[char]
+            if basepairs[open_bp]:
+                basepair_list += [(basepairs[open_bp].pop(), index)]
+    return sorted(basepair_list)
+
+
+def formerCheck(structure: str) -> None:
+    basepairs = {"(": 0, "<": 0, "[": 0}
+    closing_bp = {")": "(", ">": "<", "]": "["}
+    for char in structure:
+        if char in basepairs:
+            basepairs[char] += 1
+        if char in closing_bp:
+            basepairs[closing_bp[char]] -= 1
+            assert basepairs[closing_bp[char]] >= 0
+    assert not any(basepairs.values())
+
+
+def formerRegion(structure1: str, structure2: str) -> list:
+    region = []
+    for structure, shift in [(structure1, 0), (structure2, len(structure1) + GAP)]:
+        nodes = [index for index, _ in formerIntermolNodes(structure, shift)]
+        region += [(nodes[0], nodes[-1])]
+    return region
+
+
+def formerIntermolPairs(structure1: str, structure2: str) -> list:
+    shift = len(structure1) + GAP
+    intermol = {i: "." for i in range(1, shift + len(structure2) + 1)}
+    for index, bracket in formerIntermolNodes(structure1) + formerIntermolNodes(structure2, shift):
+        intermol[index] = bracket
+    basepairs = []
+    open_basepairs = {"(": [], "<": [], "[": [], "{": []}
+    for index, char in intermol.items():
+        for (open, close) in BRACKETS:
+            if char == open:
+                open_basepairs[open] += [index]
+                break
+            if char == close:
+                if open_basepairs[open]:
+                    basepairs += [(open_basepairs[open].pop(), index)]
+                break
+    basepairs.sort()
+    return basepairs
+
+
+def formerRender(structure1: str, structure2: str) -> tuple:
+    """Parses of the former pipeline, in the order of a cropped render."""
+    formerCheck(f"{structure1}&{structure2}")
+    # accessibility flank and cropping, both find the intermolecular region
+    for _ in range(2):
+        crop = [[i for i, _ in formerIntermolNodes(structure)] for structure in (structure1, structure2)]
+    pairs = [formerBasePairs(structure) for structure in (structure1, structure2)]
+    regions = [formerRegion(structure1, structure2) for _ in range(REGION_CALLS)]
+    return ([(nodes[0] - 1, nodes[-1] - 1) for nodes in crop], pairs, regions[0],
+            formerIntermolPairs(structure1, structure2))
+
+
+def pairTableRender(structure1: str, structure2: str) -> tuple:
+    """The same answers, derived from the shared pairTable."""
+    pairTable.cache_clear()
+    structure = f"{structure1}&{structure2}"
+    checkStructureInputSimple(structure)
+    table = pairTable(structure)
+    for _ in range(2):
+        bounds = [cropBounds(table, mol, 0) for mol in (1, 2)]
+    pairs = [table.pairs(mol) for mol in (1, 2)]
+    regions = [getIntermolBasepairRegion(structure1, structure2) for _ in range(REGION_CALLS)]
+    return (bounds, pairs, regions[0],
+            listIntermolPairs({"structure1": structure1, "structure2": structure2}))
+
+
+if __name__ == '__main__':
+    lengths = [int(length) for length in sys.argv[1:]] or [10000, 30000, 100000]
+    for length in lengths:
+        structure1, structure2 = interaction(length)
+        results = {}
+        for name, parse in [("one parse per consumer", formerRender),
+                            ("shared pair table", pairTableRender)]:
+            start = time.perf_counter()
+            results[name] = parse(structure1, structure2)
+            seconds = time.perf_counter() - start
+            logging.info(f"{length} nt, {name}: {seconds * 1000:.1f} ms")
+
+        former, shared = results.values()
+        if former != shared:
+            logging.error("the pair table and the former parsers found different basepairs")
+            sys.exit(1)
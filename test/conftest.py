@@ -0,0 +1,98 @@
+# shared fixtures of the pytest tests, run with: python3 -m pytest test
+import shlex
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+current_dir = Path(__file__).parent
+sys.path.insert(0, str(current_dir.parent / "source"))
+
+from rna_to_img import argumentParser
+from test_inputs import inputs
+
+# scripts that are run directly, not pytest tests
+collect_ignore = ["test_inputs.py", "benchmark_edit_plan.py", "benchmark_pair_table.py"]
+
+# default values of all command line options, as parsed by rna_to_img.py
+ARGS = {'structure': '', 'sequence': '', 'output': 'STDOUT', 'coloring': 'strand',
+        'highlighting': 'basepairs', 'startIndex1': '1', 'startIndex2': '1',
+        'labelInterval': '10', 'crop1': 'None', 'crop2': 'None', 'crop': 'None',
+        'highlightSubseq1': '', 'highlightSubseq2': '', 'guBasepairs': True,
+        'backgroundhighlighting': 'basepairs', 'fastafile': 'None',
+        'fastaRecord1': 'None', 'fastaRecord2': 'None',
+        'predictStructure1': False, 'predictStructure2': False, 'legend': False,
+        'forcefield': '0', 'forcefieldTicks': 'None', 'accessibility1': 'None',
+        'accessibility2': 'None', 'accessibilityFlank': 'None', 'accessibilityStore': 'None',
+        'accessibilityColumn': '1',
+        'RNAfold': '', 'RNAplfold': '', 'engine': 'python', 'cache': 'None', 'batch': 'None',
+        'batchTop': 'None', 'concurrency': '1', 'workers': '1', 'daemon': 'None', 'verbose': False}
+
+
+@pytest.fixture
+def args():
+    """Default arguments, tests set the options they need."""
+    return dict(ARGS)
+
+
+@pytest.fixture
+def stub_bin(tmp_path, monkeypatch):
+    """Directory in front of PATH, to put stub programs (eg. RNAfold) into.
+
+    Call the fixture with the name and the python source of a program.
+    """
+    directory = tmp_path / "bin"
+    directory.mkdir()
+    monkeypatch.setenv("PATH", f"{directory}:{Path(sys.executable).parent}:/usr/bin:/bin")
+
+    def write(name: str, source: str) -> Path:
+        path = directory / name
+        path.write_text(f"#!{sys.executable}\n{source}")
+        path.chmod(0o755)
+        return path
+
+    return write
+
+
+def verifiedInputs() -> list:
+    """Arguments of the inputs of test_inputs.py, their images are in test/verified.
+
+    Inputs drawn with the timed forcefield are left out, their layout
+    depends on the load of the machine. Inputs calling RNAfold or
+    RNAplfold are only included if ViennaRNA is installed.
+
+    Returns:
+        list: A pytest.param per input, named like its image (eg. test3).
+    """
+    vienna = shutil.which("RNAfold") and shutil.which("RNAplfold")
+    selected = []
+    for index, command in enumerate(inputs):
+        command = command.replace("test/example.fasta", str(current_dir / "example.fasta"))
+        command = command.replace("TEST", str(current_dir / "images" / f"test{index}.svg"))
+        args = vars(argumentParser().parse_args(shlex.split(command)[1:]))
+        if args["forcefield"] != "0":
+            continue
+        if not vienna and (args["predictStructure1"] or args["predictStructure2"] or
+                           args["accessibility1"] != "None" or args["accessibility2"] != "None"):
+            continue
+        selected.append(pytest.param(args, id=f"test{index}"))
+    return selected
+
+
+def verifiedImage(args) -> bytes:
+    """The verified image of an input returned by `verifiedInputs`."""
+    return (current_dir / "verified" / Path(args["output"]).name).read_bytes()
+
+
+@pytest.fixture(scope="session")
+def browser():
+    """Headless chromium, the tests using it are skipped without one."""
+    sync_api = pytest.importorskip("playwright.sync_api")
+    with sync_api.sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except Exception as e:
+            pytest.skip(f"chromium could not be started: {e}")
+        yield browser
+        browser.close()
@@ -0,0 +1,73 @@
+import gzip
+import shutil
+import subprocess
+import sys
+
+import pytest
+from conftest import current_dir
+
+from access_store import AccessStore, STORE_INDEX, transcriptId, writeStore
+from input_validation import validate
+from utils import parseLunpFile
+
+LUNP = current_dir / "example.lunp"
+# column l=1 of example.lunp
+PROBABILITIES = [0.9, 0.8, 0.25, 0.1, 0.2, 0.3, 0.6, 0.7]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store of example.lunp and a gzip compressed copy, created by access_store.py."""
+    compressed = tmp_path / "second.lunp.gz"
+    with open(LUNP, "rb") as f, gzip.open(compressed, "wb") as g:
+        shutil.copyfileobj(f, g)
+    subprocess.run([sys.executable, str(current_dir.parent / "source" / "access_store.py"),
+                    str(tmp_path / "store"), str(LUNP), str(compressed)], check=True)
+    return tmp_path / "store"
+
+
+def test_index_round_trip(store, tmp_path):
+    assert (store / STORE_INDEX).read_text().splitlines()[1:] == \
+        ["example\t0\t8", "second\t8\t8"]
+    transcripts = AccessStore(store)
+    assert transcripts.index == {"example": (0, 8), "second": (8, 8)}
+
+    # writing the read transcripts again gives the same store
+    writeStore(tmp_path / "copy", ((transcript, transcripts.probabilities(transcript, 1, length))
+                                   for transcript, (_, length) in transcripts.index.items()))
+    for name in (STORE_INDEX, "probabilities.f64"):
+        assert (tmp_path / "copy" / name).read_bytes() == (store / name).read_bytes()
+
+
+def test_probabilities(store):
+    transcripts = AccessStore(store)
+    assert transcripts.probabilities("second", 1, 8).tolist() == PROBABILITIES
+    # positions outside of the transcript are left out
+    assert transcripts.probabilities("example", 7, 20).tolist() == PROBABILITIES[6:]
+    assert list(parseLunpFile(LUNP, 0).probabilities) == PROBABILITIES
+    with pytest.raises(ValueError, match="not in the accessibility store"):
+        transcripts.probabilities("missing", 1, 8)
+
+
+def test_molecule_start_indices(store):
+    transcripts = AccessStore(store)
+    # the molecule starts at position 3 of the transcript
+    assert transcripts.molecule("example", 3, 4, 10) == {11: 0.25, 12: 0.1, 13: 0.2, 14: 0.3}
+    # positions -2, -1, 1, 2, 3: there is no position 0 and no probability before it
+    assert transcripts.molecule("example", -2, 5, 0) == {3: 0.9, 4: 0.8, 5: 0.25}
+    # the molecule ends behind the transcript
+    assert transcripts.molecule("example", 7, 4, 0) == {1: 0.6, 2: 0.7}
+
+
+def test_transcript_id(tmp_path):
+    assert [transcriptId(tmp_path / name) for name in
+            ("t1.lunp", "t2.lunp.gz", "t3_lunp", "t4")] == ["t1", "t2", "t3", "t4"]
+
+
+def test_store_input(store, args):
+    args["structure"] = "(...)"
+    args["sequence"] = "GAAAC"
+    args["accessibilityStore"] = str(store)
+    args["accessibility1"] = "store:second"
+    args["startIndex1"] = "-2"
+    assert dict(validate(args)["access_data"]) == {3: 0.9, 4: 0.8, 5: 0.25}
@@ -0,0 +1,120 @@
+import pytest
+from conftest import current_dir
+
+import input_validation
+from input_validation import parseAccessibility, predictAccessibility, validate
+from utils import LunpData, parseLunpFile
+
+# stub of RNAplfold -u1: the probability of a nucleotide is the fraction
+# of G among its neighbours, written to plfold_lunp like RNAplfold does
+RNAPLFOLD = '''
+import sys
+if "--version" in sys.argv:
+    print("RNAplfold 2.6.4")
+    sys.exit()
+seq = sys.stdin.readline().strip()
+with open("plfold_lunp", "w") as f:
+    f.write("#unpaired probabilities\\n #i$\\tl=1\\n")
+    for i in range(len(seq)):
+        f.write(f"{i + 1}\\t{seq[max(0, i - 3):i + 4].count('G') / 7:.6g}\\n")
+'''
+
+
+@pytest.fixture
+def rnaplfold(stub_bin):
+    return stub_bin("RNAplfold", RNAPLFOLD)
+
+
+def test_accessibility_without_started_jobs(args, rnaplfold):
+    """parseAccessibility starts the RNAplfold jobs itself if none are given."""
+    args["structure"] = "..((((...&..))))..."
+    args["sequence"] = "GGACGAUCA&GAUCGGUCA"
+    args["accessibility1"] = "RNAplfold"
+    args["accessibility2"] = "RNAplfold"
+    v = validate(args)
+
+    access_data = parseAccessibility(v)
+    assert access_data == v["access_data"]
+    # both molecules, the second one behind the gap
+    assert min(access_data) == 1
+    assert max(access_data) == len("GGACGAUCA") + 3 + len("GAUCGGUCA")
+
+
+def test_invalid_option_starts_no_rnaplfold(args, monkeypatch):
+    """An invalid option fails before RNAplfold is started, not after it finished."""
+    def viennaJobs():
+        raise AssertionError("RNAplfold was started")
+    monkeypatch.setattr(input_validation, "viennaJobs", viennaJobs)
+    args["structure"] = "..((((...&..))))..."
+    args["sequence"] = "GGACGAUCA&GAUCGGUCA"
+    args["accessibility1"] = "RNAplfold"
+    args["output"] = "image.bmp"
+    with pytest.raises(ValueError, match="output file type"):
+        validate(args)
+
+
+def test_accessibility_with_crop_without_started_jobs(args, rnaplfold):
+    args["structure"] = "..((((...&..))))..."
+    args["sequence"] = "GGACGAUCA&GAUCGGUCA"
+    args["accessibility1"] = "RNAplfold"
+    args["accessibilityFlank"] = "2"
+    args["crop"] = "1"
+    v = validate(args)
+    # the cropped first molecule starts at the nucleotide in front of the region
+    assert v["offset1"] == 2
+    assert parseAccessibility(v)
+
+
+def test_chunks_fold_like_the_whole_sequence(rnaplfold, monkeypatch):
+    """Chunks folded with their neighbours give the probabilities of one run."""
+    # executors of this test only, their processes see the stub in PATH
+    monkeypatch.setattr(input_validation, "executors", {})
+    seq = "GGACGAUCAGAUCGGUCAUUGCAGGCAUCGAUGCAGUACGGAUC" * 5
+    try:
+        whole = predictAccessibility(seq, "-W10")
+        monkeypatch.setattr(input_validation, "PLFOLD_CHUNK", 40)
+        chunked = predictAccessibility(seq, "-W10")
+        assert "plfold" in input_validation.executors
+    finally:
+        input_validation.shutdownExecutors()
+    assert len(chunked) == len(seq)
+    assert chunked == whole
+
+
+def lunpInput(args, column="1"):
+    args["structure"] = "((....))"
+    args["sequence"] = "GGAAAACC"
+    args["accessibility1"] = str(current_dir / "example.lunp")
+    args["accessibilityColumn"] = column
+    return args
+
+
+def test_lunp_columns():
+    """The length u of the column, positions without a probability (NA) are left out."""
+    lunp = parseLunpFile(current_dir / "example.lunp", 10, column=3)
+    assert dict(lunp) == {13: 0.15, 14: 0.04, 15: 0.01, 16: 0.02, 17: 0.05, 18: 0.2}
+    assert 11 not in lunp and 19 not in lunp
+
+
+def test_lunp_dict_view():
+    """LunpData has the methods of a dict, eg. values() and items()."""
+    lunp = parseLunpFile(current_dir / "example.lunp", 10, column=3)
+    probabilities = [0.15, 0.04, 0.01, 0.02, 0.05, 0.2]
+    assert list(lunp.values()) == probabilities
+    assert dict(lunp.items()) == dict(zip(range(13, 19), probabilities))
+    assert lunp.get(11) is None and lunp.get(13) == 0.15
+
+
+def test_lunp_file_stays_lazy(args):
+    v = validate(lunpInput(args, column="2"))
+    # the probabilities are kept in the array of the lunp file
+    (lunp,) = v["access_data"].parts
+    assert isinstance(lunp, LunpData)
+    assert dict(v["access_data"]) == {2: 0.75, 3: 0.2, 4: 0.05, 5: 0.05, 6: 0.1, 7: 0.25, 8: 0.5}
+
+
+def test_invalid_lunp_column(args):
+    with pytest.raises(ValueError, match="accessibilityColumn"):
+        validate(lunpInput(args, column="0"))
+    with pytest.raises(ValueError, match="no column 4"):
+        validate(lunpInput(args, column="4"))
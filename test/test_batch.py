@@ -0,0 +1,115 @@
+import json
+
+from conftest import ARGS, current_dir
+
+import batch
+
+MANIFESTS = current_dir / "manifests"
+
+
+def writeJsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return path
+
+
+def test_failing_render_is_counted(args, tmp_path, monkeypatch):
+    """A record failing with any error is logged and counted, the others are rendered."""
+    manifest = writeJsonl(tmp_path / "manifest.jsonl", [
+        {"structure": "((...))", "sequence": "GGAAACC"},
+        {"structure": "((....))", "sequence": "GGAAAACC"},
+        {"structure": "((.....))", "sequence": "GGAAAAACC"},
+    ])
+    args.update(batch=str(manifest), output=str(tmp_path / "default.svg"))
+    render = batch.renderPython
+
+    def failSecond(v):
+        if v["sequence1"] == "GGAAAACC":
+            raise RuntimeError("render failed")
+        return render(v)
+
+    monkeypatch.setattr(batch, "renderPython", failSecond)
+    assert batch.runBatch(manifest, args) == 1
+    assert sorted(path.name for path in tmp_path.glob("*.svg")) == ["manifest_1.svg", "manifest_3.svg"]
+
+
+def test_forcefield_warning_once_per_batch(args, tmp_path, caplog):
+    manifest = writeJsonl(tmp_path / "manifest.jsonl", [
+        {"structure": "((...))", "sequence": "GGAAACC"},
+        {"structure": "((....))", "sequence": "GGAAAACC", "forcefield": "0"},
+        {"structure": "((.....))", "sequence": "GGAAAAACC"},
+    ])
+    args.update(batch=str(manifest), output=str(tmp_path / "default.svg"), forcefield="1")
+    assert batch.runBatch(manifest, args) == 0
+    warnings = [record for record in caplog.records if record.message == batch.FORCEFIELD_WARNING]
+    assert len(warnings) == 1
+
+
+def test_sharded_batch(args, tmp_path, monkeypatch):
+    """Workers render the records under names of their record number and count the failures."""
+    monkeypatch.setattr(batch, "SHARD_SIZE", 2)
+    records = [{"structure": "((" + "." * n + "))", "sequence": "GG" + "A" * n + "CC"}
+               for n in range(3, 8)]
+    # sequence and structure of different lengths
+    records[2]["sequence"] += "A"
+    manifest = writeJsonl(tmp_path / "manifest.jsonl", records)
+    args.update(batch=str(manifest), output=str(tmp_path / "default.svg"), workers="2")
+
+    assert batch.runBatch(manifest, args) == 1
+    assert sorted(path.name for path in tmp_path.glob("*.svg")) == \
+        ["manifest_1.svg", "manifest_2.svg", "manifest_4.svg", "manifest_5.svg"]
+    # the names do not depend on which worker rendered a record
+    single = tmp_path / "single"
+    single.mkdir()
+    args.update(output=str(single / "default.svg"), workers="1")
+    assert batch.runBatch(manifest, args) == 1
+    for path in single.glob("*.svg"):
+        assert (tmp_path / path.name).read_bytes() == path.read_bytes()
+
+
+def test_read_tsv():
+    """Empty cells are left out of the records."""
+    assert list(batch.readManifest(MANIFESTS / "interactions.tsv")) == [
+        {"structure": "((...))", "sequence": "GGAAACC", "output": "first.svg", "legend": "true"},
+        {"structure": "..((...))", "sequence": "AAGGAAACC"},
+    ]
+
+
+def test_read_jsonl():
+    records = list(batch.readManifest(MANIFESTS / "interactions.jsonl"))
+    assert records == [
+        {"structure": "((...))", "sequence": "GGAAACC", "legend": True},
+        {"structure": "5|||..&3|||..", "sequence": "NNNNNNNNNNNNN&NNNNNNN", "startIndex1": 5},
+    ]
+    args = batch.manifestArgs(records[1], dict(ARGS, batch="interactions.jsonl"), 2)
+    assert (args["startIndex1"], args["legend"]) == ("5", False)
+
+
+def test_records_are_not_written_to_stdout():
+    """The default output STDOUT is named like default, one file per record."""
+    defaults = dict(ARGS, batch="dir/interactions.jsonl")
+    outputs = [batch.manifestArgs({}, defaults, number)["output"] for number in (1, 2)]
+    assert outputs == ["interactions_1", "interactions_2"]
+    defaults["output"] = "results/STDOUT.png"
+    assert batch.manifestArgs({}, defaults, 3)["output"] == "results/interactions_3.png"
+
+
+def test_read_intarna_hybrid_dp():
+    """The columns are separated by ";", the interaction sites are taken from hybridDP."""
+    records = list(batch.readManifest(MANIFESTS / "intarna.csv"))
+    assert records[0] == {"fastaRecord1": "target1", "fastaRecord2": "sRNA1",
+                          "structure": "10||||&3||||"}
+    assert [record["structure"] for record in records[1:]] == \
+        ["20|||&4|||", "5||||&1||||", "30||||&2||||"]
+
+
+def test_read_intarna_hybrid_dp_full():
+    """The columns are separated by ",", the structure is taken from hybridDPfull."""
+    assert list(batch.readManifest(MANIFESTS / "intarna_full.csv")) == [
+        {"sequence": "AAGGCCAA&UUGGCCUU", "structure": "..((((..&..)))).."}]
+
+
+def test_batch_top():
+    """The interactions with the lowest energy of every query, the best one first."""
+    records = batch.readManifest(MANIFESTS / "intarna.csv", top=2)
+    assert [(record["fastaRecord2"], record["fastaRecord1"]) for record in records] == \
+        [("sRNA1", "target2"), ("sRNA1", "target3"), ("sRNA2", "target1")]
@@ -0,0 +1,84 @@
+import os
+
+import cache
+from cache import DiskCache
+from rna_to_img import linkImage, writeImage
+
+
+def files(directory) -> list:
+    return sorted(path.name for path in directory.rglob("*") if path.is_file())
+
+
+def test_put_replaces_entries_atomically(tmp_path):
+    disk_cache = DiskCache(tmp_path)
+    key = DiskCache.key("entry")
+    disk_cache.put(key, b"first")
+    with open(disk_cache.path(key), "rb") as reader:
+        disk_cache.put(key, b"second")
+        # a reader of the old entry never sees a partly written file
+        assert reader.read() == b"first"
+    assert disk_cache.get(key) == b"second"
+    assert files(tmp_path) == [key]
+    assert disk_cache.path(key).stat().st_mode & 0o777 == 0o644
+
+
+def test_failed_put_leaves_no_entry(tmp_path, monkeypatch):
+    def replace(source, target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(cache.os, "replace", replace)
+    disk_cache = DiskCache(tmp_path)
+    key = DiskCache.key("entry")
+    disk_cache.put(key, b"data")
+    assert disk_cache.get(key) is None
+    assert files(tmp_path) == []
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    disk_cache = DiskCache(tmp_path, max_bytes=300)
+    keys = [DiskCache.key(name) for name in "abcd"]
+    for time, key in enumerate(keys[:3], 1):
+        disk_cache.put(key, bytes(100))
+        os.utime(disk_cache.path(key), (time, time))
+    # reading an entry marks it as recently used
+    assert disk_cache.get(keys[0]) is not None
+
+    disk_cache.put(keys[3], bytes(100))
+    # filled to at most 90% of the limit, without the entries b and c
+    assert files(tmp_path) == sorted([keys[0], keys[3]])
+    assert disk_cache.size == 200
+
+
+def test_replaced_entries_are_counted_once(tmp_path):
+    disk_cache = DiskCache(tmp_path)
+    key = DiskCache.key("entry")
+    disk_cache.put(key, bytes(100))
+    for _ in range(3):
+        disk_cache.put(key, bytes(150))
+    assert disk_cache.size == 150
+    assert disk_cache.scan()[1] == 150
+
+
+def test_eviction_keeps_files_being_written(tmp_path):
+    disk_cache = DiskCache(tmp_path, max_bytes=100)
+    key = DiskCache.key("entry")
+    # the temporary file of another process, before its rename
+    (tmp_path / key[:2]).mkdir()
+    writing = tmp_path / key[:2] / f"{cache.TEMP_PREFIX}entry"
+    writing.write_bytes(bytes(500))
+    disk_cache.put(DiskCache.key("other"), bytes(50))
+    disk_cache.evict()
+    assert writing.exists()
+    assert disk_cache.size == 50
+
+
+def test_write_image_keeps_linked_cache_entry(tmp_path):
+    entry = tmp_path / "entry.svg"
+    entry.write_bytes(b"cached legend")
+    output = tmp_path / "legend.svg"
+    assert linkImage(entry, str(output), "svg")
+    assert os.path.samefile(entry, output)
+
+    writeImage(b"new legend", str(output), "svg")
+    assert output.read_bytes() == b"new legend"
+    assert entry.read_bytes() == b"cached legend"
@@ -0,0 +1,37 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import input_validation
+
+SOURCE = Path(__file__).parent.parent / "source"
+
+
+def test_import_starts_no_executor():
+    code = ("import threading, input_validation; "
+            "print(threading.active_count(), len(input_validation.executors))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=SOURCE,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["1", "0"]
+
+
+def childJob(results):
+    # the executor of the parent has no threads in this process
+    results.put(input_validation.viennaJobs().submit(os.getpid).result(timeout=10))
+
+
+def test_forked_process_creates_its_own_executor():
+    parent_jobs = input_validation.viennaJobs()
+    assert parent_jobs.submit(os.getpid).result() == os.getpid()
+    assert input_validation.viennaJobs() is parent_jobs
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    child = context.Process(target=childJob, args=(results,))
+    child.start()
+    child_pid = results.get(timeout=20)
+    child.join()
+    assert child_pid == child.pid
+    assert child.exitcode == 0
@@ -0,0 +1,78 @@
+import random
+import threading
+
+import pytest
+
+from fasta_index import FastaIndex, openIndex, parseRegion, writeIndex
+
+random.seed(1)
+TR1 = "".join(random.choice("ACGU") for _ in range(400))
+TR2 = "".join(random.choice("ACGU") for _ in range(25))
+CHR = "GGGAAACCCUUU"
+
+# what samtools faidx writes for FASTA: name, length, offset of the first
+# nucleotide, nucleotides per line and bytes per line
+FAI = "tr1\t400\t22\t60\t61\n" \
+      "tr2\t25\t435\t10\t12\n" \
+      "chr:1\t12\t473\t12\t13\n"
+
+
+@pytest.fixture
+def fasta(tmp_path):
+    """Lines of 60 nucleotides, lines of 10 with windows line ends and an id with a colon."""
+    path = tmp_path / "transcripts.fasta"
+    with open(path, "wb") as f:
+        f.write(b">tr1 some description\n")
+        f.write(b"".join(TR1[i:i + 60].encode() + b"\n" for i in range(0, 400, 60)))
+        f.write(b">tr2\r\n")
+        f.write(b"".join(TR2[i:i + 10].encode() + b"\r\n" for i in range(0, 25, 10)))
+        f.write(b">chr:1\n" + CHR.encode() + b"\n")
+    return path
+
+
+def test_index_like_samtools_faidx(fasta):
+    FastaIndex(fasta)
+    assert (fasta.parent / "transcripts.fasta.fai").read_text() == FAI
+    # nothing but the fasta file and its index is left
+    assert sorted(path.name for path in fasta.parent.iterdir()) == \
+        ["transcripts.fasta", "transcripts.fasta.fai"]
+
+
+def test_read_index_of_samtools(fasta):
+    index_path = fasta.parent / "transcripts.fasta.fai"
+    # the index of samtools has a line per record, newer than the fasta file
+    index_path.write_text(FAI.replace("tr2\t", "renamed\t"))
+    assert list(FastaIndex(fasta).index) == ["tr1", "renamed", "chr:1"]
+
+
+def test_region_fetches(fasta):
+    index = openIndex(fasta)
+    record, first, last = parseRegion("tr1:120-340", index)
+    assert (record, first, last) == ("tr1", 120, 340)
+    assert index.fetch(record, first, last) == TR1[119:340]
+    assert index.fetch("tr1") == TR1
+    # the lines of tr2 end with \r\n
+    assert index.fetch("tr2", 8, 23) == TR2[7:23]
+    # an id with a colon is a record, not a region
+    assert parseRegion("chr:1", index) == ("chr:1", None, None)
+    assert index.fetch("chr:1", 12, 12) == "U"
+
+    with pytest.raises(ValueError):
+        index.fetch("tr1", 300, 401)
+    with pytest.raises(ValueError):
+        parseRegion("tr1:340-120", index)
+    with pytest.raises(ValueError):
+        index.fetch("tr3")
+
+
+def test_concurrent_index_writes(fasta):
+    index_path = fasta.parent / "transcripts.fasta.fai"
+    index = FastaIndex(fasta).index
+    threads = [threading.Thread(target=writeIndex, args=(index_path, index)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert index_path.read_text() == FAI
+    assert sorted(path.name for path in fasta.parent.iterdir()) == \
+        ["transcripts.fasta", "transcripts.fasta.fai"]
@@ -6,9 +6,6 @@ import subprocess
 from pathlib import Path
 
 current_dir = Path(__file__).parent
-logging.basicConfig(level=logging.INFO,
-                        format="[{levelname}] {message}",
-                        style="{")
 
 def hashfile(filepath):
     try:
@@ -69,21 +66,23 @@ inputs = [
     ]
 
 
-for index, command in enumerate(inputs):
-    test_name = f"test{index}.svg"
-    test_path = str(current_dir) + "/images/" + test_name
-    script_path = str(current_dir) + "/../source/rna_to_img.py"
-    logging.info(f"Running {test_name}...")
-    command = command.replace("TEST", test_path)
-    command = command.replace("SCRIPT", script_path)
-    subprocess.run(command, shell=True)
-    test = hashfile(str(current_dir) + f"/images/{test_name}")
-    verified = hashfile(str(current_dir) + f"/verified/{test_name}")
-    if test and verified and test == verified:
-        logging.info(f"{test_name} passed!")
-        # remove test file if test passed
-        os.remove(test_path)
-    else:
-        logging.error(f"{test_name} failed!")
-   
-
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO,
+                        format="[{levelname}] {message}",
+                        style="{")
+    for index, command in enumerate(inputs):
+        test_name = f"test{index}.svg"
+        test_path = str(current_dir) + "/images/" + test_name
+        script_path = str(current_dir) + "/../source/rna_to_img.py"
+        logging.info(f"Running {test_name}...")
+        command = command.replace("TEST", test_path)
+        command = command.replace("SCRIPT", script_path)
+        subprocess.run(command, shell=True)
+        test = hashfile(str(current_dir) + f"/images/{test_name}")
+        verified = hashfile(str(current_dir) + f"/verified/{test_name}")
+        if test and verified and test == verified:
+            logging.info(f"{test_name} passed!")
+            # remove test file if test passed
+            os.remove(test_path)
+        else:
+            logging.error(f"{test_name} failed!")
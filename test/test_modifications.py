@@ -0,0 +1,100 @@
+import json
+import shutil
+import subprocess
+
+import pytest
+from conftest import verifiedImage, verifiedInputs
+
+import svg_engine
+from input_validation import validate
+from modifications import (EditPlan, planModifications, removeArrow, removeLink,
+                           removeNode)
+from rna_to_img import buildMolecules, openTemplatePage, render
+
+# elements of the index `indexElements` builds, enough for the edits
+# removeNode and removeArrow. remove() detaches an element and its
+# children like the DOM does, the removed elements are logged
+FAKE_DOM = """
+const removed = [];
+class FakeElement {
+    constructor(name, children = []) {
+        this.name = name;
+        this.children = children;
+        this.firstChild = children[0];
+        this.connected = true;
+        this.parent = null;
+        children.forEach((child) => child.parent = this);
+    }
+    get isConnected() { return this.connected && (!this.parent || this.parent.isConnected); }
+    remove() { removed.push(this.name); this.connected = false; }
+}
+const node = new FakeElement("n5", [new FakeElement("arrow")]);
+globalThis.window = {varriIndex: {gnode: {n5: [node]}}};
+"""
+
+
+def svgOf(page) -> str:
+    return page.evaluate("() => document.querySelector('svg').outerHTML")
+
+
+def applyPerEdit(page, plan: EditPlan) -> None:
+    """The former pipeline: one page.evaluate per edit."""
+    for step in plan.edits:
+        single = EditPlan()
+        single.edits = [step]
+        single.apply(page)
+
+
+@pytest.mark.parametrize("args", verifiedInputs())
+def test_browser_matches_verified(browser, args):
+    args["engine"] = "browser"
+    page = openTemplatePage(browser)
+    try:
+        assert render(browser, page, validate(args))["image"] == verifiedImage(args)
+    finally:
+        page.close()
+
+
+@pytest.mark.parametrize("args", verifiedInputs())
+def test_edit_plan_matches_edits_one_by_one(browser, args):
+    v = validate(args)
+    plan = planModifications(v)
+    svgs = []
+    for apply in (EditPlan.apply, applyPerEdit):
+        page = openTemplatePage(browser)
+        buildMolecules(page, v)
+        apply(plan, page)
+        svgs.append(svgOf(page))
+        page.close()
+    assert svgs[0] == svgs[1]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_find_skips_removed_elements():
+    plan = EditPlan()
+    removeNode(plan, 5)
+    # the node and its arrow are not part of the document anymore
+    removeArrow(plan, 5)
+    removeNode(plan, 5)
+    script = f"{FAKE_DOM}({plan.script()})({json.dumps(plan.edits)});\n" \
+             "console.log(JSON.stringify(removed));"
+    result = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout) == ["n5"]
+
+
+def test_python_edits_skip_removed_elements(args):
+    args["structure"] = "((...))"
+    args["sequence"] = "GGAAACC"
+    doc = svg_engine.buildMolecules(validate(args))
+    plan = EditPlan()
+    removeNode(plan, 3)
+    removeArrow(plan, 3)
+    removeLink(plan, 3, 4)
+    removeLink(plan, 4, 5)
+    svg_engine.applyEditPlan(doc, plan)
+
+    assert doc.select("num", "n3") == []
+    backbone = [(line.getAttribute("start"), line.getAttribute("end"))
+                for line in doc.select("link_type", "backbone")]
+    assert ("3", "4") not in backbone and ("4", "5") not in backbone
+    assert ("5", "6") in backbone
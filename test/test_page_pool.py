@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import verifiedInputs
+
+from async_render import SyncBridge, renderManyAsync
+from input_validation import validate
+from page_pool import PagePool
+from rna_to_img import openTemplatePage, render
+
+
+class FakePage:
+    """Page of `FakeBrowser`, the reset succeeds unless `clean` is False."""
+
+    def __init__(self):
+        self.clean = True
+        self.closed = False
+
+    def goto(self, url):
+        pass
+
+    def evaluate(self, script, arg=None):
+        return self.clean
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.pages = []
+
+    def new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+
+def test_pool_reuses_reset_pages():
+    browser = FakeBrowser()
+    pool = PagePool(browser, max_renders=3)
+    for _ in range(3):
+        with pool.page():
+            pass
+    # the page is replaced after 3 renders
+    with pool.page():
+        pass
+    assert len(browser.pages) == 2
+    assert browser.pages[0].closed and not browser.pages[1].closed
+
+
+def test_pool_closes_pages_of_failed_renders():
+    browser = FakeBrowser()
+    pool = PagePool(browser)
+    with pytest.raises(ValueError):
+        with pool.page():
+            raise ValueError("render failed")
+    with pool.page() as page:
+        # a page that can not be reset is not reused either
+        page.clean = False
+    with pool.page():
+        pass
+    assert [page.closed for page in browser.pages] == [True, True, False]
+
+
+class AsyncCounter:
+    """Object of an async API: a coroutine, a plain method and an attribute."""
+
+    def __init__(self):
+        self.count = 0
+        self.threads = set()
+
+    async def add(self, number):
+        self.threads.add(threading.get_ident())
+        self.count += number
+        return self.count
+
+    def double(self):
+        return self.count * 2
+
+
+def test_sync_bridge_calls_on_the_loop():
+    counter = AsyncCounter()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        bridge = SyncBridge(counter, loop)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = await asyncio.gather(*[loop.run_in_executor(executor, bridge.add, 1)
+                                             for _ in range(8)])
+            doubled = await loop.run_in_executor(executor, bridge.double)
+        return results, doubled, bridge.count, threading.get_ident()
+
+    results, doubled, count, loop_thread = asyncio.run(main())
+    assert sorted(results) == list(range(1, 9))
+    # the worker threads only waited, the loop ran every call
+    assert counter.threads == {loop_thread}
+    assert (doubled, count) == (16, 8)
+
+
+def renderFresh(browser, v) -> bytes:
+    page = openTemplatePage(browser)
+    try:
+        return render(browser, page, v)["image"]
+    finally:
+        page.close()
+
+
+def twoInputs() -> list:
+    inputs = {param.id: param.values[0] for param in verifiedInputs()}
+    return [validate(inputs["test0"]), validate(inputs["test21"])]
+
+
+def test_pooled_page_matches_fresh_render(browser):
+    pool = PagePool(browser)
+    images = []
+    for v in twoInputs():
+        with pool.page() as page:
+            images.append(render(browser, page, v)["image"])
+    # both inputs were rendered on the same page
+    assert len(pool.idle) == 1
+    pool.close()
+    assert images[1] == renderFresh(browser, twoInputs()[1])
+
+
+def test_async_pooled_page_matches_fresh_render(browser):
+    inputs = twoInputs()
+    # one page at a time, the second input reuses the page of the first
+    results = asyncio.run(renderManyAsync(inputs, concurrency=1))
+    assert [result["image"] for result in results] == [renderFresh(browser, v) for v in inputs]
@@ -0,0 +1,64 @@
+import os
+import socket
+import threading
+
+import pytest
+
+import render_daemon
+from render_daemon import (daemonRunning, prepareSocket, receiveMessage,
+                           requestRender, sendMessage)
+
+
+@pytest.fixture
+def listening(tmp_path):
+    """Socket of a server answering pings, like a running render daemon."""
+    socket_path = tmp_path / "render.sock"
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen()
+
+    def answer():
+        while True:
+            try:
+                connection, _ = server.accept()
+            except OSError:
+                return
+            with connection:
+                receiveMessage(connection)
+                sendMessage(connection, {"status": "ok"})
+
+    threading.Thread(target=answer, daemon=True).start()
+    yield socket_path
+    server.close()
+
+
+def test_daemon_of_current_user(listening):
+    assert daemonRunning(listening)
+
+
+def test_socket_of_another_user_is_not_used(listening, monkeypatch):
+    other_user = os.getuid() + 1
+    monkeypatch.setattr(render_daemon.os, "getuid", lambda: other_user)
+    assert not daemonRunning(listening)
+    with pytest.raises(ValueError, match="another user"):
+        requestRender(listening, {})
+
+
+def test_default_socket_directory_is_private(tmp_path, monkeypatch):
+    socket_path = tmp_path / "varri-1000" / "varri_render.sock"
+    monkeypatch.setattr(render_daemon, "render_socket", socket_path)
+    prepareSocket(socket_path)
+    assert socket_path.parent.stat().st_mode & 0o777 == 0o700
+
+    # a directory others can write to, eg. created by another user first
+    socket_path.parent.chmod(0o777)
+    with pytest.raises(ValueError, match="only be accessible"):
+        prepareSocket(socket_path)
+
+
+def test_left_over_socket_of_another_user_is_kept(listening, monkeypatch):
+    other_user = os.getuid() + 1
+    monkeypatch.setattr(render_daemon.os, "getuid", lambda: other_user)
+    with pytest.raises(ValueError):
+        prepareSocket(listening)
+    assert listening.exists()
@@ -0,0 +1,64 @@
+import pytest
+
+import rna_to_img
+import svg_engine
+from input_validation import validate
+from rna_to_img import buildLegend, moleculesCacheable, openTemplatePage, render
+
+
+def renderOnNewPage(browser, v) -> bytes:
+    page = openTemplatePage(browser)
+    try:
+        return render(browser, page, v)["image"]
+    finally:
+        page.close()
+
+
+def ticksInput(args, ticks="50") -> dict:
+    args["structure"] = "..((((...))))...((...((...((..&............))...))...)).."
+    args["sequence"] = "ACGAUCAGAGAUCAGAGCAUACGACAGCAG&ACGAAAAAAAGAGCAUACGACAGCAG"
+    args["engine"] = "browser"
+    args["forcefieldTicks"] = ticks
+    return args
+
+
+def test_only_forcefield_ticks_are_cacheable(args):
+    assert moleculesCacheable(validate(ticksInput(args)))
+    args["forcefieldTicks"] = "None"
+    args["forcefield"] = "1"
+    assert not moleculesCacheable(validate(args))
+
+
+def test_forcefield_ticks_are_deterministic(browser, args):
+    v = validate(ticksInput(args))
+    assert renderOnNewPage(browser, v) == renderOnNewPage(browser, v)
+
+
+def test_forcefield_ticks_from_cache(browser, args, tmp_path):
+    uncached = renderOnNewPage(browser, validate(ticksInput(args)))
+    args["cache"] = str(tmp_path / "cache")
+    v = validate(args)
+    # the first render stores the svg of fornac, the second one restores it
+    assert renderOnNewPage(browser, v) == uncached
+    assert renderOnNewPage(browser, v) == uncached
+
+
+def test_legend_is_built_once(tmp_path, monkeypatch):
+    v = {"molecules": "2", "output_type": "svg", "cache": str(tmp_path / "cache"),
+         "accessibility1": "RNAplfold", "accessibility2": None}
+    monkeypatch.setattr(rna_to_img, "legend_images", {})
+    legend = buildLegend(None, v)
+
+    def buildAgain(v):
+        raise AssertionError("the legend was built again")
+    monkeypatch.setattr(svg_engine, "buildLegend", buildAgain)
+    # from the legends of this process
+    assert buildLegend(None, v) == legend
+    # from the cache directory, eg. in the next process
+    rna_to_img.legend_images.clear()
+    assert buildLegend(None, v) == legend
+    assert list(rna_to_img.legend_images) == [rna_to_img.legendVariant(v)]
+    # another variant is built
+    v["accessibility2"] = "RNAplfold"
+    with pytest.raises(AssertionError, match="built again"):
+        buildLegend(None, v)
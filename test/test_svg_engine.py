@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from conftest import current_dir, verifiedImage, verifiedInputs
+
+import svg_engine
+from input_validation import validate
+from modifications import planLegend
+from rna_to_img import extractImage
+from utils import template_legende_html
+
+# legend variants by the name of their image in test/verified:
+# the number of molecules and the accessibilities that are shown
+LEGENDS = {"legend_2_both": ("2", True, True), "legend_2_first": ("2", True, False),
+           "legend_2_second": ("2", False, True), "legend_2_none": ("2", False, False),
+           "legend_1_first": ("1", True, False), "legend_1_none": ("1", False, False)}
+
+
+def renderSvg(args) -> bytes:
+    return svg_engine.render(validate(args))["image"]
+
+
+def test_layout_cache_stores_json(args, tmp_path, monkeypatch):
+    args["structure"] = "((..((...))..))&..(((...)))..[[..]]"
+    args["sequence"] = "GGACGAUCAUCGUCC&AAGCCGAAAGGCAAGCAAG"
+    args["output"] = str(tmp_path / "image.svg")
+    uncached = renderSvg(args)
+
+    args["cache"] = str(tmp_path / "cache")
+    assert renderSvg(args) == uncached
+    entries = [path for path in (tmp_path / "cache").rglob("*") if path.is_file()]
+    assert len(entries) == 1
+    assert json.loads(entries[0].read_bytes())["pairtable"]
+
+    # the second render reads the layout from the cache
+    monkeypatch.setattr(svg_engine, "computeLayout", None)
+    assert renderSvg(args) == uncached
+
+
+@pytest.mark.parametrize("args", verifiedInputs())
+def test_python_engine_matches_verified(args):
+    args["engine"] = "python"
+    assert renderSvg(args) == verifiedImage(args)
+
+
+def legendInput(name) -> dict:
+    molecules, access1, access2 = LEGENDS[name]
+    return {"molecules": molecules, "output_type": "svg", "cache": None,
+            "accessibility1": "RNAplfold" if access1 else None,
+            "accessibility2": "RNAplfold" if access2 else None}
+
+
+@pytest.mark.parametrize("name", LEGENDS)
+def test_legend_matches_verified(name):
+    legend = svg_engine.buildLegend(legendInput(name))
+    assert legend == (current_dir / "verified" / f"{name}.svg").read_bytes()
+
+
+@pytest.mark.parametrize("name", LEGENDS)
+def test_legend_matches_browser(browser, name):
+    """The former legend: legende.html edited in a page."""
+    v = legendInput(name)
+    page = browser.new_page()
+    try:
+        page.goto("file:///" + str(template_legende_html))
+        planLegend(v).apply(page)
+        legend = extractImage(page, browser, "svg", '"0 0 560 200"')
+    finally:
+        page.close()
+    assert svg_engine.buildLegend(v) == legend
@@ -0,0 +1,91 @@
+from collections import OrderedDict
+
+import pytest
+
+import input_validation
+import vienna
+
+# stub of RNAfold -C: like RNAfold, a record ends with the next header
+# or the end of the input. Every nucleotide with an "x" in the
+# constraint stays unpaired, all others pair with their neighbour.
+RNAFOLD = '''
+import sys
+
+def answer(record):
+    header, sequence, constraint = record[:3]
+    print("WARNING: stub of RNAfold")
+    print(header)
+    print(sequence)
+    structure = "".join("." if c == "x" else "()"[i % 2] for i, c in enumerate(constraint))
+    print(f"{structure} ( -1.00)", flush=True)
+
+record = None
+for line in sys.stdin:
+    line = line.rstrip("\\n")
+    if line.startswith(">"):
+        if record is not None:
+            answer(record)
+        record = [line]
+    elif record is not None:
+        record.append(line)
+if record is not None and len(record) > 1:
+    answer(record)
+'''
+
+# stub of an RNAfold that never answers
+SILENT_RNAFOLD = '''
+import sys
+for line in sys.stdin:
+    pass
+'''
+
+
+@pytest.fixture(autouse=True)
+def no_processes():
+    vienna.closeFoldProcesses()
+    yield
+    vienna.closeFoldProcesses()
+
+
+def test_fold_coprocess_answers_every_record(stub_bin, monkeypatch):
+    stub_bin("RNAfold", RNAFOLD)
+    monkeypatch.setattr(vienna, "FOLD_TIMEOUT", 10)
+    assert vienna.foldCoprocess("ACGU", "xx..", "") == "..()"
+    # the same process answers the next records
+    assert vienna.foldCoprocess("ACGUAC", "......", "") == "()()()"
+    assert vienna.foldCoprocess("ACGUAC", "xx....", "") == "..()()"
+    assert len(vienna.fold_processes[""]) == 1
+    assert vienna.fold_processes[""][0].records == 3
+
+
+def test_fold_coprocess_without_answer(stub_bin, monkeypatch):
+    stub_bin("RNAfold", SILENT_RNAFOLD)
+    monkeypatch.setattr(vienna, "FOLD_TIMEOUT", 0.5)
+    # the caller falls back to a single RNAfold call
+    assert vienna.foldCoprocess("ACGU", "....", "") is None
+    assert vienna.fold_processes[""] == []
+
+
+def test_fold_coprocess_unknown_parameters(stub_bin):
+    stub_bin("RNAfold", RNAFOLD)
+    assert vienna.foldCoprocess("ACGU", "....", "--unknownOption") is None
+
+
+def test_predictions_are_bounded(monkeypatch):
+    """Only the most recently used predictions are kept by the process."""
+    folded = []
+
+    def foldConstrained(sequence, constraint, parameters):
+        folded.append(sequence)
+        return "." * len(sequence)
+
+    monkeypatch.setattr(input_validation, "foldConstrained", foldConstrained)
+    monkeypatch.setattr(input_validation, "viennaVersion", lambda: "stub")
+    monkeypatch.setattr(input_validation, "PREDICTED_STRUCTURES", 2)
+    monkeypatch.setattr(input_validation, "predicted_structures", OrderedDict())
+
+    for sequence in ["GGAA", "CCUU", "GGAA", "AAAA", "CCUU", "AAAA"]:
+        assert input_validation.foldCached(sequence, "....", "") == "...."
+    # CCUU was dropped for AAAA, GGAA had been used again before it
+    assert folded == ["GGAA", "CCUU", "AAAA", "CCUU"]
+    assert len(input_validation.predicted_structures) == 2